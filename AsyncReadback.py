@@ -0,0 +1,177 @@
+import ctypes
+from collections import deque
+import numpy as np
+from OpenGL.GL import *
+from Profiler import profiler
+
+"""
+Asynchronous framebuffer readback through pixel buffer objects.
+
+glReadPixels into client memory waits until the GPU has finished every
+command drawing the frame. Reading into a pixel buffer object instead
+only queues a copy on the GPU and returns at once. A fence placed after
+the copy tells when it is done; only then is the buffer mapped, so mapping
+never waits either. The pixels reach their callback one or two frames
+after they were requested.
+
+A ring of buffers allows several readbacks in flight. When all of them
+are still busy, a new request is dropped rather than waiting for the GPU.
+"""
+
+
+class AsyncReadback:
+    """
+    A ring of pixel buffer objects read back without stalling.
+
+    Call request() after rendering a frame, before swapping buffers, and
+    poll() once per frame to hand finished readbacks to their callbacks.
+
+    Attributes:
+        slots (int): Number of readbacks that can be in flight
+        buffers (list): Pixel buffer object IDs
+        requested (int): Readbacks requested
+        delivered (int): Readbacks handed to their callbacks
+        dropped (int): Requests dropped because every buffer was busy
+        delivered_bytes (int): Bytes handed to callbacks
+    """
+
+    def __init__(self, slots=3):
+        """
+        Create the ring.
+
+        Args:
+            slots (int): Number of readbacks that can be in flight
+        """
+        self.slots = slots
+        self.buffers = [glGenBuffers(1) for _ in range(slots)]
+        self.requested = 0
+        self.delivered = 0
+        self.dropped = 0
+        self.delivered_bytes = 0
+        self._capacity = [0] * slots
+        self._free = deque(range(slots))
+        self._pending = deque()
+
+    @property
+    def in_flight(self):
+        """int: Readbacks requested but not delivered yet."""
+        return len(self._pending)
+
+    def request(self, callback, width, height, x=0, y=0, wait=False):
+        """
+        Queue a copy of the bound read framebuffer's color pixels.
+
+        Args:
+            callback (callable): Called with a (height, width, 4) uint8 RGBA
+                array, top row first, once the pixels are available
+            width (int): Width of the region in pixels
+            height (int): Height of the region in pixels
+            x (int): Left edge of the region
+            y (int): Bottom edge of the region
+            wait (bool): When every buffer is busy, wait for the oldest
+                readback instead of dropping the request
+
+        Returns:
+            bool: False if every buffer was busy and the request was dropped
+        """
+        self.requested += 1
+        self.poll()
+        if not self._free:
+            if not wait:
+                self.dropped += 1
+                return False
+            self._wait_oldest()
+
+        slot = self._free.popleft()
+        size = width * height * 4
+        glBindBuffer(GL_PIXEL_PACK_BUFFER, self.buffers[slot])
+        if self._capacity[slot] < size:
+            glBufferData(GL_PIXEL_PACK_BUFFER, size, None, GL_STREAM_READ)
+            self._capacity[slot] = size
+        glPixelStorei(GL_PACK_ALIGNMENT, 1)
+        glReadPixels(x, y, width, height, GL_RGBA, GL_UNSIGNED_BYTE, ctypes.c_void_p(0))
+        glBindBuffer(GL_PIXEL_PACK_BUFFER, 0)
+
+        fence = glFenceSync(GL_SYNC_GPU_COMMANDS_COMPLETE, 0)
+        self._pending.append((slot, fence, callback, width, height))
+        return True
+
+    def poll(self):
+        """
+        Deliver the finished readbacks, oldest first, without waiting.
+
+        Returns:
+            int: Number of readbacks delivered
+        """
+        delivered = 0
+        while self._pending:
+            fence = self._pending[0][1]
+            # The flush bit makes sure the fence is submitted and will signal.
+            status = glClientWaitSync(fence, GL_SYNC_FLUSH_COMMANDS_BIT, 0)
+            if status == GL_TIMEOUT_EXPIRED:
+                break
+            self._deliver(*self._pending.popleft())
+            delivered += 1
+        return delivered
+
+    def flush(self):
+        """Wait for every readback in flight and deliver it."""
+        while self._pending:
+            self._wait_oldest()
+
+    def _wait_oldest(self):
+        """Wait for the oldest readback in flight and deliver it."""
+        slot, fence, callback, width, height = self._pending.popleft()
+        while glClientWaitSync(fence, GL_SYNC_FLUSH_COMMANDS_BIT, 1000000) == GL_TIMEOUT_EXPIRED:
+            pass
+        self._deliver(slot, fence, callback, width, height)
+
+    def _deliver(self, slot, fence, callback, width, height):
+        """
+        Map a finished buffer, copy its pixels out and call the callback.
+
+        Args:
+            slot (int): Index of the buffer
+            fence: Fence placed after the buffer's copy
+            callback (callable): Receives the pixels
+            width (int): Width of the region in pixels
+            height (int): Height of the region in pixels
+        """
+        glDeleteSync(fence)
+        size = width * height * 4
+        glBindBuffer(GL_PIXEL_PACK_BUFFER, self.buffers[slot])
+        address = ctypes.cast(glMapBufferRange(GL_PIXEL_PACK_BUFFER, 0, size, GL_MAP_READ_BIT), ctypes.c_void_p).value
+        mapped = np.ctypeslib.as_array((ctypes.c_ubyte * size).from_address(address))
+        # OpenGL rows start at the bottom; flipping while copying out of
+        # the mapping costs no extra pass.
+        pixels = np.array(mapped.reshape(height, width, 4)[::-1])
+        glUnmapBuffer(GL_PIXEL_PACK_BUFFER)
+        glBindBuffer(GL_PIXEL_PACK_BUFFER, 0)
+        self._free.append(slot)
+
+        self.delivered += 1
+        self.delivered_bytes += size
+        profiler.count("readback_bytes", size)
+        callback(pixels)
+
+    def stats(self):
+        """
+        Get readback statistics.
+
+        Returns:
+            dict: Requested, delivered and dropped readbacks, readbacks in
+            flight and bytes delivered
+        """
+        return {
+            "requested": self.requested,
+            "delivered": self.delivered,
+            "dropped": self.dropped,
+            "in_flight": self.in_flight,
+            "delivered_bytes": self.delivered_bytes,
+        }
+
+    def __del__(self):
+        """Clean up OpenGL resources; readbacks in flight are discarded."""
+        for _, fence, _, _, _ in self._pending:
+            glDeleteSync(fence)
+        glDeleteBuffers(len(self.buffers), self.buffers)
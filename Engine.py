@@ -2,6 +2,10 @@ import glfw
 from OpenGL.GL import *
 import random
 from Window import Window
+from Framebuffer import read_pixels
+from AsyncReadback import AsyncReadback
+from FrameCapture import FrameCapture, PngWriter, FfmpegWriter, ffmpeg_available, BLOCK
+from HeadlessWindow import HeadlessWindow
 import glm
 import time
 import numpy as np
@@ -18,6 +22,14 @@ from objects.lightCube import *
 from Shaders import *
 from objects.TexturedCube import *
 from objects.TexturedSphere import *
+from objects.StaticBatch import *
+from Scene import *
+from FrameData import FrameData
+from Shader import Shader
+from ShaderCache import shader_cache
+from Picking import screen_ray
+from FramePacer import FramePacer, LIMITED
+from Profiler import profiler
 
 
 class Engine:
@@ -33,14 +45,43 @@ class Engine:
         title (str): Window title
         fullscreen (bool): Whether the window should be fullscreen
         fps (int): Target frames per second
+        pacer (FramePacer): Frame pacing of the main loop
+        frame_stats (dict): Frame time and jitter statistics, refreshed every second
+        trace_path (str): File the profile is written to when F12 is pressed
+        capture (FrameCapture): Capture of the rendered frames, None when
+            not capturing
+        capture_path (str): Video file, or PNG directory without ffmpeg,
+            that F10 captures to
         background_color (list): RGBA color values for background
         input_text (str): Stores text input from user
         mode (int): Current object manipulation mode (1-4)
+        active_object (str): Name of the object selected by the last click, or None
         light_pos (list): Position of the light source in 3D space
+        light_color (list): RGB color of the light source
         camera (Camera): Camera object for view control
+        scene (Scene): Objects drawn every frame, built once in initialize()
+        frame_data (FrameData): Uniform buffer with per-frame camera and light data
+        uniform_stats (dict): Uniform uploads made and skipped in the last frame
+        shader_cache_dir (str): Directory for cached program binaries, or None
+        startup_time (float): Seconds initialize() took to build the scene
+        pick_modes (dict): Maps names of clickable scene objects to their mode
     """
 
-    def __init__(self, width, height, title, fullscreen=False, fps=60):
+    pick_modes = {"cube": 1, "textured_cube": 2, "textured_sphere": 3}
+
+    def __init__(
+        self,
+        width,
+        height,
+        title,
+        fullscreen=False,
+        fps=60,
+        shader_cache_dir=None,
+        frame_pacing=LIMITED,
+        headless=False,
+        headless_backend=None,
+        headless_frames=None,
+    ):
         """
         Initialize the Engine with window and rendering settings.
 
@@ -50,12 +91,26 @@ class Engine:
             title (str): Window title
             fullscreen (bool, optional): Fullscreen mode flag. Defaults to False.
             fps (int, optional): Target frames per second. Defaults to 60.
+            shader_cache_dir (str, optional): Directory to store linked shader
+                program binaries in for faster startup. Defaults to None.
+            frame_pacing (str, optional): FramePacer mode: "vsync", "limited"
+                to fps or "unlimited". Defaults to "limited".
+            headless (bool, optional): Render offscreen into a framebuffer of
+                width x height pixels, without a display. Defaults to False.
+            headless_backend (str, optional): "egl" or "osmesa", see
+                HeadlessWindow. Defaults to PYOPENGL_PLATFORM, then "egl".
+            headless_frames (int, optional): Number of frames main_loop()
+                renders in headless mode. Defaults to running until
+                window_should_close is set.
 
         Raises:
             Exception: If GLFW initialization fails
         """
-        if not glfw.init():
+        if not headless and not glfw.init():
             raise Exception("GLFW could not be initialized!")
+        self.headless = headless
+        self.headless_backend = headless_backend
+        self.headless_frames = headless_frames
         self.width = width
         self.height = height
         self.title = title
@@ -64,14 +119,20 @@ class Engine:
         self.background_color = [0.1, 0.2, 0.3, 1.0]
         self.input_text = ""
         self.frameCount = 0
-        self.previousTime = glfw.get_time()
+        self.previousTime = time.perf_counter()
         self.projection_matrix = glm.mat4(1.0)
         self.fps = fps
-        self.frame_duration = 1.0 / fps
+        self.pacer = FramePacer(fps, frame_pacing)
+        self.frame_stats = self.pacer.stats()
+        self.trace_path = "profile_trace.json"
+        self.capture = None
+        self.capture_path = "capture"
         self.window_should_close = False
         self.mode = 0
+        self.active_object = None
 
         self.light_pos = [2.0, 2.0, 2.0]
+        self.light_color = [1.0, 1.0, 1.0]
         self.angle_x_1 = 0.0
         self.angle_x_2 = 0.0
         self.angle_x_3 = 0.0
@@ -100,19 +161,41 @@ class Engine:
         self.camera = Camera(
             position=[0.0, 0.0, 3.0], target=[0.0, 0.0, 0.0], up_vector=[0.0, 1.0, 0.0]
         )
+        self.scene = None
+        self.frame_data = None
+        self.uniform_stats = Shader.frame_stats()
+        self.shader_cache_dir = shader_cache_dir
+        self.startup_time = 0.0
+        self.readback = None
+        self._frame_requests = []
 
     def initialize(self):
         """
         Initialize the window and OpenGL context.
         
-        Sets up the window, enables depth testing, and registers all input callbacks.
-        Must be called before starting the main loop.
+        Sets up the window, enables depth testing, builds the scene and registers
+        all input callbacks. Must be called before starting the main loop.
         """
-        self.window = Window(self.width, self.height, self.title, self.fullscreen, None)
+        start = time.perf_counter()
+        if self.headless:
+            self.window = HeadlessWindow(
+                self.width, self.height, self.title, self.headless_backend, self.headless_frames
+            )
+        else:
+            self.window = Window(self.width, self.height, self.title, self.fullscreen, None)
         self.window.setup()
 
+        self.pacer.start(self.window.set_swap_interval)
         glEnable(GL_DEPTH_TEST)
 
+        shader_cache.set_cache_dir(self.shader_cache_dir)
+        self.frame_data = FrameData()
+        self.readback = AsyncReadback()
+        self.scene = self.build_scene()
+        self.startup_time = time.perf_counter() - start
+        if self.headless:
+            return
+
         glfw.set_key_callback(self.window.getWindow(), self.key_callback)
         glfw.set_mouse_button_callback(
             self.window.getWindow(), self.mouse_button_callback
@@ -143,6 +226,20 @@ class Engine:
             ]
         elif key == glfw.KEY_R and action == glfw.PRESS:
             self.background_color = [0.2, 0.2, 0.2, 1.0]
+        elif key == glfw.KEY_F12 and action == glfw.PRESS:
+            profiler.export_chrome_trace(self.trace_path)
+            print(f"Profile of the last {len(profiler.frames)} frames written to {self.trace_path}")
+        elif key == glfw.KEY_F10 and action == glfw.PRESS:
+            if self.capture is None:
+                width, height = self.window.get_size()
+                if ffmpeg_available():
+                    writer = FfmpegWriter(self.capture_path + ".mp4", width, height, self.fps)
+                else:
+                    writer = PngWriter(self.capture_path)
+                self.start_capture(writer)
+                print(f"Capturing frames to {self.capture_path}")
+            else:
+                print(f"Capture stopped: {self.stop_capture()}")
         elif key == glfw.KEY_BACKSPACE and (
             action == glfw.PRESS or action == glfw.REPEAT
         ):
@@ -276,6 +373,9 @@ class Engine:
         """
         Handle mouse button events.
 
+        A left click selects the object under the cursor and switches to its
+        manipulation mode; clicking the background changes its color.
+
         Args:
             window: GLFW window instance
             button (int): The mouse button that was pressed or released
@@ -283,12 +383,36 @@ class Engine:
             mods (int): Bit field describing which modifier keys were held down
         """
         if button == glfw.MOUSE_BUTTON_LEFT and action == glfw.PRESS:
-            self.background_color = [
-                random.random(),
-                random.random(),
-                random.random(),
-                1.0,
-            ]
+            x, y = glfw.get_cursor_pos(window)
+            name = self.pick(x, y)
+            if name is None:
+                self.background_color = [
+                    random.random(),
+                    random.random(),
+                    random.random(),
+                    1.0,
+                ]
+            else:
+                self.active_object = name
+                self.mode = self.pick_modes.get(name, 0)
+
+    def pick(self, x, y):
+        """
+        Find the scene object under a cursor position.
+
+        Args:
+            x (float): Cursor x-coordinate in window pixels
+            y (float): Cursor y-coordinate in window pixels
+
+        Returns:
+            str: Name of the nearest object under the cursor, or None
+        """
+        width, height = self.window.get_size()
+        origin, direction = screen_ray(
+            x, y, width, height, self.projection_matrix, self.camera.view_matrix
+        )
+        drawable, _ = self.scene.pick(origin, direction, 1.0)
+        return None if drawable is None else self.scene.name_of(drawable)
 
     def cursor_position_callback(self, window, xpos, ypos):
         """
@@ -340,6 +464,121 @@ class Engine:
         else:
             self.projection_matrix = glm.ortho(-aspect, aspect, -1.0, 1.0, zNear, zFar)
 
+    def build_scene(self):
+        """
+        Create all scene objects once.
+
+        Shader programs, buffers, textures and meshes are allocated here instead
+        of every frame; the main loop only updates the objects' transforms.
+
+        Returns:
+            Scene: Scene holding the engine's drawable objects
+        """
+        scene = Scene()
+
+        scene.add("textured_cube", TexturedCube(
+            texture_vertex_shader,
+            texture_fragment_shader,
+            "textures/wood.png"
+        ))
+        scene.add("textured_sphere", TexturedSphere(
+            texture_vertex_shader,
+            texture_fragment_shader,
+            "textures/earth.jpg",
+            radius=1.0,
+            sectors=32,
+            stacks=16,
+        ))
+        scene.add("cube", Cube(vertex_shader_source, fragment_shader_source))
+        scene.add("cube_lamp", LightCube(lamp_vertex_shader, lamp_fragment_shader))
+
+        points_fan = [
+            0.0, 0.0, 0.0,
+            0.5, 0.0, 0.0,
+            0.35, 0.35, 0.0,
+            0.0, 0.5, 0.0,
+            -0.35, 0.35, 0.0,
+            -0.5, 0.0, 0.0,
+            -0.35, -0.35, 0.0,
+            0.0, -0.5, 0.0,
+            0.35, -0.35, 0.0,
+            0.5, 0.0, 0.0
+        ]
+
+        points_strip = [
+            -0.5, -0.5, 0.0,
+            -0.5, 0.5, 0.0,
+            0.0, -0.5, 0.0,
+            0.0, 0.5, 0.0,
+            0.5, -0.5, 0.0,
+            0.5, 0.5, 0.0
+        ]
+
+        # The static shapes share a shader and never move, so they are
+        # merged into one batch and drawn with a single call.
+        static_shapes = StaticBatch(vertex_shader_source, fragment_shader_source)
+        triangle_fan = static_shapes.add(Triangle_fans(
+            points_fan, vertex_shader_source, fragment_shader_source
+        ))
+        triangle_strip = static_shapes.add(Triangle_strip(
+            points_strip, vertex_shader_source, fragment_shader_source
+        ))
+
+        triangle_fan.translate(-2.0, -2.0)
+        triangle_strip.translate(2.0, -2.0)
+        scene.add("static_shapes", static_shapes)
+
+        return scene
+
+    def update_scene(self):
+        """Push the current per-object transform state into the scene."""
+        self.scene.set_transform(
+            "cube", self.x_1, self.y_1,
+            self.angle_x_1, self.angle_y_1, self.angle_z_1, self.scaling_1
+        )
+        self.scene.set_transform(
+            "textured_cube", self.x_2, self.y_2,
+            self.angle_x_2, self.angle_y_2, self.angle_z_2, self.scaling_2
+        )
+        self.scene.set_transform(
+            "textured_sphere", self.x_3, self.y_3,
+            self.angle_x_3, self.angle_y_3, self.angle_z_3, self.scaling_3
+        )
+
+        lamp = self.scene.get("cube_lamp")
+        lamp.set_position(*self.light_pos)
+
+    def render_frame(self, width, height):
+        """
+        Render a single frame of the scene into the current framebuffer.
+
+        Args:
+            width (int): Framebuffer width in pixels
+            height (int): Framebuffer height in pixels
+        """
+        glViewport(0, 0, width, height)
+
+        if self.input_text == "black":
+            self.background_color = [0, 0, 0, 1]
+
+        glClearColor(*self.background_color)
+        glClear(GL_COLOR_BUFFER_BIT | GL_DEPTH_BUFFER_BIT)
+
+        Shader.reset_frame_stats()
+        with profiler.scope("update"):
+            self.update_scene()
+
+            view = self.camera.view_matrix
+            camera_position = self.camera.get_position()
+            self.frame_data.update(
+                self.projection_matrix, view, camera_position,
+                self.light_pos, self.light_color
+            )
+        with profiler.scope("render", gpu=True):
+            self.scene.draw(self.frame_data.view_projection, camera_position)
+        self.uniform_stats = Shader.frame_stats()
+        profiler.count_all(self.uniform_stats)
+
     def main_loop(self):
         """
         Main game loop that handles rendering and updates.
@@ -348,125 +587,116 @@ class Engine:
         - Maintains the target frame rate
         - Updates window title with FPS
         - Handles input processing
-        - Creates and renders scene objects
+        - Updates and renders the scene objects
         - Manages window buffer swapping
+        - Reads back frames requested with request_frame()
         - Controls frame timing
         """
-        while (
-            not glfw.window_should_close(self.window.getWindow())
-            and not self.window_should_close
-        ):
-            width, height = glfw.get_window_size(self.window.getWindow())
-            glViewport(0, 0, width, height)
-            currentTime = glfw.get_time()
+        while not self.window.should_close() and not self.window_should_close:
+            width, height = self.window.get_size()
+            currentTime = time.perf_counter()
             self.frameCount += 1
             if (currentTime - self.previousTime) >= 1.0:
-                glfw.set_window_title(
-                    self.window.getWindow(), f"FPS: {self.frameCount}"
+                self.frame_stats = self.pacer.stats()
+                self.window.set_title(
+                    f"FPS: {self.frameCount} | jitter {self.frame_stats['jitter_ms']:.2f} ms"
                 )
                 self.frameCount = 0
                 self.previousTime = currentTime
 
-            
-            if self.input_text == "black":
-                self.background_color = [0, 0, 0, 1]
+            profiler.begin_frame()
+            self.render_frame(width, height)
 
-            # self.camera.set_projection(fov=45.0, aspect_ratio=width/height, near=0.1, far=100.0)
+            with profiler.scope("readback"):
+                for callback in self._frame_requests:
+                    self.readback.request(callback, width, height)
+                self._frame_requests.clear()
+                if self.capture is not None:
+                    block = self.capture.policy == BLOCK
+                    if not self.readback.request(self.capture.submit, width, height, wait=block):
+                        self.capture.drop()
+                self.readback.poll()
 
-            glClearColor(*self.background_color)
-            glClear(GL_COLOR_BUFFER_BIT | GL_DEPTH_BUFFER_BIT)
+            with profiler.scope("swap"):
+                self.window.swap_buffers()
+            with profiler.scope("input"):
+                self.window.process_input()
+            profiler.end_frame()
 
-            # view = glm.translate(glm.mat4(1.0), glm.vec3(0.0, 0.0, -5.0))
-            # self.set_projection(45.0, width / height, 0.1, 100.0, 1)
+            self.pacer.wait()
 
-            
+    def request_frame(self, callback):
+        """
+        Read back the next frame the main loop renders, without stalling it.
 
-        
-            
+        The pixels are copied through the AsyncReadback ring and handed to
+        the callback one or two frames later, from the main loop. Requests
+        made while every readback buffer is busy are dropped.
 
-            view = self.camera.view_matrix
-            MVP_half = self.projection_matrix * view
-
-            cube = Cube(vertex_shader_source, fragment_shader_source)
-            cube_lamp = LightCube(lamp_vertex_shader, lamp_fragment_shader)
-            textured_cube = TexturedCube(
-                texture_vertex_shader,
-                texture_fragment_shader,
-                "textures/wood.png"
-            )
-            textured_sphere = TexturedSphere(
-                texture_vertex_shader,
-                texture_fragment_shader,
-                "textures/earth.jpg",  
-                radius=1.0,
-                sectors=32, 
-                stacks=16,
-            )
+        Args:
+            callback (callable): Called with a (height, width, 4) uint8 RGBA
+                array, top row first
+        """
+        self._frame_requests.append(callback)
 
-            points_fan = [
-                0.0, 0.0, 0.0,
-                0.5, 0.0, 0.0,
-                0.35, 0.35, 0.0,
-                0.0, 0.5, 0.0,
-                -0.35, 0.35, 0.0,
-                -0.5, 0.0, 0.0,
-                -0.35, -0.35, 0.0,
-                0.0, -0.5, 0.0,
-                0.35, -0.35, 0.0,
-                0.5, 0.0, 0.0  
-            ]
+    def start_capture(self, writer, queue_size=8, policy="drop"):
+        """
+        Capture every frame the main loop renders until stop_capture().
 
-            points_strip = [
-                -0.5, -0.5, 0.0,
-                -0.5, 0.5, 0.0,
-                0.0, -0.5, 0.0,
-                0.0, 0.5, 0.0,
-                0.5, -0.5, 0.0,
-                0.5, 0.5, 0.0
-            ]
+        Frames are read back asynchronously and written by background
+        threads; see FrameCapture for the policies.
+
+        Args:
+            writer: PngWriter, NpyWriter or FfmpegWriter
+            queue_size (int): Frames that can wait for the writer
+            policy (str): "drop" to discard frames the writer cannot keep up
+                with, "block" to slow the main loop down instead
+        """
+        if self.capture is not None:
+            self.stop_capture()
+        self.capture = FrameCapture(writer, queue_size, policy)
 
-            triangle_fan = Triangle_fans(points_fan, vertex_shader_source, fragment_shader_source)
-            triangle_strip = Triangle_strip(points_strip, vertex_shader_source, fragment_shader_source)
-
-            triangle_fan.translate(-2.0, -2.0)  
-            triangle_strip.translate(2.0, -2.0) 
-
-      
-            cube.translate(self.x_1, self.y_1)
-            cube.rotate(self.angle_x_1, self.angle_y_1, self.angle_z_1)
-            cube.scale(self.scaling_1)
-            
-            textured_cube.translate(self.x_2, self.y_2)
-            textured_cube.rotate(self.angle_x_2, self.angle_y_2, self.angle_z_2)
-            textured_cube.scale(self.scaling_2)
-            
-            textured_sphere.translate(self.x_3, self.y_3)
-            textured_sphere.rotate(self.angle_x_3, self.angle_y_3, self.angle_z_3)
-            textured_sphere.scale(self.scaling_3)
-
-            textured_cube.draw(self.projection_matrix, view, self.camera.get_position(), self.light_pos)
-            textured_sphere.draw(self.projection_matrix, view, self.camera.get_position(), self.light_pos)
-            cube.draw(self.projection_matrix, view, self.camera.get_position(), self.light_pos)
-            cube_lamp.draw(self.projection_matrix, view, self.light_pos)
-
-            triangle_fan.draw(self.projection_matrix, view)
-            triangle_strip.draw(self.projection_matrix, view)
-
-            print(self.mode)
-            #triangle.draw(self.projection_matrix, view)
-            #triangle_fan.draw(self.projection_matrix, view)
-            #triangle_strip.draw(self.projection_matrix, view)
-
-            glfw.swap_buffers(self.window.getWindow())
-            glfw.poll_events()
-
-            elapsed_time = glfw.get_time() - currentTime
-            if elapsed_time < self.frame_duration:
-                time.sleep(self.frame_duration - elapsed_time)
+    def stop_capture(self):
+        """
+        Finish the capture, writing the frames still in flight.
+
+        Returns:
+            dict: Capture statistics, including the number of dropped
+            frames, or None if no capture was running
+        """
+        if self.capture is None:
+            return None
+        self.readback.flush()
+        capture, self.capture = self.capture, None
+        return capture.close()
+
+    def capture_frame(self):
+        """
+        Read back the last rendered frame, waiting for the GPU to finish it.
+
+        In windowed mode this reads the back buffer, so it must be called
+        after render_frame() and before the buffers are swapped.
+
+        Returns:
+            numpy.ndarray: (height, width, 4) uint8 RGBA image, top row first
+        """
+        if self.headless:
+            return self.window.read_pixels()
+        width, height = glfw.get_framebuffer_size(self.window.getWindow())
+        return read_pixels(width, height)
 
     def terminate(self):
         """
         Clean up resources and terminate GLFW.
         Should be called when the application exits.
         """
-        glfw.terminate()
+        if self.capture is not None:
+            self.stop_capture()
+        if self.scene is not None:
+            self.scene.cleanup()
+        self.frame_data = None
+        self.readback = None
+        if self.headless:
+            self.window = None
+        else:
+            glfw.terminate()
@@ -0,0 +1,360 @@
+import io
+import os
+import queue
+import shutil
+import subprocess
+import threading
+import time
+import numpy as np
+
+"""
+Background capture of rendered frames to PNG files, .npy memmaps or video.
+
+Frames are put in a bounded queue that writer threads drain, so encoding
+and disk writes happen off the render loop. PNG compression and file I/O
+release the GIL, so the threads run in parallel with rendering.
+
+When the writers fall behind and the queue is full, the DROP policy
+discards the new frame and counts it, keeping the render loop at full
+rate; the BLOCK policy waits for room, keeping every frame at the cost
+of slowing the loop down to the writers' pace.
+
+Attributes:
+    DROP (str): Discard frames that do not fit in the queue
+    BLOCK (str): Wait until a frame fits in the queue
+"""
+
+DROP = "drop"
+BLOCK = "block"
+
+
+def ffmpeg_available():
+    """
+    Check whether an ffmpeg executable is on the PATH.
+
+    Returns:
+        bool: True if ffmpeg can be started
+    """
+    return shutil.which("ffmpeg") is not None
+
+
+class PngWriter:
+    """
+    Writes every frame to its own numbered PNG file.
+
+    Attributes:
+        directory (str): Directory the files are written to
+        compress_level (int): zlib level from 0 to 9; low levels encode fastest
+        workers (int): Writer threads that may run in parallel
+    """
+
+    def __init__(self, directory, compress_level=1, workers=4):
+        """
+        Create the output directory.
+
+        Args:
+            directory (str): Directory the files are written to
+            compress_level (int): zlib level from 0 to 9
+            workers (int): Writer threads that may run in parallel
+        """
+        self.directory = directory
+        self.compress_level = compress_level
+        self.workers = workers
+        os.makedirs(directory, exist_ok=True)
+
+    def write(self, index, pixels):
+        """
+        Encode one frame.
+
+        Args:
+            index (int): Frame number
+            pixels (numpy.ndarray): (H, W, 4) uint8 RGBA image
+        """
+        from PIL import Image
+
+        path = os.path.join(self.directory, f"frame_{index:06d}.png")
+        Image.fromarray(pixels, "RGBA").save(path, compress_level=self.compress_level)
+
+    def close(self):
+        """Nothing to finish; every file is complete once written."""
+
+
+class NpyWriter:
+    """
+    Writes frames into one (frames, H, W, 4) uint8 .npy file through a memmap.
+
+    The file is sized for max_frames up front; close() shrinks it to the
+    frames actually written.
+
+    Attributes:
+        path (str): Path of the .npy file
+        max_frames (int): Number of frames the file can hold
+        count (int): Highest frame number written plus one
+        workers (int): Writer threads that may run in parallel
+    """
+
+    def __init__(self, path, width, height, max_frames, workers=2):
+        """
+        Create the file.
+
+        Args:
+            path (str): Path of the .npy file
+            width (int): Frame width in pixels
+            height (int): Frame height in pixels
+            max_frames (int): Number of frames the file can hold
+            workers (int): Writer threads that may run in parallel
+        """
+        self.path = path
+        self.max_frames = max_frames
+        self.count = 0
+        self.workers = workers
+        self._lock = threading.Lock()
+        self._array = np.lib.format.open_memmap(path, mode="w+", dtype=np.uint8, shape=(max_frames, height, width, 4))
+
+    def write(self, index, pixels):
+        """
+        Copy one frame into the memmap.
+
+        Args:
+            index (int): Frame number
+            pixels (numpy.ndarray): (H, W, 4) uint8 RGBA image
+
+        Raises:
+            Exception: If the file is full
+        """
+        if index >= self.max_frames:
+            raise Exception(f"{self.path} holds only {self.max_frames} frames")
+        self._array[index] = pixels
+        with self._lock:
+            self.count = max(self.count, index + 1)
+
+    def close(self):
+        """
+        Flush the memmap and cut the file down to the frames written.
+
+        Raises:
+            Exception: If the shorter header does not fit in the old one's
+                space; the file then keeps all max_frames frames, of which
+                only the first count were written
+        """
+        shape = self._array.shape
+        offset = self._array.offset
+        self._array.flush()
+        self._array = None
+        if self.count == self.max_frames:
+            return
+        header = io.BytesIO()
+        np.lib.format.write_array_header_1_0(
+            header, {"descr": "|u1", "fortran_order": False, "shape": (self.count,) + shape[1:]}
+        )
+        # Headers are padded to a multiple of 64 bytes, so a smaller frame
+        # count almost always fits in the space of the old one.
+        if len(header.getvalue()) != offset:
+            raise Exception(
+                f"{self.path} could not be cut to {self.count} frames and holds all {self.max_frames}"
+            )
+        with open(self.path, "r+b") as file:
+            file.write(header.getvalue())
+            file.truncate(offset + self.count * int(np.prod(shape[1:])))
+
+
+class FfmpegWriter:
+    """
+    Pipes raw frames into a local ffmpeg process that encodes a video.
+
+    Frames must arrive in order, so this writer uses a single thread.
+
+    Attributes:
+        path (str): Path of the video file
+        workers (int): Always 1
+        process (subprocess.Popen): The ffmpeg process
+    """
+
+    workers = 1
+
+    def __init__(self, path, width, height, fps=60, codec="libx264", crf=18):
+        """
+        Start ffmpeg.
+
+        Args:
+            path (str): Path of the video file; its extension picks the container
+            width (int): Frame width in pixels
+            height (int): Frame height in pixels
+            fps (float): Frame rate of the video
+            codec (str): ffmpeg video encoder
+            crf (int): Constant rate factor; lower is better quality
+
+        Raises:
+            Exception: If ffmpeg is not installed
+        """
+        if not ffmpeg_available():
+            raise Exception("ffmpeg was not found on the PATH")
+        self.path = path
+        self.process = subprocess.Popen(
+            [
+                "ffmpeg", "-y", "-loglevel", "error",
+                "-f", "rawvideo", "-pix_fmt", "rgba", "-s", f"{width}x{height}", "-r", str(fps), "-i", "-",
+                "-c:v", codec, "-crf", str(crf), "-pix_fmt", "yuv420p", path,
+            ],
+            stdin=subprocess.PIPE,
+        )
+
+    def write(self, index, pixels):
+        """
+        Send one frame to ffmpeg.
+
+        Args:
+            index (int): Frame number, unused; frames are encoded in arrival order
+            pixels (numpy.ndarray): (H, W, 4) uint8 RGBA image
+        """
+        self.process.stdin.write(np.ascontiguousarray(pixels).data)
+
+    def close(self):
+        """
+        Close the pipe and wait for ffmpeg to finish the file.
+
+        Raises:
+            Exception: If ffmpeg failed
+        """
+        self.process.stdin.close()
+        if self.process.wait() != 0:
+            raise Exception(f"ffmpeg exited with status {self.process.returncode} writing {self.path}")
+
+
+class FrameCapture:
+    """
+    A bounded queue of frames drained by writer threads.
+
+    submit() never waits under the DROP policy. close() must be called to
+    write the remaining frames and finish the output.
+
+    Attributes:
+        writer: PngWriter, NpyWriter or FfmpegWriter
+        policy (str): DROP or BLOCK
+        submitted (int): Frames offered with submit()
+        written (int): Frames the writer finished
+        dropped (int): Frames discarded because the queue was full or
+            that never reached it
+        blocked_time (float): Seconds submit() spent waiting under BLOCK
+        error (Exception): First error raised by the writer, None if none
+    """
+
+    def __init__(self, writer, queue_size=8, policy=DROP, workers=None):
+        """
+        Start the writer threads.
+
+        Args:
+            writer: Object with write(index, pixels) and close() methods
+            queue_size (int): Frames that can wait for a writer
+            policy (str): DROP or BLOCK
+            workers (int, optional): Writer threads; defaults to writer.workers
+
+        Raises:
+            Exception: If the policy is unknown
+        """
+        if policy not in (DROP, BLOCK):
+            raise Exception(f"Unknown capture policy '{policy}'")
+        self.writer = writer
+        self.policy = policy
+        self.submitted = 0
+        self.written = 0
+        self.dropped = 0
+        self.blocked_time = 0.0
+        self.error = None
+        self._queue = queue.Queue(queue_size)
+        self._lock = threading.Lock()
+        count = workers or getattr(writer, "workers", 1)
+        self._threads = [threading.Thread(target=self._drain, daemon=True) for _ in range(count)]
+        for thread in self._threads:
+            thread.start()
+
+    def submit(self, pixels):
+        """
+        Queue a frame for writing.
+
+        Args:
+            pixels (numpy.ndarray): (H, W, 4) uint8 RGBA image; the capture
+                keeps a reference, so it must not be modified afterwards
+
+        Returns:
+            bool: False if the frame was dropped
+        """
+        index = self.submitted
+        self.submitted += 1
+        if self.error is not None:
+            self.dropped += 1
+            return False
+        if self.policy == BLOCK:
+            start = time.perf_counter()
+            self._queue.put((index, pixels))
+            self.blocked_time += time.perf_counter() - start
+            return True
+        try:
+            self._queue.put_nowait((index, pixels))
+        except queue.Full:
+            self.dropped += 1
+            return False
+        return True
+
+    def drop(self):
+        """Count a frame that was lost before it reached the queue."""
+        self.submitted += 1
+        self.dropped += 1
+
+    def _drain(self):
+        """Write queued frames until the end marker arrives."""
+        while True:
+            item = self._queue.get()
+            if item is None:
+                return
+            index, pixels = item
+            try:
+                self.writer.write(index, pixels)
+            except Exception as error:
+                with self._lock:
+                    if self.error is None:
+                        self.error = error
+                continue
+            with self._lock:
+                self.written += 1
+
+    @property
+    def queued(self):
+        """int: Frames waiting for a writer."""
+        return self._queue.qsize()
+
+    def stats(self):
+        """
+        Get capture statistics.
+
+        Returns:
+            dict: Submitted, written, dropped and queued frames and the
+            seconds submit() spent blocked
+        """
+        return {
+            "submitted": self.submitted,
+            "written": self.written,
+            "dropped": self.dropped,
+            "queued": self.queued,
+            "blocked_time": self.blocked_time,
+        }
+
+    def close(self):
+        """
+        Write the queued frames, stop the threads and finish the output.
+
+        Returns:
+            dict: Final statistics
+
+        Raises:
+            Exception: If the writer failed on any frame
+        """
+        for _ in self._threads:
+            self._queue.put(None)
+        for thread in self._threads:
+            thread.join()
+        self._threads = []
+        self.writer.close()
+        if self.error is not None:
+            raise Exception(f"Frame capture failed: {self.error}") from self.error
+        return self.stats()
@@ -0,0 +1,107 @@
+import glm
+import numpy as np
+from OpenGL.GL import *
+from ShaderCache import UNIFORM_BLOCK_BINDINGS
+from Profiler import profiler
+
+"""
+Per-frame uniform buffer holding camera and lighting data.
+
+The buffer matches the std140 "FrameData" block in shaders/frameData.glsl
+and is bound at a fixed binding point, so it is uploaded once per frame
+and read by every shader instead of being set per object and per program.
+
+Attributes:
+    FRAME_DATA_BINDING (int): Uniform buffer binding point of the block
+    FRAME_DATA_SIZE (int): Size of the block in bytes
+"""
+
+FRAME_DATA_BINDING = UNIFORM_BLOCK_BINDINGS["FrameData"]
+FRAME_DATA_SIZE = 3 * 64 + 3 * 16
+
+
+def pack_frame_data(data, projection_matrix, view, view_projection, camera_position, light_pos, light_color):
+    """
+    Write the block contents in std140 layout.
+
+    Matrices are copied from their own column-major memory. np.asarray()
+    of a glm matrix is indexed [row][column], so flattening it would
+    transpose every matrix.
+
+    Args:
+        data (numpy.ndarray): FRAME_DATA_SIZE // 4 float32 values receiving the block
+        projection_matrix (glm.mat4): Camera projection matrix
+        view (glm.mat4): Camera view matrix
+        view_projection (glm.mat4): projection_matrix * view
+        camera_position (glm.vec3): XYZ position of camera
+        light_pos (list): XYZ position of light source
+        light_color (list): RGB color of light source
+    """
+    data[0:16] = np.frombuffer(projection_matrix.to_bytes(), dtype=np.float32)
+    data[16:32] = np.frombuffer(view.to_bytes(), dtype=np.float32)
+    data[32:48] = np.frombuffer(view_projection.to_bytes(), dtype=np.float32)
+    data[48:51] = tuple(camera_position)
+    data[52:55] = tuple(light_pos)
+    data[56:59] = tuple(light_color)
+    data[51] = data[55] = data[59] = 1.0
+
+
+class FrameData:
+    """
+    Uniform buffer object with the per-frame camera and lighting state.
+
+    Layout (std140): projection, view and viewProjection as column-major
+    mat4, followed by cameraPosition, lightPosition and lightColor as vec4.
+
+    Attributes:
+        UBO (int): Uniform Buffer Object ID
+        data (numpy.ndarray): CPU copy of the buffer contents
+        view_projection (glm.mat4): Projection * view of the current frame
+        version (int): Incremented every time the buffer contents change
+    """
+
+    def __init__(self):
+        """Create the buffer and bind it to FRAME_DATA_BINDING."""
+        self.data = np.zeros(FRAME_DATA_SIZE // 4, dtype=np.float32)
+        self._uploaded = None
+        self.view_projection = glm.mat4(1.0)
+        self.version = 0
+
+        self.UBO = glGenBuffers(1)
+        glBindBuffer(GL_UNIFORM_BUFFER, self.UBO)
+        glBufferData(GL_UNIFORM_BUFFER, FRAME_DATA_SIZE, None, GL_DYNAMIC_DRAW)
+        glBindBuffer(GL_UNIFORM_BUFFER, 0)
+        glBindBufferBase(GL_UNIFORM_BUFFER, FRAME_DATA_BINDING, self.UBO)
+
+    def update(self, projection_matrix, view, camera_position, light_pos, light_color=(1.0, 1.0, 1.0)):
+        """
+        Upload the frame's camera and lighting data.
+
+        The upload is skipped when nothing changed since the last frame.
+
+        Args:
+            projection_matrix (glm.mat4): Camera projection matrix
+            view (glm.mat4): Camera view matrix
+            camera_position (glm.vec3): XYZ position of camera
+            light_pos (list): XYZ position of light source
+            light_color (list): RGB color of light source
+        """
+        view_projection = projection_matrix * view
+        data = self.data
+        pack_frame_data(data, projection_matrix, view, view_projection, camera_position, light_pos, light_color)
+
+        contents = data.tobytes()
+        if contents == self._uploaded:
+            return
+        self._uploaded = contents
+        self.view_projection = view_projection
+        self.version += 1
+
+        glBindBuffer(GL_UNIFORM_BUFFER, self.UBO)
+        glBufferSubData(GL_UNIFORM_BUFFER, 0, FRAME_DATA_SIZE, data)
+        profiler.count("uploaded_bytes", FRAME_DATA_SIZE)
+        glBindBuffer(GL_UNIFORM_BUFFER, 0)
+
+    def __del__(self):
+        """Clean up OpenGL resources."""
+        glDeleteBuffers(1, [self.UBO])
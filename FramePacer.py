@@ -0,0 +1,176 @@
+import time
+from collections import deque
+import numpy as np
+import glfw
+
+"""
+Frame pacing for the main loop.
+
+Three modes are supported:
+
+    vsync      buffer swaps wait for the display refresh (glfw.swap_interval(1))
+    limited    frames are held to a target rate by a hybrid limiter
+    unlimited  frames are rendered as fast as possible
+
+The limiter schedules frames on absolute deadlines, so timing errors do
+not accumulate. It sleeps until shortly before the deadline, because
+sleeping is cheap but wakes up late by a variable amount, and then spins,
+yielding the CPU between clock reads, for the last stretch. The spin
+margin follows the measured oversleep: it is the mean plus three standard
+deviations of the recent oversleeps, so the limiter spins for long only
+on systems whose sleep is imprecise.
+
+Attributes:
+    VSYNC (str): Synchronize buffer swaps with the display refresh
+    LIMITED (str): Hold frames to the target rate with the hybrid limiter
+    UNLIMITED (str): Do not limit the frame rate
+    MIN_SPIN (float): Smallest spin margin in seconds
+    MAX_SPIN (float): Largest spin margin in seconds
+"""
+
+VSYNC = "vsync"
+LIMITED = "limited"
+UNLIMITED = "unlimited"
+MIN_SPIN = 0.0002
+MAX_SPIN = 0.004
+
+
+class FramePacer:
+    """
+    Paces frames and keeps statistics about their timing.
+
+    Call start() once the OpenGL context is current and wait() once per
+    frame, after swapping buffers.
+
+    Attributes:
+        fps (float): Target frames per second of the limited mode
+        mode (str): VSYNC, LIMITED or UNLIMITED
+        frame_duration (float): Target frame duration in seconds
+        spin_margin (float): Time before a deadline at which sleeping stops
+        missed (int): Frames that ended after their deadline by more than a frame
+    """
+
+    def __init__(self, fps=60, mode=LIMITED, history=240, clock=time.perf_counter):
+        """
+        Initialize a frame pacer.
+
+        Args:
+            fps (float): Target frames per second of the limited mode
+            mode (str): VSYNC, LIMITED or UNLIMITED
+            history (int): Number of recent frames kept for statistics
+            clock (callable): Returns the current time in seconds
+
+        Raises:
+            Exception: If the mode is unknown
+        """
+        if mode not in (VSYNC, LIMITED, UNLIMITED):
+            raise Exception(f"Unknown frame pacing mode '{mode}'")
+        self.fps = fps
+        self.mode = mode
+        self.frame_duration = 1.0 / fps
+        self.spin_margin = MAX_SPIN
+        self.missed = 0
+        self.clock = clock
+        self._intervals = deque(maxlen=history)
+        self._oversleeps = deque(maxlen=history)
+        self._deadline = None
+        self._last_frame = None
+        self._set_swap_interval = glfw.swap_interval
+
+    def start(self, set_swap_interval=glfw.swap_interval):
+        """
+        Apply the swap interval of the mode and start timing frames.
+
+        Args:
+            set_swap_interval (callable): Sets the swap interval of the
+                current context, e.g. Window.set_swap_interval
+        """
+        self._set_swap_interval = set_swap_interval
+        set_swap_interval(1 if self.mode == VSYNC else 0)
+        self._last_frame = self.clock()
+        self._deadline = self._last_frame + self.frame_duration
+
+    def set_mode(self, mode):
+        """
+        Switch to another pacing mode.
+
+        Args:
+            mode (str): VSYNC, LIMITED or UNLIMITED
+
+        Raises:
+            Exception: If the mode is unknown
+        """
+        if mode not in (VSYNC, LIMITED, UNLIMITED):
+            raise Exception(f"Unknown frame pacing mode '{mode}'")
+        self.mode = mode
+        self._intervals.clear()
+        self.start(self._set_swap_interval)
+
+    def wait(self):
+        """
+        Wait until the next frame is due and record the frame's duration.
+
+        Returns:
+            float: Duration of the frame that just ended, in seconds
+        """
+        if self._last_frame is None:
+            self.start(self._set_swap_interval)
+        if self.mode == LIMITED:
+            self._wait_until(self._deadline)
+            now = self.clock()
+            self._deadline += self.frame_duration
+            if now > self._deadline:
+                # Too far behind to catch up: drop the schedule instead of
+                # rushing the next frames.
+                self.missed += 1
+                self._deadline = now + self.frame_duration
+        else:
+            now = self.clock()
+
+        interval = now - self._last_frame
+        self._last_frame = now
+        self._intervals.append(interval)
+        return interval
+
+    def _wait_until(self, deadline):
+        """
+        Sleep, then spin, until a deadline.
+
+        Args:
+            deadline (float): Clock time to return at
+        """
+        wake = deadline - self.spin_margin
+        now = self.clock()
+        if now < wake:
+            time.sleep(wake - now)
+            self._oversleeps.append(max(self.clock() - wake, 0.0))
+            oversleeps = np.array(self._oversleeps)
+            margin = oversleeps.mean() + 3.0 * oversleeps.std()
+            self.spin_margin = min(max(margin, MIN_SPIN), MAX_SPIN)
+        while self.clock() < deadline:
+            time.sleep(0)
+
+    def stats(self):
+        """
+        Get statistics about the recent frames.
+
+        Returns:
+            dict: Mean frame time, jitter (standard deviation), 99th
+            percentile and worst frame time in milliseconds, the resulting
+            frames per second, missed deadlines and the spin margin in
+            milliseconds
+        """
+        if not self._intervals:
+            return {"frame_ms": 0.0, "jitter_ms": 0.0, "p99_ms": 0.0, "max_ms": 0.0,
+                    "fps": 0.0, "missed": self.missed, "spin_ms": self.spin_margin * 1e3}
+        intervals = np.array(self._intervals) * 1e3
+        mean = float(intervals.mean())
+        return {
+            "frame_ms": mean,
+            "jitter_ms": float(intervals.std()),
+            "p99_ms": float(np.percentile(intervals, 99)),
+            "max_ms": float(intervals.max()),
+            "fps": 1e3 / mean if mean > 0 else 0.0,
+            "missed": self.missed,
+            "spin_ms": self.spin_margin * 1e3,
+        }
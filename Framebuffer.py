@@ -0,0 +1,98 @@
+import numpy as np
+from OpenGL.GL import *
+
+"""
+Offscreen render target and pixel readback.
+
+A Framebuffer is a framebuffer object with an RGBA8 color and a 24-bit
+depth renderbuffer. Headless contexts have no default framebuffer, so the
+engine renders into one of these instead; the same draw code works for both
+because it only ever draws into whatever framebuffer is bound.
+"""
+
+
+def read_pixels(width, height, x=0, y=0):
+    """
+    Read the color pixels of the bound read framebuffer.
+
+    Args:
+        width (int): Width of the region in pixels
+        height (int): Height of the region in pixels
+        x (int): Left edge of the region
+        y (int): Bottom edge of the region
+
+    Returns:
+        numpy.ndarray: (height, width, 4) uint8 RGBA image, top row first
+    """
+    pixels = np.empty((height, width, 4), dtype=np.uint8)
+    glPixelStorei(GL_PACK_ALIGNMENT, 1)
+    glReadPixels(x, y, width, height, GL_RGBA, GL_UNSIGNED_BYTE, pixels)
+    # OpenGL rows start at the bottom of the image.
+    return pixels[::-1]
+
+
+class Framebuffer:
+    """
+    A framebuffer object with color and depth renderbuffers.
+
+    Attributes:
+        width (int): Width in pixels
+        height (int): Height in pixels
+        FBO (int): Framebuffer Object ID
+        color_buffer (int): Color renderbuffer ID
+        depth_buffer (int): Depth renderbuffer ID
+    """
+
+    def __init__(self, width, height):
+        """
+        Create the framebuffer.
+
+        Args:
+            width (int): Width in pixels
+            height (int): Height in pixels
+
+        Raises:
+            Exception: If the framebuffer is incomplete
+        """
+        self.width = width
+        self.height = height
+        self.FBO = glGenFramebuffers(1)
+        self.color_buffer = glGenRenderbuffers(1)
+        self.depth_buffer = glGenRenderbuffers(1)
+
+        glBindFramebuffer(GL_FRAMEBUFFER, self.FBO)
+        glBindRenderbuffer(GL_RENDERBUFFER, self.color_buffer)
+        glRenderbufferStorage(GL_RENDERBUFFER, GL_RGBA8, width, height)
+        glFramebufferRenderbuffer(GL_FRAMEBUFFER, GL_COLOR_ATTACHMENT0, GL_RENDERBUFFER, self.color_buffer)
+        glBindRenderbuffer(GL_RENDERBUFFER, self.depth_buffer)
+        glRenderbufferStorage(GL_RENDERBUFFER, GL_DEPTH_COMPONENT24, width, height)
+        glFramebufferRenderbuffer(GL_FRAMEBUFFER, GL_DEPTH_ATTACHMENT, GL_RENDERBUFFER, self.depth_buffer)
+        glBindRenderbuffer(GL_RENDERBUFFER, 0)
+
+        status = glCheckFramebufferStatus(GL_FRAMEBUFFER)
+        glBindFramebuffer(GL_FRAMEBUFFER, 0)
+        if status != GL_FRAMEBUFFER_COMPLETE:
+            raise Exception(f"Framebuffer is incomplete (status {status:#x})")
+
+    def bind(self):
+        """Render into and read from this framebuffer."""
+        glBindFramebuffer(GL_FRAMEBUFFER, self.FBO)
+
+    def unbind(self):
+        """Go back to the default framebuffer."""
+        glBindFramebuffer(GL_FRAMEBUFFER, 0)
+
+    def read_pixels(self):
+        """
+        Read the whole color buffer.
+
+        Returns:
+            numpy.ndarray: (height, width, 4) uint8 RGBA image, top row first
+        """
+        glBindFramebuffer(GL_READ_FRAMEBUFFER, self.FBO)
+        return read_pixels(self.width, self.height)
+
+    def __del__(self):
+        """Clean up OpenGL resources."""
+        glDeleteRenderbuffers(2, [self.color_buffer, self.depth_buffer])
+        glDeleteFramebuffers(1, [self.FBO])
@@ -0,0 +1,115 @@
+import numpy as np
+
+"""
+View-frustum extraction and vectorized visibility tests.
+
+The six clip planes are extracted from the projection * view matrix
+(Gribb and Hartmann), normalized and stored as rows (a, b, c, d) with the
+normal pointing into the frustum, so a point p is inside a plane when
+dot((a, b, c), p) + d >= 0. Every test takes arrays of bounding volumes and
+returns a boolean mask, so thousands of objects are culled in a few NumPy
+operations.
+"""
+
+
+def extract_planes(view_projection):
+    """
+    Extract the clip planes of a camera.
+
+    Args:
+        view_projection (glm.mat4 or numpy.ndarray): Projection * view matrix;
+            a NumPy array is indexed [row][column], as np.asarray() of a glm
+            matrix is
+
+    Returns:
+        numpy.ndarray: (6, 4) normalized planes: left, right, bottom, top, near, far
+    """
+    # np.asarray() of a glm matrix is indexed [row][column], so m[i] is row i.
+    m = np.asarray(view_projection, dtype=np.float64).reshape(4, 4)
+    planes = np.array([
+        m[3] + m[0],
+        m[3] - m[0],
+        m[3] + m[1],
+        m[3] - m[1],
+        m[3] + m[2],
+        m[3] - m[2],
+    ])
+    planes /= np.linalg.norm(planes[:, :3], axis=1, keepdims=True)
+    return planes
+
+
+def view_depths(view_projection, centers):
+    """
+    Get the view depths of points, for sorting them front to back.
+
+    Args:
+        view_projection (glm.mat4 or numpy.ndarray): Projection * view matrix,
+            indexed [row][column] if a NumPy array
+        centers (numpy.ndarray): (N, 3) world-space points
+
+    Returns:
+        numpy.ndarray: (N,) distances along the view direction
+    """
+    # With a perspective projection the clip-space w of a point is its view depth.
+    m = np.asarray(view_projection, dtype=np.float64).reshape(4, 4)
+    return centers @ m[3, :3] + m[3, 3]
+
+
+def spheres_visible(planes, centers, radii):
+    """
+    Test bounding spheres against the frustum.
+
+    Args:
+        planes (numpy.ndarray): (6, 4) planes from extract_planes()
+        centers (numpy.ndarray): (N, 3) world-space sphere centers
+        radii (numpy.ndarray): (N,) world-space sphere radii
+
+    Returns:
+        numpy.ndarray: (N,) True for spheres that intersect the frustum
+    """
+    distances = centers @ planes[:, :3].T + planes[:, 3]
+    return np.all(distances >= -radii[:, None], axis=1)
+
+
+def boxes_visible(planes, centers, extents):
+    """
+    Test axis-aligned bounding boxes against the frustum.
+
+    Args:
+        planes (numpy.ndarray): (6, 4) planes from extract_planes()
+        centers (numpy.ndarray): (N, 3) world-space box centers
+        extents (numpy.ndarray): (N, 3) world-space box half sizes
+
+    Returns:
+        numpy.ndarray: (N,) True for boxes that intersect the frustum
+    """
+    distances = centers @ planes[:, :3].T + planes[:, 3]
+    reach = extents @ np.abs(planes[:, :3]).T
+    return np.all(distances >= -reach, axis=1)
+
+
+def world_bounds(model, center, radius, box_center, box_extent):
+    """
+    Transform local bounding volumes by a model matrix.
+
+    Args:
+        model (numpy.ndarray): (4, 4) model matrix indexed [row][column],
+            as np.asarray() of a glm matrix is
+        center (numpy.ndarray): Local bounding sphere center
+        radius (float): Local bounding sphere radius
+        box_center (numpy.ndarray): Local box center
+        box_extent (numpy.ndarray): Local box half sizes
+
+    Returns:
+        tuple: World sphere center and radius, world box center and half sizes
+    """
+    axes = model[:3, :3]
+    translation = model[:3, 3]
+    # The longest transformed axis bounds how far the sphere can stretch.
+    scale = np.sqrt((axes * axes).sum(axis=0)).max()
+    return (
+        center @ axes.T + translation,
+        radius * scale,
+        box_center @ axes.T + translation,
+        box_extent @ np.abs(axes).T,
+    )
@@ -0,0 +1,248 @@
+import ctypes
+import os
+import sys
+
+"""
+Headless OpenGL context for machines without a display or GPU.
+
+The context is created through EGL (with Mesa, the surfaceless platform
+and the llvmpipe software renderer work without any display or GPU) or
+through OSMesa, and the engine renders into a Framebuffer of the requested
+size. HeadlessWindow offers the same methods as Window, so the engine's
+main loop, scene and draw code run unchanged in both modes.
+
+PyOpenGL picks its platform when OpenGL is first imported, so the backend
+has to be chosen with select_backend() (or the PYOPENGL_PLATFORM
+environment variable) before any module importing OpenGL is loaded.
+
+Attributes:
+    BACKENDS (tuple): Supported headless backends
+    EGL_PLATFORM_SURFACELESS_MESA (int): EGL platform without any window system
+"""
+
+BACKENDS = ("egl", "osmesa")
+EGL_PLATFORM_SURFACELESS_MESA = 0x31DD
+
+
+def select_backend(backend="egl"):
+    """
+    Make PyOpenGL use a headless backend.
+
+    Args:
+        backend (str): "egl" or "osmesa"
+
+    Raises:
+        Exception: If the backend is unknown or OpenGL was already imported
+            with another platform
+    """
+    if backend not in BACKENDS:
+        raise Exception(f"Unknown headless backend '{backend}', expected one of {BACKENDS}")
+    current = os.environ.get("PYOPENGL_PLATFORM")
+    if "OpenGL.GL" in sys.modules and current != backend:
+        raise Exception(
+            f"OpenGL was already imported with platform '{current}'; "
+            "select the headless backend before importing the engine"
+        )
+    os.environ["PYOPENGL_PLATFORM"] = backend
+
+
+class HeadlessWindow:
+    """
+    An offscreen stand-in for Window.
+
+    Attributes:
+        W (int): Framebuffer width in pixels
+        H (int): Framebuffer height in pixels
+        title (str): Title, kept for compatibility with Window
+        backend (str): "egl" or "osmesa"
+        frames (int): Number of frames after which should_close() returns
+            True, None to never close by itself
+        framebuffer (Framebuffer): Render target of the engine
+    """
+
+    def __init__(self, W, H, title, backend=None, frames=None):
+        """
+        Initialize window parameters.
+
+        Args:
+            W (int): Framebuffer width in pixels
+            H (int): Framebuffer height in pixels
+            title (str): Title, unused
+            backend (str, optional): "egl" or "osmesa"; defaults to the
+                PYOPENGL_PLATFORM environment variable, then to "egl"
+            frames (int, optional): Close after this many swap_buffers() calls
+        """
+        self.W = W
+        self.H = H
+        self.title = title
+        self.backend = backend or os.environ.get("PYOPENGL_PLATFORM") or "egl"
+        self.frames = frames
+        self.framebuffer = None
+        self._swaps = 0
+        self._display = None
+        self._context = None
+        self._buffer = None
+
+    def setup(self):
+        """
+        Create the context, make it current and bind the framebuffer.
+
+        Raises:
+            Exception: If the backend does not match PyOpenGL's platform or
+                the context cannot be created
+        """
+        select_backend(self.backend)
+        if self.backend == "egl":
+            self._create_egl_context()
+        else:
+            self._create_osmesa_context()
+
+        from Framebuffer import Framebuffer
+
+        self.framebuffer = Framebuffer(self.W, self.H)
+        self.framebuffer.bind()
+
+    def _create_egl_context(self):
+        """Create an OpenGL 3.3 core context on a surfaceless EGL display."""
+        from OpenGL import EGL, arrays
+
+        display = EGL.EGL_NO_DISPLAY
+        if bool(EGL.eglGetPlatformDisplayEXT):
+            display = EGL.eglGetPlatformDisplayEXT(EGL_PLATFORM_SURFACELESS_MESA, EGL.EGL_DEFAULT_DISPLAY, None)
+        if display == EGL.EGL_NO_DISPLAY:
+            display = EGL.eglGetDisplay(EGL.EGL_DEFAULT_DISPLAY)
+        major, minor = EGL.EGLint(), EGL.EGLint()
+        if display == EGL.EGL_NO_DISPLAY or not EGL.eglInitialize(display, ctypes.pointer(major), ctypes.pointer(minor)):
+            raise Exception("EGL display could not be initialized!")
+
+        config_attributes = arrays.GLintArray.asArray([
+            EGL.EGL_RED_SIZE, 8,
+            EGL.EGL_GREEN_SIZE, 8,
+            EGL.EGL_BLUE_SIZE, 8,
+            EGL.EGL_ALPHA_SIZE, 8,
+            EGL.EGL_DEPTH_SIZE, 24,
+            EGL.EGL_RENDERABLE_TYPE, EGL.EGL_OPENGL_BIT,
+            # The default asks for window surfaces, which a surfaceless
+            # display has none of; rendering goes to the framebuffer.
+            EGL.EGL_SURFACE_TYPE, 0,
+            EGL.EGL_NONE,
+        ])
+        configs = (EGL.EGLConfig * 1)()
+        count = EGL.EGLint()
+        if not EGL.eglChooseConfig(display, config_attributes, configs, 1, ctypes.pointer(count)) or count.value == 0:
+            raise Exception("No EGL configuration supports desktop OpenGL!")
+
+        EGL.eglBindAPI(EGL.EGL_OPENGL_API)
+        context_attributes = arrays.GLintArray.asArray([
+            EGL.EGL_CONTEXT_MAJOR_VERSION, 3,
+            EGL.EGL_CONTEXT_MINOR_VERSION, 3,
+            EGL.EGL_CONTEXT_OPENGL_PROFILE_MASK, EGL.EGL_CONTEXT_OPENGL_CORE_PROFILE_BIT,
+            EGL.EGL_NONE,
+        ])
+        context = EGL.eglCreateContext(display, configs[0], EGL.EGL_NO_CONTEXT, context_attributes)
+        if context == EGL.EGL_NO_CONTEXT:
+            raise Exception("EGL context could not be created!")
+        if not EGL.eglMakeCurrent(display, EGL.EGL_NO_SURFACE, EGL.EGL_NO_SURFACE, context):
+            raise Exception("EGL context could not be made current!")
+        self._display = display
+        self._context = context
+
+    def _create_osmesa_context(self):
+        """Create an OpenGL 3.3 core context with OSMesa."""
+        import numpy as np
+        from OpenGL import osmesa, arrays
+        from OpenGL.GL import GL_UNSIGNED_BYTE
+
+        attributes = arrays.GLintArray.asArray([
+            osmesa.OSMESA_FORMAT, osmesa.OSMESA_RGBA,
+            osmesa.OSMESA_DEPTH_BITS, 24,
+            osmesa.OSMESA_PROFILE, osmesa.OSMESA_CORE_PROFILE,
+            osmesa.OSMESA_CONTEXT_MAJOR_VERSION, 3,
+            osmesa.OSMESA_CONTEXT_MINOR_VERSION, 3,
+            0,
+        ])
+        context = osmesa.OSMesaCreateContextAttribs(attributes, None)
+        if not context:
+            raise Exception("OSMesa context could not be created!")
+        # OSMesa needs a client-side buffer to be current, even though the
+        # engine renders into its own framebuffer object.
+        self._buffer = np.zeros((self.H, self.W, 4), dtype=np.uint8)
+        if not osmesa.OSMesaMakeCurrent(context, self._buffer, GL_UNSIGNED_BYTE, self.W, self.H):
+            raise Exception("OSMesa context could not be made current!")
+        self._context = context
+
+    def getWindow(self):
+        """
+        Returns the window handle; headless contexts have none.
+
+        Returns:
+            None
+        """
+        return None
+
+    def get_size(self):
+        """
+        Get the size of the render target.
+
+        Returns:
+            tuple: Width and height in pixels
+        """
+        return self.W, self.H
+
+    def set_title(self, title):
+        """
+        Set the window title; ignored without a window.
+
+        Args:
+            title (str): New title
+        """
+        self.title = title
+
+    def set_swap_interval(self, interval):
+        """
+        Set the swap interval; there is no display to synchronize with.
+
+        Args:
+            interval (int): Ignored
+        """
+
+    def should_close(self):
+        """
+        Check if the frame budget is used up.
+
+        Returns:
+            bool: True once frames frames were swapped
+        """
+        return self.frames is not None and self._swaps >= self.frames
+
+    def swap_buffers(self):
+        """Finish the frame; the image stays in the framebuffer until the next one."""
+        self._swaps += 1
+
+    def process_input(self):
+        """Process input events; there are none without a window."""
+
+    def read_pixels(self):
+        """
+        Read the last rendered frame.
+
+        Returns:
+            numpy.ndarray: (H, W, 4) uint8 RGBA image, top row first
+        """
+        return self.framebuffer.read_pixels()
+
+    def __del__(self):
+        """Release the framebuffer and the context."""
+        self.framebuffer = None
+        if self._context is None:
+            return
+        if self.backend == "egl":
+            from OpenGL import EGL
+
+            EGL.eglMakeCurrent(self._display, EGL.EGL_NO_SURFACE, EGL.EGL_NO_SURFACE, EGL.EGL_NO_CONTEXT)
+            EGL.eglDestroyContext(self._display, self._context)
+            EGL.eglTerminate(self._display)
+        else:
+            from OpenGL import osmesa
+
+            osmesa.OSMesaDestroyContext(self._context)
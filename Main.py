@@ -1,3 +1,12 @@
+import sys
+import numpy as np
+from HeadlessWindow import select_backend
+
+HEADLESS = "--headless" in sys.argv
+if HEADLESS:
+    # PyOpenGL binds its platform on first import, before Engine is loaded.
+    select_backend()
+
 from Engine import Engine
 from OpenGL.GL import *
 import glm
@@ -12,12 +21,20 @@ Attributes:
     WINDOW_WIDTH (int): Initial window width in pixels
     WINDOW_HEIGHT (int): Initial window height in pixels
     WINDOW_TITLE (str): Window title text
+    HEADLESS (bool): Render offscreen without a display (--headless)
+    HEADLESS_FRAMES (int): Frames rendered in headless mode
     
 Example:
     Run the application:
         $ python Main.py
+
+    Render offscreen and save the last frame to headless_frame.npy:
+        $ python Main.py --headless
 """
 
+HEADLESS_FRAMES = 120
+
+
 def main():
     """
     Initialize and run the main application loop.
@@ -26,7 +43,16 @@ def main():
     and manages the render loop.
     """
 
-    engine = Engine(1280, 800, "3D", False, 6000)
+    if HEADLESS:
+        engine = Engine(
+            1280, 800, "3D", False, 60,
+            shader_cache_dir=".shader_cache",
+            frame_pacing="unlimited",
+            headless=True,
+            headless_frames=HEADLESS_FRAMES,
+        )
+    else:
+        engine = Engine(1280, 800, "3D", False, 60, shader_cache_dir=".shader_cache", frame_pacing="vsync")
     
     engine.initialize()
     
@@ -34,6 +60,9 @@ def main():
     engine.set_projection(60.0, 1280.0 / 800.0, 0.1, 100.0, 1)
     
     engine.main_loop()
+
+    if HEADLESS:
+        np.save("headless_frame.npy", engine.capture_frame())
     
     engine.terminate()
 
@@ -0,0 +1,69 @@
+import glm
+import numpy as np
+
+"""
+CPU ray picking.
+
+A click is turned into a world-space ray by unprojecting the cursor
+through the inverse of projection * view. Scene.pick() then narrows the
+candidates with the scene BVH and tests the ray exactly against the
+triangles of each candidate mesh, so no GPU readback is needed.
+"""
+
+
+def screen_ray(x, y, width, height, projection, view):
+    """
+    Build the world-space ray under a cursor position.
+
+    Args:
+        x (float): Cursor x-coordinate in window pixels, from the left
+        y (float): Cursor y-coordinate in window pixels, from the top
+        width (int): Window width in pixels
+        height (int): Window height in pixels
+        projection (glm.mat4): Camera projection matrix
+        view (glm.mat4): Camera view matrix
+
+    Returns:
+        tuple: Ray origin on the near plane and direction towards the far
+        plane, as numpy arrays; the far plane is at ray parameter 1
+    """
+    ndc_x = 2.0 * x / width - 1.0
+    ndc_y = 1.0 - 2.0 * y / height
+    inverse = glm.inverse(projection * view)
+    near = inverse * glm.vec4(ndc_x, ndc_y, -1.0, 1.0)
+    far = inverse * glm.vec4(ndc_x, ndc_y, 1.0, 1.0)
+    near = glm.vec3(near) / near.w
+    far = glm.vec3(far) / far.w
+    return np.array(near, dtype=np.float64), np.array(far - near, dtype=np.float64)
+
+
+def ray_triangles(origin, direction, triangles):
+    """
+    Intersect a ray with many triangles (Moller-Trumbore, both sides).
+
+    Args:
+        origin (numpy.ndarray): Ray origin
+        direction (numpy.ndarray): Ray direction
+        triangles (numpy.ndarray): (N, 3, 3) triangle corner positions
+
+    Returns:
+        numpy.ndarray: (N,) ray parameters of the hits, inf for misses
+    """
+    v0 = triangles[:, 0]
+    edge1 = triangles[:, 1] - v0
+    edge2 = triangles[:, 2] - v0
+
+    p = np.cross(direction, edge2)
+    determinant = (edge1 * p).sum(axis=1)
+    valid = np.abs(determinant) > 1e-12
+    inverse = np.zeros_like(determinant)
+    inverse[valid] = 1.0 / determinant[valid]
+
+    s = origin - v0
+    u = (s * p).sum(axis=1) * inverse
+    q = np.cross(s, edge1)
+    v = (q * direction).sum(axis=1) * inverse
+    t = (q * edge2).sum(axis=1) * inverse
+
+    hit = valid & (u >= 0.0) & (v >= 0.0) & (u + v <= 1.0) & (t >= 0.0)
+    return np.where(hit, t, np.inf)
@@ -0,0 +1,330 @@
+import json
+import time
+from collections import deque
+import numpy as np
+from OpenGL.GL import *
+
+"""
+Frame profiler with CPU scopes, GPU timer queries and counters.
+
+CPU time is measured with named scopes that may be nested; a scope is
+identified by its path, e.g. "render/cull". Scopes opened with gpu=True
+also wrap their OpenGL commands in a GL_TIME_ELAPSED query. Query results
+are only read once the GPU reports them available, typically a few frames
+later, so profiling never waits for the GPU. GPU scopes cannot be nested,
+because OpenGL allows one active elapsed-time query at a time.
+
+Counters such as draw calls, triangles, state changes and uploaded bytes
+are summed per frame. The last frames are kept in a rolling window from
+which stats() computes percentiles, and export_chrome_trace() writes them
+in the Chrome trace event format (chrome://tracing, Perfetto).
+
+Attributes:
+    profiler (Profiler): Profiler shared by the engine and its modules
+"""
+
+
+class _Scope:
+    """Context manager timing one profiler scope."""
+
+    __slots__ = ("profiler", "name", "gpu", "path", "start", "query")
+
+    def __init__(self, profiler, name, gpu):
+        self.profiler = profiler
+        self.name = name
+        self.gpu = gpu
+
+    def __enter__(self):
+        profiler = self.profiler
+        stack = profiler._stack
+        self.path = f"{stack[-1].path}/{self.name}" if stack else self.name
+        self.query = profiler._begin_query(self.path) if self.gpu else None
+        stack.append(self)
+        self.start = profiler.clock()
+        return self
+
+    def __exit__(self, *exc_info):
+        profiler = self.profiler
+        end = profiler.clock()
+        if self.query is not None:
+            profiler._end_query(self.query, self.path, self.start)
+        profiler._stack.pop()
+        profiler._record(self.path, len(profiler._stack), self.start, end - self.start)
+        return False
+
+
+class _NullScope:
+    """Context manager doing nothing, used while profiling is disabled."""
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+
+_NULL_SCOPE = _NullScope()
+
+
+class Profiler:
+    """
+    Collects CPU and GPU timings and counters over a rolling window of frames.
+
+    Call begin_frame() and end_frame() around every frame, time its stages
+    with scope() and add to counters with count().
+
+    Attributes:
+        enabled (bool): Whether scopes and counters are recorded
+        history (int): Number of frames kept in the rolling window
+        frame (int): Number of the current frame
+        frames (collections.deque): Records of the last frames, oldest first
+    """
+
+    def __init__(self, history=240, enabled=True, clock=time.perf_counter):
+        """
+        Initialize a profiler.
+
+        Args:
+            history (int): Number of frames kept in the rolling window
+            enabled (bool): Whether scopes and counters are recorded
+            clock (callable): Returns the current time in seconds
+        """
+        self.enabled = enabled
+        self.history = history
+        self.clock = clock
+        self.frame = 0
+        self.frames = deque(maxlen=history)
+        self._origin = clock()
+        self._current = None
+        self._stack = []
+        self._gpu_active = False
+        self._free_queries = []
+        self._pending = deque()
+        self._result = np.zeros(1, dtype=np.uint64)
+        self._available = np.zeros(1, dtype=np.int32)
+
+    @property
+    def pending_queries(self):
+        """int: GPU queries whose results are not available yet."""
+        return len(self._pending)
+
+    def begin_frame(self):
+        """Start recording a new frame."""
+        if not self.enabled:
+            return
+        self.frame += 1
+        self._current = {
+            "frame": self.frame,
+            "start": self.clock(),
+            "duration": 0.0,
+            "cpu": {},
+            "gpu": {},
+            "counters": {},
+            "events": [],
+        }
+
+    def end_frame(self):
+        """Finish the current frame and collect the GPU results that are ready."""
+        current = self._current
+        if current is None:
+            return
+        current["duration"] = self.clock() - current["start"]
+        self.frames.append(current)
+        self._current = None
+        self._collect_queries()
+
+    def scope(self, name, gpu=False):
+        """
+        Time a stage of the frame.
+
+        Example:
+            with profiler.scope("cull"):
+                ...
+
+        Args:
+            name (str): Stage name, unique among the scopes of its parent
+            gpu (bool): Also measure the GPU time of the OpenGL commands
+                issued inside the scope
+
+        Returns:
+            Context manager measuring the scope
+        """
+        if self._current is None:
+            return _NULL_SCOPE
+        return _Scope(self, name, gpu)
+
+    def count(self, name, value=1):
+        """
+        Add to a per-frame counter.
+
+        Args:
+            name (str): Counter name, e.g. "draw_calls"
+            value (int): Amount to add
+        """
+        current = self._current
+        if current is not None:
+            counters = current["counters"]
+            counters[name] = counters.get(name, 0) + value
+
+    def count_all(self, counters):
+        """
+        Add to several per-frame counters.
+
+        Args:
+            counters (dict): Maps counter names to amounts
+        """
+        for name, value in counters.items():
+            self.count(name, value)
+
+    def _record(self, path, depth, start, duration):
+        """
+        Record a finished CPU scope in the current frame.
+
+        Args:
+            path (str): Scope path
+            depth (int): Nesting depth, 0 for top-level scopes
+            start (float): Clock time the scope started at
+            duration (float): Scope duration in seconds
+        """
+        current = self._current
+        if current is None:
+            return
+        cpu = current["cpu"]
+        cpu[path] = cpu.get(path, 0.0) + duration
+        current["events"].append((path, depth, start, duration))
+
+    def _begin_query(self, path):
+        """
+        Start a GL_TIME_ELAPSED query for a GPU scope.
+
+        Args:
+            path (str): Scope path
+
+        Returns:
+            int: Query object ID
+
+        Raises:
+            Exception: If another GPU scope is active
+        """
+        if self._gpu_active:
+            raise Exception(f"GPU scope '{path}' cannot be nested in another GPU scope")
+        query = self._free_queries.pop() if self._free_queries else glGenQueries(1)
+        glBeginQuery(GL_TIME_ELAPSED, query)
+        self._gpu_active = True
+        return query
+
+    def _end_query(self, query, path, start):
+        """
+        End a GPU scope's query and queue it for collection.
+
+        Args:
+            query (int): Query object ID
+            path (str): Scope path
+            start (float): CPU clock time the scope started at
+        """
+        glEndQuery(GL_TIME_ELAPSED)
+        self._gpu_active = False
+        self._pending.append((self._current, path, start, query))
+
+    def _collect_queries(self):
+        """Read the results of finished queries, oldest first, without waiting."""
+        while self._pending:
+            record, path, start, query = self._pending[0]
+            glGetQueryObjectiv(query, GL_QUERY_RESULT_AVAILABLE, self._available)
+            if not self._available[0]:
+                break
+            self._pending.popleft()
+            glGetQueryObjectui64v(query, GL_QUERY_RESULT, self._result)
+            seconds = int(self._result[0]) / 1e9
+            gpu = record["gpu"]
+            gpu[path] = gpu.get(path, 0.0) + seconds
+            record["events"].append((path, -1, start, seconds))
+            self._free_queries.append(query)
+
+    def stats(self):
+        """
+        Summarize the rolling window.
+
+        Returns:
+            dict: For the frame time, every CPU and GPU scope path and every
+            counter, the mean, p50, p95, p99 and maximum over the frames in
+            the window; times are in milliseconds
+        """
+        frames = list(self.frames)
+
+        def summary(values):
+            values = np.asarray(values, dtype=np.float64)
+            p50, p95, p99 = np.percentile(values, [50, 95, 99])
+            return {"mean": float(values.mean()), "p50": float(p50), "p95": float(p95),
+                    "p99": float(p99), "max": float(values.max())}
+
+        def series(kind, scale):
+            names = sorted({name for frame in frames for name in frame[kind]})
+            return {name: summary([frame[kind].get(name, 0) * scale for frame in frames]) for name in names}
+
+        if not frames:
+            return {"frames": 0, "frame_ms": None, "cpu_ms": {}, "gpu_ms": {}, "counters": {}}
+        return {
+            "frames": len(frames),
+            "frame_ms": summary([frame["duration"] * 1e3 for frame in frames]),
+            "cpu_ms": series("cpu", 1e3),
+            # GPU results of the newest frames may still be in flight.
+            "gpu_ms": series("gpu", 1e3),
+            "counters": series("counters", 1),
+        }
+
+    def chrome_trace(self):
+        """
+        Build a Chrome trace of the frames in the rolling window.
+
+        CPU scopes are on thread 1 and GPU scopes on thread 2, placed at the
+        CPU time they were issued; counters are counter events at the start
+        of their frame.
+
+        Returns:
+            dict: Trace in the Chrome trace event format
+        """
+        events = []
+        for frame in self.frames:
+            frame_start = (frame["start"] - self._origin) * 1e6
+            events.append({"name": f"frame {frame['frame']}", "cat": "frame", "ph": "X", "pid": 1, "tid": 1,
+                           "ts": frame_start, "dur": frame["duration"] * 1e6})
+            for path, depth, start, duration in frame["events"]:
+                gpu = depth < 0
+                events.append({
+                    "name": path.rsplit("/", 1)[-1],
+                    "cat": "gpu" if gpu else "cpu",
+                    "ph": "X",
+                    "pid": 1,
+                    "tid": 2 if gpu else 1,
+                    "ts": (start - self._origin) * 1e6,
+                    "dur": duration * 1e6,
+                    "args": {"path": path},
+                })
+            if frame["counters"]:
+                events.append({"name": "counters", "ph": "C", "pid": 1, "tid": 1,
+                               "ts": frame_start, "args": dict(frame["counters"])})
+        events.append({"name": "thread_name", "ph": "M", "pid": 1, "tid": 1, "args": {"name": "CPU"}})
+        events.append({"name": "thread_name", "ph": "M", "pid": 1, "tid": 2, "args": {"name": "GPU"}})
+        return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+    def export_chrome_trace(self, file_path):
+        """
+        Write the frames in the rolling window as a Chrome trace JSON file.
+
+        Args:
+            file_path (str): Path of the JSON file to write
+        """
+        with open(file_path, "w", encoding="utf-8") as file:
+            json.dump(self.chrome_trace(), file)
+
+    def delete(self):
+        """Free the GPU query objects. Must be called with the context current."""
+        queries = self._free_queries + [entry[3] for entry in self._pending]
+        if queries:
+            glDeleteQueries(len(queries), queries)
+        self._free_queries = []
+        self._pending.clear()
+
+
+profiler = Profiler()
@@ -0,0 +1,161 @@
+import numpy as np
+from OpenGL.GL import *
+
+"""
+State-sorted render queue.
+
+Drawables submit draw packets during the frame instead of drawing right
+away. On flush the packets are sorted by a packed 64-bit key and issued,
+binding the program, texture and vertex array only when they differ from
+the previous packet and never unbinding in between.
+
+Key layout, from the most significant bit:
+
+    1 bit   transparent (opaque packets are drawn first)
+    15 bits program
+    16 bits texture
+    16 bits mesh (vertex array)
+    16 bits depth, front to back for opaque and back to front for
+            transparent packets
+
+Programs, textures and meshes are ranked by first appearance in the
+frame, so the key fields stay small no matter how large the OpenGL names
+are. The ranks start over with every flush.
+
+Attributes:
+    DEPTH_LEVELS (int): Number of quantized depth values in a key
+    FIELD_BITS (dict): Width in bits of the program, texture and mesh fields
+"""
+
+DEPTH_LEVELS = 1 << 16
+FIELD_BITS = {"program": 15, "texture": 16, "mesh": 16}
+
+
+class RenderQueue:
+    """
+    Collects draw packets for a frame and issues them in state order.
+
+    Attributes:
+        stats (dict): Draws, triangles and program, texture and vertex array
+            changes of the last flush
+    """
+
+    def __init__(self):
+        """Initialize an empty queue."""
+        self._packets = []
+        self._ranks = {field: {} for field in FIELD_BITS}
+        self.stats = {"draws": 0, "triangles": 0, "program_changes": 0, "texture_changes": 0, "vao_changes": 0}
+
+    def __len__(self):
+        return len(self._packets)
+
+    def _rank(self, field, value):
+        """
+        Get the small number identifying a program, texture or mesh.
+
+        Args:
+            field (str): Key field, "program", "texture" or "mesh"
+            value (int): OpenGL name
+
+        Returns:
+            int: Rank of the value, by first appearance in the frame
+
+        Raises:
+            Exception: If the frame uses more distinct values than the field holds
+        """
+        table = self._ranks[field]
+        rank = table.get(value)
+        if rank is None:
+            rank = len(table) + 1
+            if rank >> FIELD_BITS[field]:
+                raise Exception(f"More than {rank - 1} different {field}s in one frame do not fit in a sort key")
+            table[value] = rank
+        return rank
+
+    def submit(self, drawable, depth=0.0, transparent=False):
+        """
+        Queue a drawable for the current frame.
+
+        Args:
+            drawable (DrawableObject): Object to draw
+            depth (float): View-space distance used to order packets with equal state
+            transparent (bool): Draw after all opaque packets, back to front
+        """
+        texture = drawable.texture
+        self._packets.append((
+            transparent,
+            self._rank("program", drawable.shader.program_id),
+            0 if texture is None else self._rank("texture", texture),
+            self._rank("mesh", drawable.VAO),
+            depth,
+            drawable,
+        ))
+
+    def sort_keys(self):
+        """
+        Compute the sort keys of the queued packets.
+
+        Returns:
+            numpy.ndarray: (N,) uint64 keys in submission order
+        """
+        if not self._packets:
+            return np.zeros(0, dtype=np.uint64)
+        transparent, programs, textures, meshes, depths, _ = zip(*self._packets)
+
+        depths = np.asarray(depths, dtype=np.float64)
+        low, high = depths.min(), depths.max()
+        scale = (DEPTH_LEVELS - 1) / (high - low) if high > low else 0.0
+        quantized = ((depths - low) * scale).astype(np.uint64)
+        transparent = np.asarray(transparent, dtype=bool)
+        quantized[transparent] = DEPTH_LEVELS - 1 - quantized[transparent]
+
+        keys = np.asarray(transparent, dtype=np.uint64) << np.uint64(63)
+        keys |= np.asarray(programs, dtype=np.uint64) << np.uint64(48)
+        keys |= np.asarray(textures, dtype=np.uint64) << np.uint64(32)
+        keys |= np.asarray(meshes, dtype=np.uint64) << np.uint64(16)
+        keys |= quantized
+        return keys
+
+    def flush(self, sort=True):
+        """
+        Issue every queued packet and empty the queue.
+
+        Args:
+            sort (bool): Sort by key; False issues the packets in submission
+                order, which is useful to measure what sorting saves
+
+        Returns:
+            dict: Draws, triangles and state changes of this flush
+        """
+        packets = self._packets
+        if sort and packets:
+            packets = [packets[i] for i in np.argsort(self.sort_keys(), kind="stable")]
+
+        stats = {"draws": 0, "triangles": 0, "program_changes": 0, "texture_changes": 0, "vao_changes": 0}
+        program = texture = vao = None
+        for packet in packets:
+            drawable = packet[5]
+            if drawable.shader.program_id != program:
+                program = drawable.shader.program_id
+                glUseProgram(program)
+                stats["program_changes"] += 1
+            if drawable.texture is not None and drawable.texture != texture:
+                texture = drawable.texture
+                glActiveTexture(GL_TEXTURE0)
+                glBindTexture(GL_TEXTURE_2D, texture)
+                stats["texture_changes"] += 1
+            drawable.set_uniforms()
+            if drawable.VAO != vao:
+                vao = drawable.VAO
+                glBindVertexArray(vao)
+                stats["vao_changes"] += 1
+            drawable.draw_call()
+            stats["draws"] += 1
+            stats["triangles"] += drawable.triangle_count()
+
+        if vao is not None:
+            glBindVertexArray(0)
+        self._packets = []
+        self._ranks = {field: {} for field in FIELD_BITS}
+        self.stats = stats
+        return stats
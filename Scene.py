@@ -0,0 +1,430 @@
+"""
+Scene registry that keeps drawable objects alive across frames.
+
+Objects are created once (shader programs, buffers, textures and meshes are
+allocated a single time) and the main loop only pushes new transforms into
+them every frame.
+
+Objects form a hierarchy: every object may have a parent, and its world
+matrix is the parent's world matrix times its own transform. Objects report
+transform changes to the scene, which recomputes world matrices only for
+the subtrees below changed objects, so moving one node costs time
+proportional to its subtree rather than to the whole scene.
+
+Objects outside the camera's view frustum are skipped before any OpenGL
+call. Each mesh's bounding sphere and box are transformed by the object's
+world matrix when it changes, and all objects are tested against the
+frustum planes at once. Large scenes also keep a BVH over the world boxes
+(see SpatialIndex), refitted as objects move, for culling and for spatial
+queries.
+
+Visible objects are not drawn one by one but submitted to a RenderQueue,
+which issues them sorted by GL state with redundant binds removed.
+"""
+
+import glm
+import numpy as np
+from Picking import ray_triangles
+from Frustum import extract_planes, spheres_visible, boxes_visible, world_bounds, view_depths
+from SpatialIndex import BVH
+from RenderQueue import RenderQueue
+from Profiler import profiler
+
+
+class Scene:
+    """
+    A container of named drawable objects that is built once at startup.
+
+    Attributes:
+        objects (dict): Maps object names to drawables and nodes, in registration order
+        dirty (set): Objects whose transform changed since the last update
+        transform_updates (int): World matrices recomputed by the last update
+        visible_count (int): Objects drawn in the last frame
+        culled_count (int): Objects skipped by frustum culling in the last frame
+        index_threshold (int): Draw list size from which culling uses the BVH
+        render_queue (RenderQueue): Queue that sorts the draws of a frame by state
+    """
+
+    index_threshold = 256
+
+    def __init__(self):
+        """Initialize an empty scene."""
+        self.objects = {}
+        self._names = {}
+        self.dirty = set()
+        self.transform_updates = 0
+        self.visible_count = 0
+        self.culled_count = 0
+        self.render_queue = RenderQueue()
+        self._draw_list = None
+        self._view_dependent = []
+        self._bounds = None
+        self._index = None
+        self._stale_bounds = set()
+        self._pass = 0
+
+    def add(self, name, drawable, parent=None):
+        """
+        Register a drawable object or node in the scene.
+
+        Args:
+            name (str): Unique name of the object
+            drawable (TransformableObject): Object to register
+            parent (str or TransformableObject, optional): Parent of the
+                object, given by name or directly. Defaults to a root object.
+
+        Returns:
+            TransformableObject: The registered object
+
+        Raises:
+            Exception: If an object with the same name is already registered
+        """
+        if name in self.objects:
+            raise Exception(f"Scene object '{name}' is already registered")
+        if isinstance(parent, str):
+            parent = self.get(parent)
+
+        self.objects[name] = drawable
+        self._names[id(drawable)] = name
+        drawable.graph = self
+        if parent is not None:
+            drawable.set_parent(parent)
+        self.dirty.add(drawable)
+        self.structure_changed()
+        return drawable
+
+    def get(self, name):
+        """
+        Look up a registered object by name.
+
+        Args:
+            name (str): Name of the object
+
+        Returns:
+            TransformableObject: The registered object
+        """
+        return self.objects[name]
+
+    def name_of(self, drawable):
+        """
+        Look up the name an object was registered under.
+
+        Args:
+            drawable (TransformableObject): Registered object
+
+        Returns:
+            str: Name of the object, None if it is not registered
+        """
+        return self._names.get(id(drawable))
+
+    def set_transform(self, name, x, y, angle_x, angle_y, angle_z, scale):
+        """
+        Replace the transformation of a registered object.
+
+        The components are set individually, so an object whose values did
+        not change keeps its cached matrices and costs no matrix math.
+
+        Args:
+            name (str): Name of the object
+            x (float): Translation along X axis
+            y (float): Translation along Y axis
+            angle_x (float): Rotation angle around X axis in degrees
+            angle_y (float): Rotation angle around Y axis in degrees
+            angle_z (float): Rotation angle around Z axis in degrees
+            scale (float): Uniform scale factor
+        """
+        drawable = self.get(name)
+        drawable.set_position(x, y)
+        drawable.set_euler(angle_x, angle_y, angle_z)
+        drawable.set_scale(scale)
+
+    def structure_changed(self):
+        """Invalidate the draw list after objects were added or reparented."""
+        self._draw_list = None
+        self._bounds = None
+        self._index = None
+
+    def update_transforms(self):
+        """
+        Recompute the world matrices of every changed subtree.
+
+        Changed objects are visited from the shallowest to the deepest, and
+        objects already refreshed as part of an ancestor's subtree are
+        skipped, so every affected world matrix is computed exactly once.
+
+        Returns:
+            int: Number of world matrices recomputed
+        """
+        updated = 0
+        if self.dirty:
+            self._pass += 1
+            for root in sorted(self.dirty, key=lambda node: node.depth):
+                if root._world_pass == self._pass:
+                    continue
+                stack = [root]
+                while stack:
+                    node = stack.pop()
+                    parent = node.parent
+                    if parent is None:
+                        node._world = node.trans
+                        node._world_uniform_scale = node.uniform_scale
+                    else:
+                        node._world = parent.world_matrix * node.trans
+                        node._world_uniform_scale = node.uniform_scale and parent._world_uniform()
+                    node._world_pass = self._pass
+                    node.world_version += 1
+                    self._stale_bounds.add(node)
+                    stack.extend(node.children)
+                    updated += 1
+            self.dirty.clear()
+        self.transform_updates = updated
+        return updated
+
+    def draw_list(self):
+        """
+        Get the objects to draw as a flat list.
+
+        The list holds every object with a draw() method in depth-first
+        order, parents before children. It is rebuilt only when objects are
+        added or reparented, together with the list of objects that have an
+        update_view() method, which draw() calls with the camera.
+
+        Returns:
+            list: Drawable objects in draw order
+        """
+        if self._draw_list is None:
+            draw_list = []
+            stack = [node for node in self.objects.values() if node.parent is None]
+            stack.reverse()
+            while stack:
+                node = stack.pop()
+                if callable(getattr(node, "draw", None)):
+                    draw_list.append(node)
+                stack.extend(reversed(node.children))
+            self._draw_list = draw_list
+            self._view_dependent = [node for node in draw_list if callable(getattr(node, "update_view", None))]
+        return self._draw_list
+
+    def _world_bounds(self):
+        """
+        Get the world-space bounding volumes of the draw list.
+
+        Rows are refreshed only for objects whose world matrix changed.
+        Objects without a mesh are never culled.
+
+        Returns:
+            dict: Arrays of sphere centers and radii, box centers and half
+            sizes, and the mask of objects without bounds, in draw order
+        """
+        draw_list = self.draw_list()
+        if self._bounds is None:
+            count = len(draw_list)
+            self._bounds = {
+                "rows": {node: row for row, node in enumerate(draw_list)},
+                "centers": np.zeros((count, 3)),
+                "radii": np.zeros(count),
+                "box_centers": np.zeros((count, 3)),
+                "box_extents": np.zeros((count, 3)),
+                "unbounded": np.array([getattr(node, "mesh", None) is None for node in draw_list], dtype=bool),
+            }
+            stale = draw_list
+        else:
+            stale = self._stale_bounds
+
+        bounds = self._bounds
+        rows = bounds["rows"]
+        updated = []
+        for node in stale:
+            row = rows.get(node)
+            mesh = getattr(node, "mesh", None)
+            if row is None or mesh is None:
+                continue
+            model = np.asarray(node.world_matrix, dtype=np.float64)
+            (bounds["centers"][row], bounds["radii"][row],
+             bounds["box_centers"][row], bounds["box_extents"][row]) = world_bounds(
+                model, mesh.center, mesh.radius, mesh.center, mesh.extent
+            )
+            updated.append(row)
+        self._stale_bounds.clear()
+
+        if self._index is not None and updated:
+            updated = np.array(updated)
+            centers = bounds["box_centers"][updated]
+            extents = bounds["box_extents"][updated]
+            self._index.update(updated, centers - extents, centers + extents)
+        return bounds
+
+    def spatial_index(self):
+        """
+        Get a BVH over the world boxes of the draw list.
+
+        The BVH is built on first use and refitted for the objects that
+        moved since. Query results are positions in draw_list().
+
+        Returns:
+            BVH: Spatial index of the drawable objects
+        """
+        bounds = self._world_bounds()
+        if self._index is None:
+            centers, extents = bounds["box_centers"], bounds["box_extents"]
+            self._index = BVH(centers - extents, centers + extents)
+        return self._index
+
+    def visible_objects(self, view_projection):
+        """
+        Cull the draw list against the camera frustum.
+
+        Args:
+            view_projection (glm.mat4): Camera projection * view matrix
+
+        Returns:
+            list: Objects that may be visible, in draw order
+        """
+        draw_list = self.draw_list()
+        return [draw_list[i] for i in self._visible_rows(view_projection)]
+
+    def _visible_rows(self, view_projection):
+        """
+        Find the positions in the draw list of the objects in the frustum.
+
+        Bounding spheres are tested first; objects whose sphere intersects
+        the frustum are then tested with their tighter bounding box. Draw
+        lists of index_threshold objects or more are culled through the BVH
+        instead, so only the visible part of the scene is visited.
+
+        Args:
+            view_projection (glm.mat4): Camera projection * view matrix
+
+        Returns:
+            numpy.ndarray: Draw list positions of objects that may be visible
+        """
+        draw_list = self.draw_list()
+        bounds = self._world_bounds()
+        planes = extract_planes(view_projection)
+
+        if len(draw_list) >= self.index_threshold:
+            visible = np.zeros(len(draw_list), dtype=bool)
+            visible[self.spatial_index().query_frustum(planes)] = True
+        else:
+            visible = spheres_visible(planes, bounds["centers"], bounds["radii"])
+            candidates = np.flatnonzero(visible)
+            visible[candidates] = boxes_visible(
+                planes, bounds["box_centers"][candidates], bounds["box_extents"][candidates]
+            )
+        visible |= bounds["unbounded"]
+
+        indices = np.flatnonzero(visible)
+        self.visible_count = len(indices)
+        self.culled_count = len(draw_list) - len(indices)
+        return indices
+
+    def pick(self, origin, direction, max_distance=np.inf):
+        """
+        Find the first object hit by a ray.
+
+        Candidates come from the BVH over the world boxes, nearest box
+        first. Each candidate's triangles are tested in the object's local
+        space, through the mesh's own triangle BVH, and the search stops
+        once the nearest hit is closer than the next candidate's box.
+
+        Args:
+            origin (array-like): World-space ray origin
+            direction (array-like): World-space ray direction
+            max_distance (float): Ignore hits beyond this ray parameter
+
+        Returns:
+            tuple: Hit object (None if nothing was hit) and the ray parameter
+            of the hit
+        """
+        self.update_transforms()
+        draw_list = self.draw_list()
+        rows, entries = self.spatial_index().query_ray(origin, direction, max_distance)
+        origin = glm.vec3(*origin)
+        direction = glm.vec3(*direction)
+
+        best, best_t = None, max_distance
+        for row, entry in zip(rows.tolist(), entries.tolist()):
+            if entry > best_t:
+                break
+            node = draw_list[row]
+            mesh = getattr(node, "mesh", None)
+            triangle_index = None if mesh is None else mesh.triangle_index(node.draw_mode)
+            if triangle_index is None:
+                continue
+
+            # Affine transforms keep ray parameters, so local hits need no rescaling.
+            inverse = glm.inverse(node.world_matrix)
+            local_origin = np.array(glm.vec3(inverse * glm.vec4(origin, 1.0)), dtype=np.float64)
+            local_direction = np.array(glm.vec3(inverse * glm.vec4(direction, 0.0)), dtype=np.float64)
+
+            triangles, bvh = triangle_index
+            candidates, _ = bvh.query_ray(local_origin, local_direction, best_t)
+            if len(candidates) == 0:
+                continue
+            hits = ray_triangles(local_origin, local_direction, triangles[candidates])
+            t = float(hits.min())
+            if t < best_t:
+                best, best_t = node, t
+        return best, best_t
+
+    def draw(self, view_projection=None, camera_position=None):
+        """
+        Update the changed world matrices and draw every visible object.
+
+        Visible objects go through the render queue, which orders them by
+        program, texture and mesh, then front to back. Objects with an
+        update_view() method, such as point clouds, first choose what to
+        draw for the camera.
+
+        Camera and light parameters must have been uploaded to the FrameData
+        uniform buffer for the frame.
+
+        Args:
+            view_projection (glm.mat4, optional): Camera projection * view
+                matrix used for frustum culling and depth sorting, no
+                culling if None
+            camera_position (glm.vec3, optional): World-space camera
+                position passed to update_view()
+        """
+        with profiler.scope("transforms"):
+            self.update_transforms()
+        draw_list = self.draw_list()
+        with profiler.scope("cull"):
+            if view_projection is None:
+                rows = range(len(draw_list))
+                depths = np.zeros(len(draw_list))
+                self.visible_count = len(draw_list)
+                self.culled_count = 0
+            else:
+                rows = self._visible_rows(view_projection)
+                depths = view_depths(view_projection, self._bounds["centers"][rows])
+                for node in self._view_dependent:
+                    node.update_view(view_projection, camera_position)
+
+        with profiler.scope("submit"):
+            queue = self.render_queue
+            for row, depth in zip(rows, depths.tolist()):
+                queue.submit(draw_list[row], depth)
+            stats = queue.flush()
+        profiler.count_all(stats)
+
+    def cleanup(self):
+        """
+        Release all registered objects.
+
+        Must be called while the OpenGL context is still current so that the
+        objects can free their GPU resources. The links between objects and
+        the scene are cut so that they are freed right away.
+        """
+        for drawable in self.objects.values():
+            drawable.graph = None
+            drawable.parent = None
+            drawable.children = []
+        self.objects.clear()
+        self._names.clear()
+        self.dirty.clear()
+        self._stale_bounds.clear()
+        self._draw_list = None
+        self._view_dependent = []
+        self._bounds = None
+        self._index = None
@@ -1,9 +1,18 @@
+import glm
+import numpy as np
+from OpenGL.GL import *
+from ShaderCache import shader_cache
+
 """
 Shader program management class.
 
 Handles compilation and linking of vertex and fragment shaders,
 and provides utilities for setting uniform variables.
 
+Uniform locations are queried once when a program is first linked. The last
+value uploaded to every uniform is remembered per program, and setting a
+uniform to the value it already holds skips the OpenGL call.
+
 Attributes:
     vertex_source (str): Vertex shader source code
     fragment_source (str): Fragment shader source code
@@ -11,22 +20,104 @@ Attributes:
 """
 
 class Shader:
-    def __init__(self, vertex_source, fragment_source):
+    """
+    A shader program with a cached uniform table.
+
+    Attributes:
+        uploads (int): Uniform uploads made since the last reset_frame_stats()
+        skipped (int): Uniform uploads skipped since the last reset_frame_stats()
+    """
+
+    uploads = 0
+    skipped = 0
+    _programs = {}
+
+    def __init__(self, vertex_source, fragment_source, defines=None):
         """
         Create and compile shader program.
 
         Args:
             vertex_source (str): Vertex shader source code
             fragment_source (str): Fragment shader source code
-            
+            defines (dict, optional): Preprocessor defines for both stages
+
         Raises:
             Exception: If shader compilation or program linking fails
         """
-        # ... existing code ...
+        self.vertex_source = vertex_source
+        self.fragment_source = fragment_source
+        self.program_id = shader_cache.acquire(vertex_source, fragment_source, defines)
+
+        state = Shader._programs.get(self.program_id)
+        if state is None:
+            state = {"uniforms": self._query_uniforms(), "values": {}}
+            Shader._programs[self.program_id] = state
+        self.uniforms = state["uniforms"]
+        self._values = state["values"]
+
+    def _query_uniforms(self):
+        """
+        Build the table of active uniforms of the program.
+
+        Returns:
+            dict: Maps uniform names to (location, GL type) pairs
+        """
+        uniforms = {}
+        count = glGetProgramiv(self.program_id, GL_ACTIVE_UNIFORMS)
+        for index in range(count):
+            name, size, uniform_type = glGetActiveUniform(self.program_id, index)
+            if isinstance(name, bytes):
+                name = name.decode()
+            location = glGetUniformLocation(self.program_id, name)
+            if location == -1:
+                # Uniforms inside uniform blocks have no location.
+                continue
+            uniforms[name] = (location, uniform_type)
+            if name.endswith("[0]"):
+                uniforms[name[:-3]] = (location, uniform_type)
+        return uniforms
+
+    @classmethod
+    def reset_frame_stats(cls):
+        """Reset the uniform upload counters, typically at the start of a frame."""
+        cls.uploads = 0
+        cls.skipped = 0
+
+    @classmethod
+    def frame_stats(cls):
+        """
+        Get the uniform upload counters.
+
+        Returns:
+            dict: Uniform uploads made and skipped since the last reset
+        """
+        return {"uniform_uploads": cls.uploads, "uniform_skipped": cls.skipped}
+
+    def _location(self, name, value):
+        """
+        Get the location to upload a value to, if an upload is needed.
+
+        Args:
+            name (str): Uniform variable name
+            value: Value in a comparable form
+
+        Returns:
+            int: Uniform location, or None if the uniform is inactive or
+            already holds the value
+        """
+        uniform = self.uniforms.get(name)
+        if uniform is None:
+            return None
+        if name in self._values and self._values[name] == value:
+            Shader.skipped += 1
+            return None
+        self._values[name] = value
+        Shader.uploads += 1
+        return uniform[0]
 
     def use(self):
         """Activate this shader program for rendering."""
-        # ... existing code ...
+        glUseProgram(self.program_id)
 
     def set_bool(self, name, value):
         """
@@ -36,7 +127,9 @@ class Shader:
             name (str): Uniform variable name
             value (bool): Value to set
         """
-        # ... existing code ...
+        location = self._location(name, bool(value))
+        if location is not None:
+            glUniform1i(location, int(bool(value)))
 
     def set_int(self, name, value):
         """
@@ -46,7 +139,9 @@ class Shader:
             name (str): Uniform variable name
             value (int): Value to set
         """
-        # ... existing code ...
+        location = self._location(name, int(value))
+        if location is not None:
+            glUniform1i(location, int(value))
 
     def set_float(self, name, value):
         """
@@ -56,7 +151,9 @@ class Shader:
             name (str): Uniform variable name
             value (float): Value to set
         """
-        # ... existing code ...
+        location = self._location(name, float(value))
+        if location is not None:
+            glUniform1f(location, float(value))
 
     def set_vec2(self, name, value):
         """
@@ -66,7 +163,10 @@ class Shader:
             name (str): Uniform variable name
             value (tuple): Two float values (x, y)
         """
-        # ... existing code ...
+        value = (float(value[0]), float(value[1]))
+        location = self._location(name, value)
+        if location is not None:
+            glUniform2f(location, *value)
 
     def set_vec3(self, name, value):
         """
@@ -76,7 +176,10 @@ class Shader:
             name (str): Uniform variable name
             value (tuple): Three float values (x, y, z)
         """
-        # ... existing code ...
+        value = (float(value[0]), float(value[1]), float(value[2]))
+        location = self._location(name, value)
+        if location is not None:
+            glUniform3f(location, *value)
 
     def set_vec4(self, name, value):
         """
@@ -86,7 +189,31 @@ class Shader:
             name (str): Uniform variable name
             value (tuple): Four float values (x, y, z, w)
         """
-        # ... existing code ...
+        value = (float(value[0]), float(value[1]), float(value[2]), float(value[3]))
+        location = self._location(name, value)
+        if location is not None:
+            glUniform4f(location, *value)
+
+    def _set_matrix(self, name, mat, glm_type, upload):
+        """
+        Upload a matrix uniform unless it already holds the same value.
+
+        Args:
+            name (str): Uniform variable name
+            mat (glm.mat or numpy.ndarray): Matrix, numpy arrays being row-major
+            glm_type (type): Matching glm matrix type
+            upload (callable): glUniformMatrix*fv function
+        """
+        if isinstance(mat, glm_type):
+            value = glm_type(mat)
+            location = self._location(name, value)
+            if location is not None:
+                upload(location, 1, GL_FALSE, glm.value_ptr(value))
+        else:
+            data = np.ascontiguousarray(mat, dtype=np.float32)
+            location = self._location(name, data.tobytes())
+            if location is not None:
+                upload(location, 1, GL_TRUE, data)
 
     def set_mat2(self, name, mat):
         """
@@ -94,9 +221,9 @@ class Shader:
 
         Args:
             name (str): Uniform variable name
-            mat (numpy.ndarray): 2x2 matrix
+            mat (glm.mat2 or numpy.ndarray): 2x2 matrix
         """
-        # ... existing code ...
+        self._set_matrix(name, mat, glm.mat2, glUniformMatrix2fv)
 
     def set_mat3(self, name, mat):
         """
@@ -104,9 +231,9 @@ class Shader:
 
         Args:
             name (str): Uniform variable name
-            mat (numpy.ndarray): 3x3 matrix
+            mat (glm.mat3 or numpy.ndarray): 3x3 matrix
         """
-        # ... existing code ...
+        self._set_matrix(name, mat, glm.mat3, glUniformMatrix3fv)
 
     def set_mat4(self, name, mat):
         """
@@ -114,10 +241,15 @@ class Shader:
 
         Args:
             name (str): Uniform variable name
-            mat (numpy.ndarray): 4x4 matrix
+            mat (glm.mat4 or numpy.ndarray): 4x4 matrix
         """
-        # ... existing code ...
+        self._set_matrix(name, mat, glm.mat4, glUniformMatrix4fv)
 
     def __del__(self):
         """Clean up shader program."""
-        # ... existing code ... 
\ No newline at end of file
+        # Not set if compiling or linking failed in __init__.
+        program_id = getattr(self, "program_id", None)
+        if program_id is None:
+            return
+        if shader_cache.release(program_id):
+            Shader._programs.pop(program_id, None)
@@ -0,0 +1,398 @@
+import hashlib
+import os
+import re
+import struct
+import time
+import numpy as np
+from OpenGL.GL import *
+from OpenGL.error import GLError
+
+"""
+Process-wide cache of linked shader programs.
+
+Programs are keyed by a hash of their vertex and fragment sources plus any
+preprocessor defines, so every unique program is compiled and linked once
+no matter how many objects use it. Programs are reference counted and
+deleted when the last user releases them.
+
+Optionally, linked programs are also stored on disk as driver binaries
+(glGetProgramBinary) so that later launches skip compilation entirely.
+
+Attributes:
+    UNIFORM_BLOCK_BINDINGS (dict): Fixed binding points of the engine's uniform blocks
+    shader_cache (ShaderProgramCache): Cache shared by all drawable objects
+"""
+
+UNIFORM_BLOCK_BINDINGS = {"FrameData": 0}
+
+_VERSION_PATTERN = re.compile(r"^[ \t]*#[ \t]*version\b[^\n]*(\n|$)", re.MULTILINE)
+
+
+def compile_shader(shader_type, source):
+    """
+    Compile a shader from source.
+
+    Args:
+        shader_type (int): GL_VERTEX_SHADER or GL_FRAGMENT_SHADER
+        source (str): Shader source code
+
+    Returns:
+        int: Compiled shader ID
+
+    Raises:
+        Exception: If shader compilation fails
+    """
+    shader = glCreateShader(shader_type)
+    glShaderSource(shader, source)
+    glCompileShader(shader)
+
+    if not glGetShaderiv(shader, GL_COMPILE_STATUS):
+        error_log = glGetShaderInfoLog(shader)
+        glDeleteShader(shader)
+        raise Exception(f"Shader compilation failed : {error_log.decode()}")
+
+    return shader
+
+
+def link_program(vertex_source, fragment_source, retrievable=False):
+    """
+    Compile both shader stages and link them into a program.
+
+    Args:
+        vertex_source (str): Vertex shader source code
+        fragment_source (str): Fragment shader source code
+        retrievable (bool): Ask the driver to keep the program binary available
+
+    Returns:
+        int: Linked shader program ID
+
+    Raises:
+        Exception: If shader compilation or program linking fails
+    """
+    vertex_shader = compile_shader(GL_VERTEX_SHADER, vertex_source)
+    fragment_shader = compile_shader(GL_FRAGMENT_SHADER, fragment_source)
+
+    program = glCreateProgram()
+    glAttachShader(program, vertex_shader)
+    glAttachShader(program, fragment_shader)
+    if retrievable:
+        glProgramParameteri(program, GL_PROGRAM_BINARY_RETRIEVABLE_HINT, GL_TRUE)
+    glLinkProgram(program)
+
+    glDeleteShader(vertex_shader)
+    glDeleteShader(fragment_shader)
+
+    if not glGetProgramiv(program, GL_LINK_STATUS):
+        error_log = glGetProgramInfoLog(program)
+        glDeleteProgram(program)
+        raise Exception(f"Shader program linking failed : {error_log.decode()}")
+
+    return program
+
+
+def apply_defines(source, defines):
+    """
+    Insert preprocessor defines into a shader source.
+
+    The defines are placed right after the #version directive, which has to
+    stay the first statement of a GLSL source; blank lines and comments may
+    come before it.
+
+    Args:
+        source (str): Shader source code
+        defines (dict): Maps define names to values (None for a bare #define)
+
+    Returns:
+        str: Shader source with the defines applied
+    """
+    if not defines:
+        return source
+
+    lines = []
+    for name in sorted(defines):
+        value = defines[name]
+        lines.append(f"#define {name}" if value is None else f"#define {name} {value}")
+    block = "\n".join(lines) + "\n"
+
+    match = _VERSION_PATTERN.search(source)
+    if match is None:
+        return block + source
+    end = match.end()
+    newline = "" if match.group(1) else "\n"
+    return source[:end] + newline + block + source[end:]
+
+
+def bind_uniform_blocks(program):
+    """
+    Connect the program's uniform blocks to their fixed binding points.
+
+    GLSL 3.30 has no layout(binding) qualifier for blocks, so the binding
+    is assigned after linking.
+
+    Args:
+        program (int): Linked shader program ID
+    """
+    for name, binding in UNIFORM_BLOCK_BINDINGS.items():
+        index = glGetUniformBlockIndex(program, name.encode())
+        if index != GL_INVALID_INDEX:
+            glUniformBlockBinding(program, index, binding)
+
+
+def save_program_binary(program, path):
+    """
+    Write the driver binary of a linked program to a file.
+
+    The file holds the binary format as a little-endian uint32 followed by
+    the binary itself.
+
+    Args:
+        program (int): Linked shader program ID
+        path (str): Destination file path
+
+    Returns:
+        bool: True if a binary was written
+    """
+    length = glGetProgramiv(program, GL_PROGRAM_BINARY_LENGTH)
+    if not length:
+        return False
+
+    written = np.zeros(1, dtype=np.int32)
+    binary_format = np.zeros(1, dtype=np.uint32)
+    binary = np.empty(length, dtype=np.uint8)
+    glGetProgramBinary(program, length, written, binary_format, binary)
+
+    temp_path = path + ".tmp"
+    with open(temp_path, "wb") as file:
+        file.write(struct.pack("<I", int(binary_format[0])))
+        file.write(binary[:int(written[0])].tobytes())
+    os.replace(temp_path, path)
+    return True
+
+
+def load_program_binary(path):
+    """
+    Create a program from a binary written by save_program_binary().
+
+    Args:
+        path (str): Binary file path
+
+    Returns:
+        int: Linked shader program ID, or None if the file is missing or the
+        driver rejects the binary
+    """
+    try:
+        with open(path, "rb") as file:
+            data = file.read()
+    except OSError:
+        return None
+    if len(data) <= 4:
+        return None
+
+    binary_format = struct.unpack("<I", data[:4])[0]
+    binary = np.frombuffer(data, dtype=np.uint8, offset=4)
+
+    program = glCreateProgram()
+    try:
+        glProgramBinary(program, binary_format, binary, len(binary))
+    except GLError:
+        # Unknown binary formats are reported as GL errors.
+        glDeleteProgram(program)
+        return None
+    if not glGetProgramiv(program, GL_LINK_STATUS):
+        glDeleteProgram(program)
+        return None
+    return program
+
+
+class ShaderProgramCache:
+    """
+    Hands out shared, reference-counted shader program IDs.
+
+    Attributes:
+        programs (dict): Maps source hashes to program IDs
+        references (dict): Maps program IDs to their number of users
+        cache_dir (str): Directory holding program binaries, None if disabled
+        compiles (int): Number of programs compiled and linked
+        hits (int): Number of requests served from the cache
+        link_time (float): Total seconds spent compiling and linking
+        binary_loads (int): Number of programs loaded from disk binaries
+        binary_rejects (int): Number of disk binaries the driver rejected
+        load_time (float): Total seconds spent loading disk binaries
+    """
+
+    def __init__(self):
+        """Initialize an empty cache."""
+        self.programs = {}
+        self.references = {}
+        self._keys = {}
+        self.cache_dir = None
+        self._driver_id = None
+        self.compiles = 0
+        self.hits = 0
+        self.link_time = 0.0
+        self.binary_loads = 0
+        self.binary_rejects = 0
+        self.load_time = 0.0
+
+    def set_cache_dir(self, cache_dir):
+        """
+        Enable or disable the on-disk program binary cache.
+
+        The cache stays disabled if the driver supports no binary formats.
+        Must be called with a current OpenGL context.
+
+        Args:
+            cache_dir (str): Directory for program binaries, None to disable
+
+        Returns:
+            bool: True if the disk cache is enabled
+        """
+        self.cache_dir = None
+        if cache_dir is None:
+            return False
+        if not bool(glGetProgramBinary) or not glGetIntegerv(GL_NUM_PROGRAM_BINARY_FORMATS):
+            print("Program binaries are not supported by the driver, disk cache disabled")
+            return False
+
+        os.makedirs(cache_dir, exist_ok=True)
+        self.cache_dir = cache_dir
+        self._driver_id = "\0".join(
+            glGetString(name).decode(errors="replace")
+            for name in (GL_VENDOR, GL_RENDERER, GL_VERSION)
+        )
+        return True
+
+    def _binary_path(self, key):
+        """
+        Get the disk cache path of a program.
+
+        Binaries are only valid for the driver that produced them, so the
+        driver vendor, renderer and version are part of the file name.
+
+        Args:
+            key (str): Program cache key
+
+        Returns:
+            str: Binary file path
+        """
+        digest = hashlib.sha256(f"{key}\0{self._driver_id}".encode("utf-8"))
+        return os.path.join(self.cache_dir, digest.hexdigest() + ".bin")
+
+    @staticmethod
+    def make_key(vertex_source, fragment_source, defines=None):
+        """
+        Compute the cache key of a program.
+
+        Args:
+            vertex_source (str): Vertex shader source code
+            fragment_source (str): Fragment shader source code
+            defines (dict, optional): Preprocessor defines
+
+        Returns:
+            str: Hex digest identifying the program
+        """
+        digest = hashlib.sha256()
+        for part in (vertex_source, fragment_source):
+            digest.update(part.encode("utf-8"))
+            digest.update(b"\0")
+        for name in sorted(defines or {}):
+            digest.update(f"{name}={defines[name]}\0".encode("utf-8"))
+        return digest.hexdigest()
+
+    def acquire(self, vertex_source, fragment_source, defines=None):
+        """
+        Get a linked program for the given sources, compiling it on first use.
+
+        Every call must be balanced by a call to release().
+
+        Args:
+            vertex_source (str): Vertex shader source code
+            fragment_source (str): Fragment shader source code
+            defines (dict, optional): Preprocessor defines for both stages
+
+        Returns:
+            int: Linked shader program ID
+
+        Raises:
+            Exception: If shader compilation or program linking fails
+        """
+        key = self.make_key(vertex_source, fragment_source, defines)
+        program = self.programs.get(key)
+        if program is not None:
+            self.hits += 1
+            self.references[program] += 1
+            return program
+
+        program = None
+        if self.cache_dir is not None:
+            start = time.perf_counter()
+            program = load_program_binary(self._binary_path(key))
+            self.load_time += time.perf_counter() - start
+            if program is not None:
+                self.binary_loads += 1
+            elif os.path.exists(self._binary_path(key)):
+                self.binary_rejects += 1
+
+        if program is None:
+            start = time.perf_counter()
+            program = link_program(
+                apply_defines(vertex_source, defines),
+                apply_defines(fragment_source, defines),
+                retrievable=self.cache_dir is not None,
+            )
+            self.link_time += time.perf_counter() - start
+            self.compiles += 1
+            if self.cache_dir is not None:
+                try:
+                    save_program_binary(program, self._binary_path(key))
+                except OSError as e:
+                    print(f"Error saving program binary: {str(e)}")
+
+        bind_uniform_blocks(program)
+
+        self.programs[key] = program
+        self.references[program] = 1
+        self._keys[program] = key
+        return program
+
+    def release(self, program):
+        """
+        Drop one reference to a program and delete it when it is unused.
+
+        Args:
+            program (int): Program ID returned by acquire()
+
+        Returns:
+            bool: True if the program was deleted
+        """
+        if program not in self.references:
+            return False
+        self.references[program] -= 1
+        if self.references[program] > 0:
+            return False
+
+        del self.references[program]
+        del self.programs[self._keys.pop(program)]
+        glDeleteProgram(program)
+        return True
+
+    def stats(self):
+        """
+        Get cache statistics.
+
+        Returns:
+            dict: Live programs, compiles, cache hits, disk binary loads and
+            rejects, and total link and load time
+        """
+        return {
+            "programs": len(self.programs),
+            "compiles": self.compiles,
+            "hits": self.hits,
+            "link_time": self.link_time,
+            "binary_loads": self.binary_loads,
+            "binary_rejects": self.binary_rejects,
+            "load_time": self.load_time,
+        }
+
+
+shader_cache = ShaderProgramCache()
@@ -1,15 +1,30 @@
+import os
+import re
+
+_INCLUDE_PATTERN = re.compile(r'^[ \t]*#include[ \t]+"([^"]+)"[ \t]*$', re.MULTILINE)
+
+
 def load_shader_source(file_path):
     """
     Reads and returns the content of a shader file.
+
+    Lines of the form #include "file.glsl" are replaced by the content of
+    that file, resolved relative to the including file.
     
     Args:
         file_path (str): Path to the shader file
         
     Returns:
-        str: Content of the shader file
+        str: Content of the shader file with includes expanded
     """
     with open(file_path, 'r', encoding='utf-8') as file:
-        return file.read()
+        source = file.read()
+
+    directory = os.path.dirname(file_path)
+    return _INCLUDE_PATTERN.sub(
+        lambda match: load_shader_source(os.path.join(directory, match.group(1))),
+        source,
+    )
 
 
 vertex_shader_source = load_shader_source("shaders/vertexShader.glsl")
@@ -25,3 +40,11 @@ lamp_fragment_shader = load_shader_source("shaders/lampFragmentShader.glsl")
 texture_vertex_shader = load_shader_source("shaders/textureVertexShader.glsl")
 
 texture_fragment_shader = load_shader_source("shaders/textureFragmentShader.glsl")
+
+instanced_vertex_shader = load_shader_source("shaders/instancedVertexShader.glsl")
+
+instanced_texture_vertex_shader = load_shader_source("shaders/instancedTextureVertexShader.glsl")
+
+point_vertex_shader = load_shader_source("shaders/pointVertexShader.glsl")
+
+point_fragment_shader = load_shader_source("shaders/pointFragmentShader.glsl")
@@ -0,0 +1,309 @@
+import numpy as np
+
+"""
+Bounding volume hierarchy over axis-aligned boxes.
+
+The BVH is a linear BVH: objects are sorted along a Morton (Z-order) curve
+of their box centers and grouped into leaves of a few consecutive objects.
+The leaves are the bottom level of an implicit complete binary tree stored
+in heap order (the children of node i are 2i + 1 and 2i + 2), so building
+and refitting are a handful of NumPy operations per tree level and no
+Python object is created per node.
+
+Moving objects only refits the boxes of their leaves and ancestors. When
+refitting has let the leaves grow too much the tree is rebuilt.
+
+Queries walk the tree breadth first, testing every node of a level in one
+vectorized call, and return the indices of the matching objects.
+
+Attributes:
+    EMPTY (float): Coordinate magnitude used for the inverted boxes of unused leaves
+"""
+
+EMPTY = 1e30
+
+
+def morton_codes(points):
+    """
+    Compute 30-bit Morton codes of points.
+
+    Args:
+        points (numpy.ndarray): (N, 3) points
+
+    Returns:
+        numpy.ndarray: (N,) uint64 codes interleaving 10 bits per axis
+    """
+    low = points.min(axis=0)
+    size = np.maximum(points.max(axis=0) - low, 1e-12)
+    cells = np.clip(((points - low) / size * 1023.0).astype(np.int64), 0, 1023).astype(np.uint64)
+
+    cells = (cells | (cells << np.uint64(16))) & np.uint64(0x030000FF)
+    cells = (cells | (cells << np.uint64(8))) & np.uint64(0x0300F00F)
+    cells = (cells | (cells << np.uint64(4))) & np.uint64(0x030C30C3)
+    cells = (cells | (cells << np.uint64(2))) & np.uint64(0x09249249)
+    return (cells[:, 0] << np.uint64(2)) | (cells[:, 1] << np.uint64(1)) | cells[:, 2]
+
+
+def surface_areas(mins, maxs):
+    """
+    Compute the surface areas of boxes.
+
+    Args:
+        mins (numpy.ndarray): (N, 3) lower corners
+        maxs (numpy.ndarray): (N, 3) upper corners
+
+    Returns:
+        numpy.ndarray: (N,) surface areas
+    """
+    size = np.maximum(maxs - mins, 0.0)
+    return 2.0 * (size[:, 0] * size[:, 1] + size[:, 1] * size[:, 2] + size[:, 2] * size[:, 0])
+
+
+class BVH:
+    """
+    A bounding volume hierarchy with vectorized build, refit and queries.
+
+    Attributes:
+        mins (numpy.ndarray): (N, 3) lower corners of the object boxes
+        maxs (numpy.ndarray): (N, 3) upper corners of the object boxes
+        leaf_size (int): Maximum number of objects per leaf
+        rebuild_ratio (float): Growth of the total leaf surface area that
+            triggers a rebuild during update()
+        order (numpy.ndarray): Object indices in Morton order
+        depth (int): Number of levels above the leaves
+        node_min (numpy.ndarray): Lower corners of the node boxes, in heap order
+        node_max (numpy.ndarray): Upper corners of the node boxes, in heap order
+        rebuilds (int): Number of builds, including the first one
+    """
+
+    def __init__(self, mins, maxs, leaf_size=8, rebuild_ratio=2.0):
+        """
+        Build a hierarchy over object boxes.
+
+        Args:
+            mins (numpy.ndarray): (N, 3) lower corners
+            maxs (numpy.ndarray): (N, 3) upper corners
+            leaf_size (int): Maximum number of objects per leaf
+            rebuild_ratio (float): Leaf surface area growth that triggers a rebuild
+        """
+        self.leaf_size = leaf_size
+        self.rebuild_ratio = rebuild_ratio
+        self.rebuilds = 0
+        self.mins = np.array(mins, dtype=np.float64).reshape(-1, 3)
+        self.maxs = np.array(maxs, dtype=np.float64).reshape(-1, 3)
+        self.build()
+
+    def __len__(self):
+        return len(self.mins)
+
+    def build(self):
+        """Sort the objects along the Morton curve and build the tree from scratch."""
+        count = len(self.mins)
+        self.rebuilds += 1
+        if count:
+            self.order = np.argsort(morton_codes((self.mins + self.maxs) / 2), kind="stable")
+        else:
+            self.order = np.zeros(0, dtype=np.int64)
+
+        self._leaf_count = max(1, -(-count // self.leaf_size))
+        self.depth = int(np.ceil(np.log2(self._leaf_count))) if self._leaf_count > 1 else 0
+        self._first_leaf = (1 << self.depth) - 1
+        node_count = 2 * self._first_leaf + 1
+        self.node_min = np.full((node_count, 3), EMPTY)
+        self.node_max = np.full((node_count, 3), -EMPTY)
+
+        self._leaf_of = np.empty(count, dtype=np.int64)
+        self._leaf_of[self.order] = np.arange(count) // self.leaf_size
+
+        self._refit(np.arange(self._leaf_count))
+        self._built_area = self._area = self._leaf_area()
+
+    def _leaf_objects(self, leaves):
+        """
+        Get the objects of leaves, padded by repeating the last object.
+
+        Args:
+            leaves (numpy.ndarray): Leaf numbers
+
+        Returns:
+            numpy.ndarray: (len(leaves), leaf_size) object indices
+        """
+        count = len(self.order)
+        positions = leaves[:, None] * self.leaf_size + np.arange(self.leaf_size)
+        ends = np.minimum((leaves + 1) * self.leaf_size, count)
+        positions = np.minimum(positions, ends[:, None] - 1)
+        return self.order[positions]
+
+    def _refit(self, leaves):
+        """
+        Recompute the boxes of leaves and of all their ancestors.
+
+        Args:
+            leaves (numpy.ndarray): Leaf numbers whose objects changed
+        """
+        if len(self.order) == 0:
+            return
+        objects = self._leaf_objects(leaves)
+        nodes = leaves + self._first_leaf
+        self.node_min[nodes] = self.mins[objects].min(axis=1)
+        self.node_max[nodes] = self.maxs[objects].max(axis=1)
+
+        while nodes[0] > 0:
+            nodes = np.unique((nodes - 1) // 2)
+            left, right = 2 * nodes + 1, 2 * nodes + 2
+            self.node_min[nodes] = np.minimum(self.node_min[left], self.node_min[right])
+            self.node_max[nodes] = np.maximum(self.node_max[left], self.node_max[right])
+
+    def _leaf_area(self):
+        """
+        Get the total surface area of the used leaves.
+
+        Returns:
+            float: Sum of the leaf box surface areas
+        """
+        leaves = slice(self._first_leaf, self._first_leaf + self._leaf_count)
+        return float(surface_areas(self.node_min[leaves], self.node_max[leaves]).sum())
+
+    def update(self, indices, mins, maxs):
+        """
+        Move objects and refit the boxes above them.
+
+        The tree is rebuilt when refitting has grown the leaves by more than
+        rebuild_ratio since the last build.
+
+        Args:
+            indices (numpy.ndarray): Indices of the moved objects
+            mins (numpy.ndarray): New lower corners
+            maxs (numpy.ndarray): New upper corners
+        """
+        indices = np.asarray(indices, dtype=np.int64)
+        if len(indices) == 0:
+            return
+        self.mins[indices] = mins
+        self.maxs[indices] = maxs
+        leaves = np.unique(self._leaf_of[indices])
+        nodes = leaves + self._first_leaf
+        before = surface_areas(self.node_min[nodes], self.node_max[nodes]).sum()
+        self._refit(leaves)
+        after = surface_areas(self.node_min[nodes], self.node_max[nodes]).sum()
+        self._area += float(after - before)
+        if self._area > self.rebuild_ratio * max(self._built_area, 1e-12):
+            self.build()
+
+    def _query(self, test):
+        """
+        Find the objects whose boxes pass a test.
+
+        Args:
+            test (callable): Called with arrays of lower and upper corners,
+                returns a boolean mask of the boxes to keep
+
+        Returns:
+            numpy.ndarray: Indices of the matching objects
+        """
+        if len(self.order) == 0:
+            return np.zeros(0, dtype=np.int64)
+
+        nodes = np.zeros(1, dtype=np.int64)
+        for _ in range(self.depth):
+            nodes = nodes[test(self.node_min[nodes], self.node_max[nodes])]
+            if len(nodes) == 0:
+                return np.zeros(0, dtype=np.int64)
+            nodes = np.concatenate([2 * nodes + 1, 2 * nodes + 2])
+
+        nodes = nodes[test(self.node_min[nodes], self.node_max[nodes])]
+        leaves = nodes - self._first_leaf
+        leaves = leaves[leaves < self._leaf_count]
+
+        positions = (leaves[:, None] * self.leaf_size + np.arange(self.leaf_size)).ravel()
+        objects = self.order[positions[positions < len(self.order)]]
+        return objects[test(self.mins[objects], self.maxs[objects])]
+
+    def query_box(self, low, high):
+        """
+        Find the objects whose boxes overlap a box.
+
+        Args:
+            low (array-like): Lower corner of the query box
+            high (array-like): Upper corner of the query box
+
+        Returns:
+            numpy.ndarray: Indices of the matching objects
+        """
+        low = np.asarray(low, dtype=np.float64)
+        high = np.asarray(high, dtype=np.float64)
+        return self._query(lambda mins, maxs: np.all((mins <= high) & (maxs >= low), axis=1))
+
+    def query_sphere(self, center, radius):
+        """
+        Find the objects whose boxes intersect a sphere.
+
+        Args:
+            center (array-like): Sphere center
+            radius (float): Sphere radius
+
+        Returns:
+            numpy.ndarray: Indices of the matching objects
+        """
+        center = np.asarray(center, dtype=np.float64)
+
+        def test(mins, maxs):
+            offset = np.maximum(mins - center, 0.0) + np.maximum(center - maxs, 0.0)
+            return (offset * offset).sum(axis=1) <= radius * radius
+
+        return self._query(test)
+
+    def query_frustum(self, planes):
+        """
+        Find the objects whose boxes intersect a frustum.
+
+        Args:
+            planes (numpy.ndarray): (6, 4) planes from Frustum.extract_planes()
+
+        Returns:
+            numpy.ndarray: Indices of the matching objects
+        """
+        normals = planes[:, :3]
+        positive = normals >= 0
+
+        def test(mins, maxs):
+            # The corner furthest along each plane normal.
+            corners = np.where(positive[None], maxs[:, None], mins[:, None])
+            return np.all((corners * normals).sum(axis=2) + planes[:, 3] >= 0, axis=1)
+
+        return self._query(test)
+
+    def query_ray(self, origin, direction, max_distance=np.inf):
+        """
+        Find the objects whose boxes a ray passes through.
+
+        Args:
+            origin (array-like): Ray origin
+            direction (array-like): Ray direction, not necessarily normalized
+            max_distance (float): Ignore boxes entered beyond this ray parameter
+
+        Returns:
+            tuple: Indices of the hit objects and the ray parameters at which
+            their boxes are entered, sorted from nearest to farthest
+        """
+        origin = np.asarray(origin, dtype=np.float64)
+        with np.errstate(divide="ignore"):
+            inverse = 1.0 / np.asarray(direction, dtype=np.float64)
+
+        def slabs(mins, maxs):
+            with np.errstate(invalid="ignore"):
+                t1 = (mins - origin) * inverse
+                t2 = (maxs - origin) * inverse
+            # fmin/fmax skip the NaNs of rays lying in a slab's plane.
+            near = np.fmax(np.fmax.reduce(np.fmin(t1, t2), axis=1), 0.0)
+            far = np.fmin.reduce(np.fmax(t1, t2), axis=1)
+            return near, far
+
+        def test(mins, maxs):
+            near, far = slabs(mins, maxs)
+            return (near <= far) & (near <= max_distance) & (mins[:, 0] <= maxs[:, 0])
+
+        objects = self._query(test)
+        near, _ = slabs(self.mins[objects], self.maxs[objects])
+        order = np.argsort(near, kind="stable")
+        return objects[order], near[order]
@@ -0,0 +1,167 @@
+import ctypes
+import numpy as np
+from OpenGL.GL import *
+from Profiler import profiler
+
+"""
+Ring-buffered GPU buffer for data rewritten every frame.
+
+The buffer is split into regions, one per frame in flight. Each frame
+writes into the next region and a fence is placed after the draws that
+read it, so writing frame N + 1 only has to wait for the GPU when it has
+fallen a whole ring behind, never for the frame it is still drawing.
+
+Where glBufferStorage is available the buffer is mapped once, persistently
+and coherently, and NumPy arrays are copied straight into the mapping.
+Otherwise the buffer is orphaned with glBufferData every time the ring
+wraps around, and arrays are uploaded with glBufferSubData from their own
+memory; the driver then hands out fresh storage instead of synchronizing.
+
+Attributes:
+    FENCE_TIMEOUT (int): Nanoseconds to wait for a fence before waiting again
+"""
+
+FENCE_TIMEOUT = 1000000
+
+
+def persistent_mapping_supported():
+    """
+    Check whether buffers can be mapped persistently.
+
+    Returns:
+        bool: True if glBufferStorage (OpenGL 4.4 or ARB_buffer_storage) is available
+    """
+    return bool(glBufferStorage)
+
+
+class StreamingBuffer:
+    """
+    A ring of buffer regions written by the CPU and read by the GPU.
+
+    Call begin_frame() before writing a frame's data, write() for every
+    array and end_frame() after the draw calls that read it.
+
+    Attributes:
+        target (int): Buffer binding target, e.g. GL_ARRAY_BUFFER
+        region_size (int): Bytes available per frame
+        regions (int): Number of frames in flight
+        persistent (bool): The buffer is persistently mapped instead of orphaned
+        buffer (int): Buffer object ID
+        region (int): Region written in the current frame
+        stalls (int): Frames that had to wait for the GPU to release their region
+        orphans (int): Times the buffer storage was orphaned
+    """
+
+    def __init__(self, region_size, regions=3, target=GL_ARRAY_BUFFER, persistent=None):
+        """
+        Allocate the ring.
+
+        Args:
+            region_size (int): Bytes available per frame
+            regions (int): Number of frames in flight
+            target (int): Buffer binding target
+            persistent (bool, optional): Use a persistent mapping; detected if None
+        """
+        self.target = target
+        self.region_size = region_size
+        self.regions = regions
+        self.persistent = persistent_mapping_supported() if persistent is None else persistent
+        self.region = regions - 1
+        self.stalls = 0
+        self.orphans = 0
+        self._used = 0
+        self._fences = [None] * regions
+        self._mapped = None
+
+        size = region_size * regions
+        self.buffer = glGenBuffers(1)
+        glBindBuffer(target, self.buffer)
+        if self.persistent:
+            flags = GL_MAP_WRITE_BIT | GL_MAP_PERSISTENT_BIT | GL_MAP_COHERENT_BIT
+            glBufferStorage(target, size, None, flags)
+            address = ctypes.cast(glMapBufferRange(target, 0, size, flags), ctypes.c_void_p).value
+            self._mapped = np.ctypeslib.as_array((ctypes.c_ubyte * size).from_address(address))
+        else:
+            glBufferData(target, size, None, GL_STREAM_DRAW)
+        glBindBuffer(target, 0)
+
+    def begin_frame(self):
+        """
+        Move on to the next region, waiting until the GPU has finished reading it.
+
+        In orphaning mode the fences are not needed: wrapping around the
+        ring orphans the whole buffer instead.
+        """
+        self.region = (self.region + 1) % self.regions
+        self._used = 0
+
+        fence = self._fences[self.region]
+        if fence is not None:
+            self._fences[self.region] = None
+            status = glClientWaitSync(fence, 0, 0)
+            if status == GL_TIMEOUT_EXPIRED:
+                self.stalls += 1
+                while status == GL_TIMEOUT_EXPIRED:
+                    status = glClientWaitSync(fence, GL_SYNC_FLUSH_COMMANDS_BIT, FENCE_TIMEOUT)
+            glDeleteSync(fence)
+
+        if not self.persistent and self.region == 0:
+            glBindBuffer(self.target, self.buffer)
+            glBufferData(self.target, self.region_size * self.regions, None, GL_STREAM_DRAW)
+            glBindBuffer(self.target, 0)
+            self.orphans += 1
+
+    def write(self, array, alignment=16):
+        """
+        Append an array to the current region.
+
+        Contiguous arrays are copied once, straight from their memory into
+        the buffer.
+
+        Args:
+            array (numpy.ndarray): Data to write
+            alignment (int): Byte multiple the data must start at, e.g. the
+                vertex size to draw it with a first-vertex offset
+
+        Returns:
+            int: Byte offset of the data in the buffer
+
+        Raises:
+            Exception: If the data does not fit in the rest of the region
+        """
+        array = np.ascontiguousarray(array)
+        base = self.region * self.region_size
+        offset = -(-(base + self._used) // alignment) * alignment
+        if offset - base + array.nbytes > self.region_size:
+            raise Exception(
+                f"Streaming buffer region of {self.region_size} bytes cannot hold "
+                f"{array.nbytes} more bytes after {self._used}"
+            )
+        self._used = offset - base + array.nbytes
+
+        if self.persistent:
+            self._mapped[offset:offset + array.nbytes] = array.reshape(-1).view(np.uint8)
+        else:
+            glBindBuffer(self.target, self.buffer)
+            glBufferSubData(self.target, offset, array.nbytes, array)
+            glBindBuffer(self.target, 0)
+        profiler.count("uploaded_bytes", array.nbytes)
+        return offset
+
+    def end_frame(self):
+        """Fence the current region after the draw calls that read it."""
+        if self.persistent:
+            if self._fences[self.region] is not None:
+                glDeleteSync(self._fences[self.region])
+            self._fences[self.region] = glFenceSync(GL_SYNC_GPU_COMMANDS_COMPLETE, 0)
+
+    def __del__(self):
+        """Clean up OpenGL resources."""
+        for fence in self._fences:
+            if fence is not None:
+                glDeleteSync(fence)
+        if self._mapped is not None:
+            glBindBuffer(self.target, self.buffer)
+            glUnmapBuffer(self.target)
+            glBindBuffer(self.target, 0)
+        glDeleteBuffers(1, [self.buffer])
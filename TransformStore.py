@@ -0,0 +1,258 @@
+import numpy as np
+
+"""
+Structure-of-arrays storage for the transforms of many objects.
+
+Positions, rotations (unit quaternions stored as w, x, y, z) and scales of
+all objects live in contiguous NumPy arrays. Model, normal and MVP matrices
+for every object are computed together in a few batched array operations
+instead of one PyGLM call chain per object, and come out in the
+column-major layout OpenGL expects, ready for InstancedMesh.set_instances()
+or glUniformMatrix4fv with transpose disabled.
+
+Attributes:
+    IDENTITY_ROTATION (tuple): Quaternion (w, x, y, z) of no rotation
+"""
+
+IDENTITY_ROTATION = (1.0, 0.0, 0.0, 0.0)
+
+
+def quat_multiply(a, b):
+    """
+    Multiply quaternions element-wise.
+
+    Args:
+        a (numpy.ndarray): (N, 4) quaternions as w, x, y, z
+        b (numpy.ndarray): (N, 4) quaternions as w, x, y, z
+
+    Returns:
+        numpy.ndarray: (N, 4) products a * b
+    """
+    aw, ax, ay, az = np.moveaxis(a, -1, 0)
+    bw, bx, by, bz = np.moveaxis(b, -1, 0)
+    return np.stack([
+        aw * bw - ax * bx - ay * by - az * bz,
+        aw * bx + ax * bw + ay * bz - az * by,
+        aw * by - ax * bz + ay * bw + az * bx,
+        aw * bz + ax * by - ay * bx + az * bw,
+    ], axis=-1)
+
+
+def euler_quats(angles):
+    """
+    Build rotations around X, then Y, then Z for many objects.
+
+    Matches TransformableObject.set_euler().
+
+    Args:
+        angles (numpy.ndarray): (N, 3) rotation angles in degrees
+
+    Returns:
+        numpy.ndarray: (N, 4) quaternions as w, x, y, z
+    """
+    half = np.radians(np.asarray(angles, dtype=np.float64)).reshape(-1, 3) / 2
+    cos, sin = np.cos(half), np.sin(half)
+    zero = np.zeros(len(half))
+    qx = np.stack([cos[:, 0], sin[:, 0], zero, zero], axis=-1)
+    qy = np.stack([cos[:, 1], zero, sin[:, 1], zero], axis=-1)
+    qz = np.stack([cos[:, 2], zero, zero, sin[:, 2]], axis=-1)
+    return quat_multiply(quat_multiply(qx, qy), qz)
+
+
+def rotation_matrices(quats, out=None):
+    """
+    Convert unit quaternions to rotation matrices.
+
+    Args:
+        quats (numpy.ndarray): (N, 4) quaternions as w, x, y, z
+        out (numpy.ndarray, optional): (N, 3, 3) array receiving the result
+
+    Returns:
+        numpy.ndarray: (N, 3, 3) row-major rotation matrices
+    """
+    w, x, y, z = quats.T
+    if out is None:
+        out = np.empty((len(quats), 3, 3), dtype=np.float32)
+    out[:, 0, 0] = 1 - 2 * (y * y + z * z)
+    out[:, 0, 1] = 2 * (x * y - w * z)
+    out[:, 0, 2] = 2 * (x * z + w * y)
+    out[:, 1, 0] = 2 * (x * y + w * z)
+    out[:, 1, 1] = 1 - 2 * (x * x + z * z)
+    out[:, 1, 2] = 2 * (y * z - w * x)
+    out[:, 2, 0] = 2 * (x * z - w * y)
+    out[:, 2, 1] = 2 * (y * z + w * x)
+    out[:, 2, 2] = 1 - 2 * (x * x + y * y)
+    return out
+
+
+class TransformStore:
+    """
+    Transforms of many objects in contiguous arrays.
+
+    Objects are addressed by index. The arrays grow geometrically when
+    objects are added; the positions, rotations and scales properties are
+    views that stay valid until the next add.
+
+    Attributes:
+        count (int): Number of stored transforms
+        version (int): Incremented every time transforms change
+    """
+
+    def __init__(self, capacity=1024):
+        """
+        Initialize an empty store.
+
+        Args:
+            capacity (int): Number of transforms to allocate room for
+        """
+        self.count = 0
+        self.version = 0
+        self._capacity = 0
+        self._positions = np.zeros((0, 3), dtype=np.float32)
+        self._rotations = np.zeros((0, 4), dtype=np.float32)
+        self._scales = np.zeros((0, 3), dtype=np.float32)
+        self._models = None
+        self._normals = None
+        self._mvps = None
+        self._computed = None
+        self._reserve(capacity)
+
+    def _reserve(self, capacity):
+        """
+        Grow the arrays to hold at least capacity transforms.
+
+        Args:
+            capacity (int): Required number of transforms
+        """
+        if capacity <= self._capacity:
+            return
+        capacity = max(capacity, 2 * self._capacity)
+        for name, width in (("_positions", 3), ("_rotations", 4), ("_scales", 3)):
+            grown = np.zeros((capacity, width), dtype=np.float32)
+            grown[:self.count] = getattr(self, name)[:self.count]
+            setattr(self, name, grown)
+        self._models = np.zeros((capacity, 4, 4), dtype=np.float32)
+        self._normals = np.zeros((capacity, 3, 3), dtype=np.float32)
+        self._mvps = np.zeros((capacity, 4, 4), dtype=np.float32)
+        self._capacity = capacity
+        self._computed = None
+
+    @property
+    def positions(self):
+        """numpy.ndarray: (count, 3) view of the positions."""
+        return self._positions[:self.count]
+
+    @property
+    def rotations(self):
+        """numpy.ndarray: (count, 4) view of the quaternions (w, x, y, z)."""
+        return self._rotations[:self.count]
+
+    @property
+    def scales(self):
+        """numpy.ndarray: (count, 3) view of the scale factors."""
+        return self._scales[:self.count]
+
+    def add(self, positions, rotations=None, scales=None):
+        """
+        Append transforms.
+
+        Args:
+            positions (numpy.ndarray): (N, 3) positions
+            rotations (numpy.ndarray, optional): (N, 4) quaternions as w, x, y, z,
+                identity if None
+            scales (numpy.ndarray or float, optional): (N, 3) scale factors, or
+                one uniform factor for all, 1 if None
+
+        Returns:
+            numpy.ndarray: Indices of the new transforms
+        """
+        positions = np.asarray(positions, dtype=np.float32).reshape(-1, 3)
+        start, end = self.count, self.count + len(positions)
+        self._reserve(end)
+        self.count = end
+
+        self._positions[start:end] = positions
+        self._rotations[start:end] = IDENTITY_ROTATION if rotations is None else rotations
+        scales = np.asarray(1.0 if scales is None else scales, dtype=np.float32)
+        if scales.ndim < 2:
+            scales = scales.reshape(-1, 1)
+        self._scales[start:end] = scales
+        self.version += 1
+        return np.arange(start, end)
+
+    def update(self, indices, positions=None, rotations=None, scales=None):
+        """
+        Replace transforms of some objects.
+
+        Args:
+            indices (numpy.ndarray or slice): Objects to update
+            positions (numpy.ndarray, optional): New positions
+            rotations (numpy.ndarray, optional): New quaternions as w, x, y, z
+            scales (numpy.ndarray, optional): New scale factors
+        """
+        if positions is not None:
+            self.positions[indices] = positions
+        if rotations is not None:
+            self.rotations[indices] = rotations
+        if scales is not None:
+            self.scales[indices] = scales
+        self.version += 1
+
+    def mark_changed(self):
+        """Record that the arrays were modified in place through the views."""
+        self.version += 1
+
+    def compute(self, view_projection=None, view_version=None):
+        """
+        Compute the model, normal and MVP matrices of every object.
+
+        All results are column-major: element [i, c, r] is row r of column c
+        of the matrix of object i. The matrices are recomputed only when the
+        transforms or the camera changed since the last call, and the
+        returned arrays are reused between calls.
+
+        Args:
+            view_projection (glm.mat4 or numpy.ndarray, optional): Camera
+                projection * view matrix; a NumPy array is indexed
+                [row][column], as np.asarray() of a glm matrix is. MVPs are
+                skipped if None
+            view_version: Value that changes whenever view_projection changes,
+                None to always recompute the MVPs
+
+        Returns:
+            tuple: (count, 4, 4) model matrices, (count, 3, 3) normal matrices
+            and (count, 4, 4) MVP matrices (None without view_projection)
+        """
+        n = self.count
+        models = self._models[:n]
+        normals = self._normals[:n]
+        mvps = None if view_projection is None else self._mvps[:n]
+
+        computed = self._computed
+        if computed is None or computed[0] != self.version:
+            # Column c of the upper 3x3 is column c of the rotation times
+            # scale c; in column-major storage that is row c of R^T.
+            rotation_t = rotation_matrices(self.rotations).transpose(0, 2, 1)
+            scales = self.scales[:, :, None]
+            models[:, :3, :3] = rotation_t * scales
+            models[:, :3, 3] = 0.0
+            models[:, 3, :3] = self.positions
+            models[:, 3, 3] = 1.0
+
+            # inverse(transpose(R * S)) = R * inverse(S); uniform scales only
+            # change the normal's length, which shaders normalize away.
+            scales = self.scales
+            if np.all(scales == scales[:, :1]):
+                normals[:] = rotation_t
+            else:
+                np.divide(rotation_t, scales[:, :, None], out=normals)
+            computed = (self.version, None)
+
+        if mvps is not None and (view_version is None or computed[1] != view_version):
+            # (VP * M)^T = M^T * VP^T. The stored models are the transposes
+            # M^T, while np.asarray() indexes VP [row][column].
+            np.matmul(models, np.asarray(view_projection, dtype=np.float32).T, out=mvps)
+            computed = (computed[0], view_version)
+
+        self._computed = computed
+        return models, normals, mvps
@@ -84,6 +84,33 @@ class Window:
         """
         return self.window
 
+    def get_size(self):
+        """
+        Get the current window size.
+
+        Returns:
+            tuple: Width and height in screen coordinates
+        """
+        return glfw.get_window_size(self.window)
+
+    def set_title(self, title):
+        """
+        Set the window title.
+
+        Args:
+            title (str): New title
+        """
+        glfw.set_window_title(self.window, title)
+
+    def set_swap_interval(self, interval):
+        """
+        Set the number of screen refreshes to wait for on every buffer swap.
+
+        Args:
+            interval (int): 1 to synchronize with the display, 0 not to wait
+        """
+        glfw.swap_interval(interval)
+
     def should_close(self):
         """
         Check if window should close.
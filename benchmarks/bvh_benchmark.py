@@ -0,0 +1,130 @@
+"""
+Spatial index benchmark.
+
+Builds a BVH over N random boxes and compares the latency of frustum, ray,
+sphere and box queries with a brute-force scan over all boxes, after
+checking that both return the same objects. Also reports build time and
+the cost of refitting after 1% of the objects moved. No OpenGL context is
+needed.
+
+Example:
+    $ python benchmarks/bvh_benchmark.py --counts 10000 100000 1000000
+"""
+
+import argparse
+import sys
+
+import common
+import glm
+import numpy as np
+from Frustum import extract_planes
+from SpatialIndex import BVH
+
+
+def brute_force(mins, maxs, test):
+    """Scan every box with a BVH test function."""
+    return np.flatnonzero(test(mins, maxs))
+
+
+def best_time(function, repeats):
+    """Shortest duration of several calls, in seconds."""
+    return min(common.time_call(function) for _ in range(repeats))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--counts", type=int, nargs="+", default=[10000, 100000, 1000000])
+    parser.add_argument("--area", type=float, default=1000.0)
+    parser.add_argument("--repeats", type=int, default=10)
+    args = parser.parse_args()
+
+    projection = glm.perspective(glm.radians(60.0), 16 / 10, 0.1, 100.0)
+    view = glm.lookAt(glm.vec3(0, 0, 0), glm.vec3(0, 0, -1), glm.vec3(0, 1, 0))
+    planes = extract_planes(projection * view)
+    rng = np.random.default_rng(0)
+
+    failed = False
+    for count in args.counts:
+        centers = rng.uniform(-args.area / 2, args.area / 2, (count, 3))
+        # Box 0 is straight ahead of the camera and box 1 behind it, so a
+        # frustum query that finds nothing cannot pass by matching an
+        # equally empty scan.
+        centers[:2] = ((0.0, 0.0, -10.0), (0.0, 0.0, 10.0))
+        sizes = rng.uniform(0.5, 2.0, (count, 3))
+        mins, maxs = centers - sizes / 2, centers + sizes / 2
+
+        build = common.time_call(lambda: BVH(mins, maxs))
+        bvh = BVH(mins, maxs)
+        moved = rng.choice(count, count // 100, replace=False)
+        offset = rng.uniform(-1.0, 1.0, (len(moved), 3))
+        refit = common.time_call(bvh.update, moved, mins[moved] + offset, maxs[moved] + offset)
+        mins, maxs = bvh.mins.copy(), bvh.maxs.copy()
+
+        print(f"N={count}: build {build * 1e3:.1f} ms, refit 1% {refit * 1e3:.2f} ms")
+        visible = bvh.query_frustum(planes)
+        if 0 not in visible or 1 in visible:
+            print("FAIL: frustum query missed the box in front of the camera or kept the one behind it")
+            failed = True
+        queries = {
+            "frustum": (lambda: bvh.query_frustum(planes), _frustum_test(planes)),
+            "ray": (lambda: bvh.query_ray((0, 0, 0), (0.3, 0.2, -1.0))[0],
+                    _ray_test((0, 0, 0), (0.3, 0.2, -1.0))),
+            "sphere": (lambda: bvh.query_sphere((10, 0, -20), 15.0), _sphere_test((10, 0, -20), 15.0)),
+            "box": (lambda: bvh.query_box((-20, -20, -20), (20, 20, 20)),
+                    _box_test((-20, -20, -20), (20, 20, 20))),
+        }
+        for label, (query, test) in queries.items():
+            found = np.sort(query())
+            expected = brute_force(mins, maxs, test)
+            if not np.array_equal(found, expected):
+                print(f"FAIL: {label} query differs from the brute-force scan")
+                failed = True
+            indexed = best_time(query, args.repeats)
+            scanned = best_time(lambda: brute_force(mins, maxs, test), args.repeats)
+            print(f"  {label:>8}: {len(found):7d} hits  BVH {indexed * 1e3:8.3f} ms  "
+                  f"scan {scanned * 1e3:8.3f} ms  {scanned / indexed:6.1f}x")
+
+    return 1 if failed else 0
+
+
+def _frustum_test(planes):
+    normals = planes[:, :3]
+
+    def test(mins, maxs):
+        corners = np.where(normals[None] >= 0, maxs[:, None], mins[:, None])
+        return np.all((corners * normals).sum(axis=2) + planes[:, 3] >= 0, axis=1)
+
+    return test
+
+
+def _ray_test(origin, direction):
+    origin = np.asarray(origin, dtype=np.float64)
+    direction = np.asarray(direction, dtype=np.float64)
+
+    def test(mins, maxs):
+        t1 = (mins - origin) / direction
+        t2 = (maxs - origin) / direction
+        near = np.maximum(np.minimum(t1, t2).max(axis=1), 0.0)
+        far = np.maximum(t1, t2).min(axis=1)
+        return near <= far
+
+    return test
+
+
+def _sphere_test(center, radius):
+    center = np.asarray(center, dtype=np.float64)
+
+    def test(mins, maxs):
+        offset = np.maximum(mins - center, 0.0) + np.maximum(center - maxs, 0.0)
+        return (offset * offset).sum(axis=1) <= radius * radius
+
+    return test
+
+
+def _box_test(low, high):
+    low, high = np.asarray(low, dtype=np.float64), np.asarray(high, dtype=np.float64)
+    return lambda mins, maxs: np.all((mins <= high) & (maxs >= low), axis=1)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,77 @@
+"""
+Frame capture benchmark.
+
+Renders the engine's scene and captures every frame the way the main loop
+does, through the asynchronous readback and the FrameCapture queue, with
+each writer and both back-pressure policies. Reports the frame rate the
+render loop kept, the frames written and dropped and the time the loop
+spent blocked on the queue.
+
+Example:
+    $ python benchmarks/capture_benchmark.py --frames 300 --width 1920 --height 1080
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+import common
+from OpenGL.GL import *
+
+
+def run(engine, capture, frames):
+    """Render and capture frames. Returns the render loop's frames per second."""
+    width, height = engine.width, engine.height
+    block = capture.policy == "block"
+    start = time.perf_counter()
+    for _ in range(frames):
+        engine.render_frame(width, height)
+        if not engine.readback.request(capture.submit, width, height, wait=block):
+            capture.drop()
+        engine.readback.poll()
+        engine.window.swap_buffers()
+    elapsed = time.perf_counter() - start
+    engine.readback.flush()
+    return frames / elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--frames", type=int, default=300)
+    parser.add_argument("--width", type=int, default=1280)
+    parser.add_argument("--height", type=int, default=720)
+    parser.add_argument("--queue", type=int, default=8, help="frames the capture queue holds")
+    args = parser.parse_args()
+
+    engine = common.create_hidden_engine(args.width, args.height, frame_pacing="unlimited")
+
+    from FrameCapture import FrameCapture, PngWriter, NpyWriter, FfmpegWriter, ffmpeg_available
+
+    width, height = engine.width, engine.height
+    with tempfile.TemporaryDirectory() as directory:
+        writers = [
+            ("png", lambda: PngWriter(os.path.join(directory, "png"))),
+            ("npy", lambda: NpyWriter(os.path.join(directory, "frames.npy"), width, height, args.frames)),
+        ]
+        if ffmpeg_available():
+            writers.append(("ffmpeg", lambda: FfmpegWriter(os.path.join(directory, "capture.mp4"), width, height)))
+        else:
+            print("ffmpeg not found, skipping the video writer")
+
+        print(f"{'':>14} {'fps':>8} {'written':>8} {'dropped':>8} {'blocked s':>10}")
+        for name, make_writer in writers:
+            for policy in ("drop", "block"):
+                capture = FrameCapture(make_writer(), args.queue, policy)
+                fps = run(engine, capture, args.frames)
+                stats = capture.close()
+                print(f"{name:>6} {policy:>7} {fps:8.1f} {stats['written']:8d} {stats['dropped']:8d} "
+                      f"{stats['blocked_time']:10.3f}")
+
+    engine.terminate()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,100 @@
+"""
+Shared helpers for the benchmark scripts.
+
+Importing this module puts the repository root on sys.path and makes it the
+working directory, since shaders and textures are loaded with relative paths.
+
+Setting PYOPENGL_PLATFORM to "egl" or "osmesa" runs the benchmarks with a
+headless engine, which needs neither a display nor a GPU; with Mesa,
+LIBGL_ALWAYS_SOFTWARE=1 selects the llvmpipe software renderer.
+
+Attributes:
+    REPO_ROOT (str): Absolute path of the repository root
+    HEADLESS (bool): Whether engines are created without a window
+"""
+
+import os
+import sys
+import time
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+if REPO_ROOT not in sys.path:
+    sys.path.insert(0, REPO_ROOT)
+os.chdir(REPO_ROOT)
+
+from HeadlessWindow import BACKENDS
+
+HEADLESS = os.environ.get("PYOPENGL_PLATFORM") in BACKENDS
+
+import glfw
+from OpenGL.GL import *
+
+
+def create_hidden_engine(width=640, height=480, **engine_args):
+    """
+    Create and initialize an Engine whose window is never shown.
+
+    With HEADLESS set, the engine renders offscreen instead of into a
+    hidden window.
+
+    Args:
+        width (int): Framebuffer width in pixels
+        height (int): Framebuffer height in pixels
+        **engine_args: Extra keyword arguments passed to Engine
+
+    Returns:
+        Engine: Initialized engine with a perspective projection
+    """
+    from Engine import Engine
+
+    if HEADLESS:
+        engine = Engine(width, height, "benchmark", headless=True, **engine_args)
+    else:
+        engine = Engine(width, height, "benchmark", **engine_args)
+        glfw.window_hint(glfw.VISIBLE, glfw.FALSE)
+    engine.initialize()
+    engine.set_projection(60.0, width / height, 0.1, 100.0, 1)
+    return engine
+
+
+def count_gl_objects(max_name=4096):
+    """
+    Count live OpenGL objects by probing object names.
+
+    Drivers hand out small consecutive names, so probing the first few
+    thousand names of each kind finds every object the engine created.
+
+    Args:
+        max_name (int): Highest object name to probe
+
+    Returns:
+        dict: Number of live buffers, vertex arrays, programs and textures
+    """
+    counts = {"buffers": 0, "vertex_arrays": 0, "programs": 0, "textures": 0}
+    for name in range(1, max_name + 1):
+        if glIsBuffer(name):
+            counts["buffers"] += 1
+        if glIsVertexArray(name):
+            counts["vertex_arrays"] += 1
+        if glIsProgram(name):
+            counts["programs"] += 1
+        if glIsTexture(name):
+            counts["textures"] += 1
+    return counts
+
+
+def time_call(function, *args):
+    """
+    Measure the wall-clock duration of a call.
+
+    Args:
+        function (callable): Function to call
+        *args: Arguments passed to the function
+
+    Returns:
+        float: Duration in seconds
+    """
+    start = time.perf_counter()
+    function(*args)
+    return time.perf_counter() - start
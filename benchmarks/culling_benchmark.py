@@ -0,0 +1,78 @@
+"""
+Frustum culling benchmark.
+
+Scatters N cubes over a large area around the camera, so that only a small
+part of them is on screen, and compares the frame time of drawing every
+cube with the frame time of drawing only the cubes that pass frustum
+culling.
+
+Example:
+    $ python benchmarks/culling_benchmark.py --objects 5000
+"""
+
+import argparse
+import sys
+
+import common
+import glm
+import numpy as np
+from OpenGL.GL import *
+
+
+def average_frame_time(draw, frames):
+    """Average the duration of a draw function over several frames, in seconds."""
+    total = 0.0
+    for _ in range(frames):
+        glClear(GL_COLOR_BUFFER_BIT | GL_DEPTH_BUFFER_BIT)
+        total += common.time_call(_finished, draw)
+    return total / frames
+
+
+def _finished(draw):
+    draw()
+    glFinish()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--objects", type=int, default=5000)
+    parser.add_argument("--area", type=float, default=200.0,
+                        help="side of the square the cubes are scattered over")
+    parser.add_argument("--frames", type=int, default=50)
+    args = parser.parse_args()
+
+    engine = common.create_hidden_engine()
+
+    from Scene import Scene
+    from Shaders import vertex_shader_source, fragment_shader_source
+    from objects.Cube import Cube
+
+    view = glm.lookAt(glm.vec3(0, 0, 0), glm.vec3(0, 0, -1), glm.vec3(0, 1, 0))
+    engine.frame_data.update(engine.projection_matrix, view, glm.vec3(0), [0.0, 10.0, 0.0])
+    view_projection = engine.frame_data.view_projection
+
+    scene = Scene()
+    positions = np.random.default_rng(0).uniform(-args.area / 2, args.area / 2, (args.objects, 3))
+    positions[:, 1] /= 10
+    for i, (x, y, z) in enumerate(positions.tolist()):
+        cube = scene.add(f"cube{i}", Cube(vertex_shader_source, fragment_shader_source))
+        cube.set_position(x, y, z)
+
+    all_time = average_frame_time(scene.draw, args.frames)
+    culled_time = average_frame_time(lambda: scene.draw(view_projection), args.frames)
+    cull_time = min(common.time_call(scene.visible_objects, view_projection) for _ in range(args.frames))
+
+    print(f"objects:         {args.objects}")
+    print(f"visible:         {scene.visible_count}")
+    print(f"culled:          {scene.culled_count}")
+    print(f"draw all:        {all_time * 1e3:.2f} ms/frame")
+    print(f"draw visible:    {culled_time * 1e3:.2f} ms/frame")
+    print(f"culling alone:   {cull_time * 1e3:.3f} ms/frame")
+
+    scene.cleanup()
+    engine.terminate()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,89 @@
+"""
+Frame pacing benchmark.
+
+Simulates frames with a randomly varying amount of CPU work and paces them
+to a target rate, first with the old limiter (a single time.sleep for the
+remaining frame time) and then with every FramePacer mode. Reports the
+achieved frame rate, the jitter of the frame times and the CPU time the
+process used per frame, which shows whether pacing keeps a core busy.
+
+Example:
+    $ python benchmarks/frame_pacing_benchmark.py --fps 144 --frames 600
+"""
+
+import argparse
+import sys
+import time
+
+import common
+import glfw
+import numpy as np
+
+
+def work(seconds):
+    """Keep the CPU busy for a number of seconds, like rendering a frame."""
+    end = time.perf_counter() + seconds
+    while time.perf_counter() < end:
+        pass
+
+
+def sleep_limiter(fps, workloads, window):
+    """Pace frames like the old main loop did. Returns the frame intervals."""
+    frame_duration = 1.0 / fps
+    intervals = []
+    last = time.perf_counter()
+    for seconds in workloads:
+        start = time.perf_counter()
+        work(seconds)
+        glfw.swap_buffers(window)
+        elapsed = time.perf_counter() - start
+        if elapsed < frame_duration:
+            time.sleep(frame_duration - elapsed)
+        now = time.perf_counter()
+        intervals.append(now - last)
+        last = now
+    return np.array(intervals)
+
+
+def paced(pacer, workloads, window):
+    """Pace frames with a FramePacer. Returns the frame intervals."""
+    pacer.start()
+    intervals = []
+    for seconds in workloads:
+        work(seconds)
+        glfw.swap_buffers(window)
+        intervals.append(pacer.wait())
+    return np.array(intervals)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--fps", type=float, default=144.0)
+    parser.add_argument("--frames", type=int, default=600)
+    parser.add_argument("--work-ms", type=float, default=2.0, help="mean CPU work per frame")
+    args = parser.parse_args()
+
+    engine = common.create_hidden_engine()
+    window = engine.window.getWindow()
+
+    from FramePacer import FramePacer, VSYNC, LIMITED, UNLIMITED
+
+    workloads = np.random.default_rng(0).gamma(4.0, args.work_ms / 4e3, args.frames)
+    runs = [("sleep", lambda: sleep_limiter(args.fps, workloads, window))]
+    for mode in (LIMITED, VSYNC, UNLIMITED):
+        runs.append((mode, lambda mode=mode: paced(FramePacer(args.fps, mode), workloads, window)))
+
+    print(f"{'':>10} {'fps':>8} {'mean ms':>8} {'jitter':>8} {'p99 ms':>8} {'CPU/frame':>10}")
+    for label, run in runs:
+        cpu = time.process_time()
+        intervals = run() * 1e3
+        cpu = (time.process_time() - cpu) / args.frames * 1e3
+        print(f"{label:>10} {1e3 / intervals.mean():8.1f} {intervals.mean():8.3f} "
+              f"{intervals.std():8.3f} {np.percentile(intervals, 99):8.3f} {cpu:8.3f} ms")
+
+    engine.terminate()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,103 @@
+"""
+Instanced rendering benchmark.
+
+Draws N lit cubes with one InstancedMesh draw call and, for comparison,
+a smaller number of cubes drawn one by one.
+
+Example:
+    $ python benchmarks/instancing_benchmark.py --instances 100000
+"""
+
+import argparse
+import sys
+
+import common
+import glm
+import numpy as np
+from OpenGL.GL import *
+
+
+def grid_matrices(count, spacing=1.5):
+    """
+    Build model matrices that place instances on a square grid.
+
+    Args:
+        count (int): Number of instances
+        spacing (float): Distance between neighbouring instances
+
+    Returns:
+        numpy.ndarray: (count, 4, 4) row-major model matrices
+    """
+    side = int(np.ceil(np.sqrt(count)))
+    index = np.arange(count)
+    matrices = np.tile(np.eye(4, dtype=np.float32), (count, 1, 1))
+    matrices[:, 0, 3] = (index % side - side / 2) * spacing
+    matrices[:, 1, 3] = (index // side - side / 2) * spacing
+    matrices[:, 2, 3] = -side * spacing
+    return matrices
+
+
+def average_frame_time(draw, frames):
+    """Average the duration of a draw function over several frames, in seconds."""
+    total = 0.0
+    for _ in range(frames):
+        glClear(GL_COLOR_BUFFER_BIT | GL_DEPTH_BUFFER_BIT)
+        total += common.time_call(_finished, draw)
+    return total / frames
+
+
+def _finished(draw):
+    draw()
+    glFinish()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--instances", type=int, default=100000)
+    parser.add_argument("--individual", type=int, default=500,
+                        help="cubes drawn one by one for comparison")
+    parser.add_argument("--frames", type=int, default=100)
+    args = parser.parse_args()
+
+    engine = common.create_hidden_engine()
+
+    from Shaders import vertex_shader_source, fragment_shader_source, instanced_vertex_shader
+    from objects.Cube import Cube
+    from objects.InstancedMesh import InstancedMesh
+
+    projection = glm.perspective(glm.radians(60.0), engine.width / engine.height, 0.1, 1000.0)
+    engine.frame_data.update(projection, glm.mat4(1.0), glm.vec3(0.0), [0.0, 0.0, 0.0])
+
+    template = Cube(vertex_shader_source, fragment_shader_source)
+    colors = np.random.default_rng(0).random((args.instances, 3), dtype=np.float32)
+    instanced = InstancedMesh(
+        template, instanced_vertex_shader, fragment_shader_source,
+        grid_matrices(args.instances), colors
+    )
+    instanced_time = average_frame_time(instanced.draw, args.frames)
+
+    cubes = []
+    for matrix in grid_matrices(args.individual):
+        cube = Cube(vertex_shader_source, fragment_shader_source)
+        cube.set_position(*matrix[:3, 3].tolist())
+        cubes.append(cube)
+
+    def draw_individual():
+        for cube in cubes:
+            cube.draw()
+
+    individual_time = average_frame_time(draw_individual, args.frames)
+
+    print(f"instanced:  {args.instances} cubes in {instanced_time * 1e3:.2f} ms/frame "
+          f"({instanced_time / args.instances * 1e9:.1f} ns/cube)")
+    print(f"individual: {args.individual} cubes in {individual_time * 1e3:.2f} ms/frame "
+          f"({individual_time / args.individual * 1e9:.1f} ns/cube)")
+
+    del instanced, template
+    cubes.clear()
+    engine.terminate()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,117 @@
+"""
+Normal matrix vertex throughput benchmark.
+
+Draws a high-resolution textured sphere many times with the current vertex
+shader, which reads a CPU-computed normalMatrix uniform, and with the
+previous variant that evaluated mat3(transpose(inverse(model))) for every
+vertex. GPU time is measured with GL_TIME_ELAPSED queries.
+
+Run once on the hardware driver and once with --software, which selects
+Mesa's llvmpipe rasterizer, to compare both.
+
+Example:
+    $ python benchmarks/normal_matrix_benchmark.py --sectors 1024 --stacks 512
+    $ python benchmarks/normal_matrix_benchmark.py --software
+"""
+
+import argparse
+import os
+import sys
+
+# LIBGL_ALWAYS_SOFTWARE has to be set before the driver is loaded.
+if "--software" in sys.argv:
+    os.environ["LIBGL_ALWAYS_SOFTWARE"] = "1"
+
+import common
+import glm
+import numpy as np
+from OpenGL.GL import *
+
+PER_VERTEX_NORMAL_MATRIX = "mat3(transpose(inverse(model))) * aNormal"
+
+
+def gpu_time(draw, frames):
+    """
+    Measure the average GPU time of a draw function.
+
+    Args:
+        draw (callable): Function issuing the draw calls of one frame
+        frames (int): Number of frames to average
+
+    Returns:
+        float: Average GPU time per frame in seconds
+    """
+    queries = glGenQueries(frames)
+    for query in queries:
+        glClear(GL_COLOR_BUFFER_BIT | GL_DEPTH_BUFFER_BIT)
+        glBeginQuery(GL_TIME_ELAPSED, query)
+        draw()
+        glEndQuery(GL_TIME_ELAPSED)
+    glFinish()
+
+    elapsed = np.zeros(1, dtype=np.uint64)
+    total = 0
+    for query in queries:
+        glGetQueryObjectui64v(query, GL_QUERY_RESULT, elapsed)
+        total += int(elapsed[0])
+    glDeleteQueries(frames, queries)
+    return total / frames * 1e-9
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sectors", type=int, default=1024)
+    parser.add_argument("--stacks", type=int, default=512)
+    parser.add_argument("--draws", type=int, default=20, help="sphere draws per frame")
+    parser.add_argument("--frames", type=int, default=20)
+    parser.add_argument("--software", action="store_true",
+                        help="use the llvmpipe software rasterizer")
+    args = parser.parse_args()
+
+    # A small viewport keeps the cost in the vertex stage.
+    engine = common.create_hidden_engine(64, 64)
+    print(f"renderer: {glGetString(GL_RENDERER).decode()}")
+
+    from Shaders import texture_vertex_shader, texture_fragment_shader
+    from objects.TexturedSphere import TexturedSphere
+
+    engine.frame_data.update(
+        engine.projection_matrix, glm.lookAt(glm.vec3(0, 0, 4), glm.vec3(0), glm.vec3(0, 1, 0)),
+        glm.vec3(0, 0, 4), [2.0, 2.0, 2.0]
+    )
+
+    legacy_vertex_shader = texture_vertex_shader.replace("normalMatrix * aNormal", PER_VERTEX_NORMAL_MATRIX)
+    if legacy_vertex_shader == texture_vertex_shader:
+        print("Could not derive the per-vertex variant of the vertex shader")
+        return 1
+
+    vertex_count = None
+    results = {}
+    for label, vertex_shader in (("per-vertex", legacy_vertex_shader), ("cpu", texture_vertex_shader)):
+        sphere = TexturedSphere(
+            vertex_shader, texture_fragment_shader, "textures/earth.jpg",
+            1.0, args.sectors, args.stacks
+        )
+        sphere.rotate(20, 30, 0)
+        sphere.scale(1.5)
+        vertex_count = sphere.mesh.index_count
+
+        def draw():
+            for _ in range(args.draws):
+                sphere.draw()
+
+        results[label] = gpu_time(draw, args.frames)
+        del sphere
+
+    vertices = vertex_count * args.draws
+    for label, seconds in results.items():
+        print(f"{label:>10}: {seconds * 1e3:8.2f} ms/frame  "
+              f"{vertices / seconds / 1e6:8.1f} M vertices/s")
+    print(f"speedup: {results['per-vertex'] / results['cpu']:.2f}x")
+
+    engine.terminate()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
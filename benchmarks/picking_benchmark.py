@@ -0,0 +1,108 @@
+"""
+Ray picking benchmark.
+
+Fills a scene with high-resolution spheres totalling about a million
+triangles and measures Scene.pick() for rays through random pixels,
+compared with a brute-force Moller-Trumbore test against every triangle.
+The first pick of a mesh also builds its triangle BVH and is reported
+separately.
+
+Example:
+    $ python benchmarks/picking_benchmark.py --spheres 64 --sectors 128 --stacks 64
+"""
+
+import argparse
+import sys
+
+import common
+import glm
+import numpy as np
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--spheres", type=int, default=64)
+    parser.add_argument("--sectors", type=int, default=128)
+    parser.add_argument("--stacks", type=int, default=64)
+    parser.add_argument("--picks", type=int, default=100)
+    parser.add_argument("--budget", type=float, default=1000 / 60, help="frame budget in ms")
+    args = parser.parse_args()
+
+    engine = common.create_hidden_engine()
+
+    from Picking import screen_ray, ray_triangles
+    from Scene import Scene
+    from Shaders import texture_vertex_shader, texture_fragment_shader, vertex_shader_source, fragment_shader_source
+    from objects.Cube import Cube
+    from objects.TexturedSphere import TexturedSphere
+
+    scene = Scene()
+    side = int(np.ceil(np.sqrt(args.spheres)))
+    for i in range(args.spheres):
+        sphere = TexturedSphere(
+            texture_vertex_shader, texture_fragment_shader, "textures/earth.jpg",
+            1.0, args.sectors, args.stacks
+        )
+        sphere.set_position((i % side - side / 2) * 2.5, (i // side - side / 2) * 2.5, -side * 2.5)
+        scene.add(f"sphere{i}", sphere)
+
+    mesh = scene.get("sphere0").mesh
+    triangle_count = len(mesh.triangles()) * args.spheres
+    print(f"triangles: {triangle_count}")
+
+    view = engine.camera.view_matrix
+    rng = np.random.default_rng(0)
+    pixels = rng.uniform((0, 0), (engine.width, engine.height), (args.picks, 2))
+    rays = [screen_ray(x, y, engine.width, engine.height, engine.projection_matrix, view)
+            for x, y in pixels.tolist()]
+
+    first = common.time_call(scene.pick, *rays[0], 1.0)
+    times = [common.time_call(scene.pick, origin, direction, 1.0) for origin, direction in rays]
+
+    # Brute force: every triangle of every sphere, in world space.
+    # np.asarray() indexes the world matrix [row][column].
+    world_triangles = []
+    for node in scene.draw_list():
+        model = np.asarray(node.world_matrix, dtype=np.float64)
+        world_triangles.append(node.mesh.triangles() @ model[:3, :3].T + model[:3, 3])
+    world_triangles = np.concatenate(world_triangles)
+    brute = []
+    mismatches = 0
+    for origin, direction in rays[:10]:
+        brute.append(common.time_call(ray_triangles, origin, direction, world_triangles))
+        expected = ray_triangles(origin, direction, world_triangles).min()
+        _, found = scene.pick(origin, direction, 1.0)
+        if min(expected, 1.0) != found and not np.isclose(expected, found):
+            mismatches += 1
+
+    # A cube far from its local origin is only found if the world boxes
+    # and the ray's local space both include the translation.
+    cube = scene.add("moved_cube", Cube(vertex_shader_source, fragment_shader_source))
+    cube.set_position(40.0, 0.0, 0.0)
+    hit, t = scene.pick((40.0, 0.0, 10.0), (0.0, 0.0, -1.0))
+    moved_hit = hit is cube and np.isclose(t, 9.5)
+
+    times = np.array(times) * 1e3
+    print(f"first pick (builds BVH): {first * 1e3:.2f} ms")
+    print(f"pick median:             {np.median(times):.3f} ms")
+    print(f"pick p99:                {np.percentile(times, 99):.3f} ms")
+    print(f"brute force:             {np.median(brute) * 1e3:.2f} ms")
+
+    scene.cleanup()
+    engine.terminate()
+
+    failed = False
+    if mismatches:
+        print(f"FAIL: {mismatches} picks differ from the brute-force result")
+        failed = True
+    if not moved_hit:
+        print("FAIL: the ray missed the translated cube")
+        failed = True
+    if np.percentile(times, 99) > args.budget:
+        print("FAIL: picking does not fit in the frame budget")
+        failed = True
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
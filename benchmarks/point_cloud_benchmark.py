@@ -0,0 +1,119 @@
+"""
+Point cloud benchmark.
+
+Writes a synthetic cloud of N points to memory-mapped .npy files in a
+temporary directory, uploads it into a PointCloud straight from the
+mappings and reports the upload time, the peak memory allocated during
+the upload (which stays around one chunk, whatever the cloud size) and
+the frame time with and without distance-based decimation.
+
+Example:
+    $ python benchmarks/point_cloud_benchmark.py --points 50000000
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import tracemalloc
+
+import common
+import glm
+import numpy as np
+from OpenGL.GL import *
+
+
+def write_cloud(directory, points, chunk_size):
+    """
+    Write positions and colors of a noisy terrain to .npy files, chunk by chunk.
+
+    Returns:
+        tuple: Paths of the position and color files
+    """
+    position_path = os.path.join(directory, "positions.npy")
+    color_path = os.path.join(directory, "colors.npy")
+    positions = np.lib.format.open_memmap(position_path, "w+", np.float32, (points, 3))
+    colors = np.lib.format.open_memmap(color_path, "w+", np.uint8, (points, 3))
+    side = int(np.sqrt(points)) + 1
+    rng = np.random.default_rng(0)
+    for start in range(0, points, chunk_size):
+        index = np.arange(start, min(start + chunk_size, points))
+        x = (index % side) / side * 200.0 - 100.0
+        z = (index // side) / side * 200.0 - 100.0
+        y = np.sin(x * 0.1) * np.cos(z * 0.1) * 5.0 + rng.normal(0.0, 0.05, len(index))
+        positions[start:start + len(index)] = np.stack([x, y, z], axis=1)
+        colors[start:start + len(index)] = np.stack([(y + 5.0) * 25.0, np.full_like(y, 128.0), 255 - (y + 5.0) * 25.0], axis=1)
+    positions.flush()
+    colors.flush()
+    del positions, colors
+    return position_path, color_path
+
+
+def average_frame_time(draw, frames):
+    """Average the duration of a draw function over several frames, in seconds."""
+    total = 0.0
+    for _ in range(frames):
+        glClear(GL_COLOR_BUFFER_BIT | GL_DEPTH_BUFFER_BIT)
+        total += common.time_call(_finished, draw)
+    return total / frames
+
+
+def _finished(draw):
+    draw()
+    glFinish()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--points", type=int, default=10000000)
+    parser.add_argument("--chunk-size", type=int, default=1 << 20)
+    parser.add_argument("--lod-distance", type=float, default=30.0)
+    parser.add_argument("--frames", type=int, default=20)
+    args = parser.parse_args()
+
+    engine = common.create_hidden_engine()
+
+    from Shaders import point_vertex_shader, point_fragment_shader
+    from objects.PointCloud import PointCloud
+
+    with tempfile.TemporaryDirectory() as directory:
+        position_path, color_path = write_cloud(directory, args.points, args.chunk_size)
+        positions = np.load(position_path, mmap_mode="r")
+        colors = np.load(color_path, mmap_mode="r")
+        cloud = None
+
+        def upload():
+            nonlocal cloud
+            cloud = PointCloud(
+                positions, point_vertex_shader, point_fragment_shader,
+                colors=colors, chunk_size=args.chunk_size, lod_distance=args.lod_distance,
+            )
+            glFinish()
+
+        tracemalloc.start()
+        upload_time = common.time_call(upload)
+        _, peak_memory = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        del positions, colors
+
+        camera = glm.vec3(0.0, 20.0, 110.0)
+        view = glm.lookAt(camera, glm.vec3(0.0), glm.vec3(0, 1, 0))
+        engine.frame_data.update(engine.projection_matrix, view, camera, [0.0, 50.0, 0.0])
+        view_projection = engine.frame_data.view_projection
+
+        full_time = average_frame_time(cloud.draw, args.frames)
+        drawn = cloud.update_view(view_projection, camera)
+        decimated_time = average_frame_time(cloud.draw, args.frames)
+
+    print(f"{args.points} points in {len(cloud.chunk_starts)} chunks uploaded in {upload_time:.2f} s")
+    print(f"peak memory allocated during the upload: {peak_memory / 2**20:.1f} MB")
+    print(f"all points:        {cloud.count:10d} points {full_time * 1e3:8.2f} ms/frame")
+    print(f"culled, decimated: {drawn:10d} points {decimated_time * 1e3:8.2f} ms/frame")
+
+    del cloud
+    engine.terminate()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,67 @@
+"""
+Profiler overhead benchmark.
+
+Times frames made of nested CPU scopes and counters, with the profiler
+recording and with it disabled, to show what instrumenting the main loop
+costs, then prints the percentiles of a simulated workload and optionally
+writes its Chrome trace. No OpenGL context is needed.
+
+Example:
+    $ python benchmarks/profiler_benchmark.py --frames 2000 --trace trace.json
+"""
+
+import argparse
+import sys
+import time
+
+import common
+import numpy as np
+
+
+def run(profiler, frames, scopes):
+    """Record frames of nested scopes. Returns the time per scope in microseconds."""
+    start = time.perf_counter()
+    for _ in range(frames):
+        profiler.begin_frame()
+        for _ in range(scopes):
+            with profiler.scope("update"):
+                with profiler.scope("cull"):
+                    profiler.count("draws", 3)
+        profiler.end_frame()
+    return (time.perf_counter() - start) / (frames * scopes * 2) * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--frames", type=int, default=2000)
+    parser.add_argument("--scopes", type=int, default=10, help="scope pairs per frame")
+    parser.add_argument("--trace", help="write the simulated frames to this Chrome trace file")
+    args = parser.parse_args()
+
+    from Profiler import Profiler
+
+    enabled = run(Profiler(), args.frames, args.scopes)
+    disabled = run(Profiler(enabled=False), args.frames, args.scopes)
+    print(f"scope overhead: {enabled:.2f} us recording, {disabled:.2f} us disabled")
+
+    profiler = Profiler()
+    rng = np.random.default_rng(0)
+    for _ in range(240):
+        profiler.begin_frame()
+        for name, mean in (("input", 0.2), ("update", 1.0), ("render", 3.0), ("swap", 0.5)):
+            with profiler.scope(name):
+                time.sleep(rng.exponential(mean) / 1e3)
+        profiler.end_frame()
+
+    stats = profiler.stats()
+    print(f"{'scope':>10} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8}")
+    for name, summary in [("frame", stats["frame_ms"]), *stats["cpu_ms"].items()]:
+        print(f"{name:>10} {summary['p50']:8.3f} {summary['p95']:8.3f} {summary['p99']:8.3f}")
+    if args.trace:
+        profiler.export_chrome_trace(args.trace)
+        print(f"trace written to {args.trace}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,95 @@
+"""
+Framebuffer readback benchmark.
+
+Renders the engine's scene into an offscreen framebuffer at 1080p and 4K
+and reads every frame back, once with glReadPixels into client memory and
+once through the AsyncReadback ring of pixel buffer objects. Reports the
+frames per second, the readback throughput and how long the render loop
+itself spent per frame; with glReadPixels that includes waiting for the
+GPU, with the ring it does not.
+
+Run it headless under llvmpipe with:
+    $ PYOPENGL_PLATFORM=egl LIBGL_ALWAYS_SOFTWARE=1 python benchmarks/readback_benchmark.py
+
+Example:
+    $ python benchmarks/readback_benchmark.py --frames 120 --slots 3
+"""
+
+import argparse
+import sys
+import time
+
+import common
+from OpenGL.GL import *
+
+RESOLUTIONS = {"1080p": (1920, 1080), "4K": (3840, 2160)}
+
+
+def run_sync(engine, width, height, frames):
+    """Read every frame with glReadPixels. Returns (seconds, loop seconds, frames read)."""
+    from Framebuffer import read_pixels
+
+    start = time.perf_counter()
+    for _ in range(frames):
+        engine.render_frame(width, height)
+        read_pixels(width, height)
+    elapsed = time.perf_counter() - start
+    return elapsed, elapsed, frames
+
+
+def run_async(engine, width, height, frames, slots):
+    """Read every frame through AsyncReadback. Returns (seconds, loop seconds, frames read)."""
+    from AsyncReadback import AsyncReadback
+
+    readback = AsyncReadback(slots)
+    received = []
+    start = time.perf_counter()
+    for _ in range(frames):
+        engine.render_frame(width, height)
+        readback.request(received.append, width, height)
+        del received[:-1]
+    loop = time.perf_counter() - start
+    readback.flush()
+    elapsed = time.perf_counter() - start
+    delivered = readback.delivered
+    del readback
+    return elapsed, loop, delivered
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--frames", type=int, default=120)
+    parser.add_argument("--slots", type=int, default=3, help="pixel buffer objects in the ring")
+    parser.add_argument("--resolution", action="append", choices=sorted(RESOLUTIONS))
+    args = parser.parse_args()
+
+    engine = common.create_hidden_engine()
+
+    from Framebuffer import Framebuffer
+
+    print(f"renderer: {glGetString(GL_RENDERER).decode()}")
+    print(f"{'':>19} {'fps':>8} {'MB/s':>9} {'loop ms':>9} {'frames':>7}")
+    for name in args.resolution or list(RESOLUTIONS):
+        width, height = RESOLUTIONS[name]
+        target = Framebuffer(width, height)
+        target.bind()
+        engine.render_frame(width, height)
+        glFinish()
+
+        runs = (("glReadPixels", lambda: run_sync(engine, width, height, args.frames)),
+                ("AsyncReadback", lambda: run_async(engine, width, height, args.frames, args.slots)))
+        for label, run in runs:
+            elapsed, loop, read = run()
+            megabytes = read * width * height * 4 / 1e6
+            print(f"{name:>5} {label:>13} {args.frames / elapsed:8.1f} {megabytes / elapsed:9.1f} "
+                  f"{loop / args.frames * 1e3:9.3f} {read:7d}")
+
+        target.unbind()
+        del target
+
+    engine.terminate()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
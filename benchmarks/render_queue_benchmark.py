@@ -0,0 +1,104 @@
+"""
+Render queue benchmark.
+
+Builds a scene that interleaves cubes, textured cubes with two different
+textures and textured spheres, and reports the OpenGL state changes and
+frame time of drawing them one by one with draw(), through the render
+queue in submission order, and through the sorted render queue.
+
+Example:
+    $ python benchmarks/render_queue_benchmark.py --objects 3000
+"""
+
+import argparse
+import sys
+
+import common
+import glm
+import numpy as np
+from OpenGL.GL import *
+
+
+def average_frame_time(draw, frames):
+    """Average the duration of a draw function over several frames, in seconds."""
+    total = 0.0
+    for _ in range(frames):
+        glClear(GL_COLOR_BUFFER_BIT | GL_DEPTH_BUFFER_BIT)
+        total += common.time_call(_finished, draw)
+    return total / frames
+
+
+def _finished(draw):
+    draw()
+    glFinish()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--objects", type=int, default=3000)
+    parser.add_argument("--frames", type=int, default=50)
+    args = parser.parse_args()
+
+    engine = common.create_hidden_engine()
+
+    from RenderQueue import RenderQueue
+    from Shaders import (vertex_shader_source, fragment_shader_source,
+                         texture_vertex_shader, texture_fragment_shader)
+    from objects.Cube import Cube
+    from objects.TexturedCube import TexturedCube
+    from objects.TexturedSphere import TexturedSphere
+
+    view = glm.lookAt(glm.vec3(0, 0, 10), glm.vec3(0), glm.vec3(0, 1, 0))
+    engine.frame_data.update(engine.projection_matrix, view, glm.vec3(0, 0, 10), [2.0, 2.0, 2.0])
+
+    factories = [
+        lambda: Cube(vertex_shader_source, fragment_shader_source),
+        lambda: TexturedCube(texture_vertex_shader, texture_fragment_shader, "textures/wood.png"),
+        lambda: TexturedSphere(texture_vertex_shader, texture_fragment_shader, "textures/earth.jpg"),
+        lambda: TexturedCube(texture_vertex_shader, texture_fragment_shader, "textures/earth.jpg"),
+    ]
+    rng = np.random.default_rng(0)
+    drawables = []
+    for i in range(args.objects):
+        drawable = factories[i % len(factories)]()
+        x, y, z = rng.uniform((-4, -3, -20), (4, 3, 0)).tolist()
+        drawable.set_position(x, y, z)
+        drawables.append(drawable)
+    depths = [10.0 - drawable.position.z for drawable in drawables]
+
+    queue = RenderQueue()
+
+    def draw_immediate():
+        for drawable in drawables:
+            drawable.draw()
+
+    def draw_queue(sort):
+        for drawable, depth in zip(drawables, depths):
+            queue.submit(drawable, depth)
+        return queue.flush(sort)
+
+    textured = sum(drawable.texture is not None for drawable in drawables)
+    immediate_stats = {
+        "draws": len(drawables),
+        "program_changes": len(drawables),
+        "texture_changes": textured,
+        "vao_changes": 2 * len(drawables),
+    }
+    results = [
+        ("draw()", immediate_stats, average_frame_time(draw_immediate, args.frames)),
+        ("queue", draw_queue(False), average_frame_time(lambda: draw_queue(False), args.frames)),
+        ("sorted", draw_queue(True), average_frame_time(lambda: draw_queue(True), args.frames)),
+    ]
+
+    print(f"{'':>8} {'draws':>7} {'programs':>9} {'textures':>9} {'VAOs':>7} {'ms/frame':>9}")
+    for label, stats, seconds in results:
+        print(f"{label:>8} {stats['draws']:7d} {stats['program_changes']:9d} "
+              f"{stats['texture_changes']:9d} {stats['vao_changes']:7d} {seconds * 1e3:9.2f}")
+
+    drawables.clear()
+    engine.terminate()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
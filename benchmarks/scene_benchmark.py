@@ -0,0 +1,70 @@
+"""
+Frame time benchmark for the persistent scene.
+
+Renders the engine's scene for a fixed number of frames and checks that
+frame time stays flat and that no OpenGL objects are leaked.
+
+Example:
+    $ python benchmarks/scene_benchmark.py --frames 10000
+"""
+
+import argparse
+import sys
+
+import common
+from OpenGL.GL import *
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--frames", type=int, default=10000)
+    parser.add_argument("--window", type=int, default=1000,
+                        help="frames averaged at the start and end of the run")
+    parser.add_argument("--tolerance", type=float, default=1.5,
+                        help="allowed ratio between late and early frame time")
+    args = parser.parse_args()
+
+    engine = common.create_hidden_engine()
+    width, height = engine.width, engine.height
+
+    # Warm up once so that lazily created driver state is not counted.
+    engine.render_frame(width, height)
+    glFinish()
+    objects_before = common.count_gl_objects()
+
+    frame_times = []
+    for _ in range(args.frames):
+        frame_times.append(common.time_call(_render, engine, width, height))
+
+    objects_after = common.count_gl_objects()
+
+    window = min(args.window, len(frame_times) // 2)
+    early = sum(frame_times[:window]) / window
+    late = sum(frame_times[-window:]) / window
+    per_object = late / len(engine.scene.objects)
+
+    print(f"frames:            {args.frames}")
+    print(f"early frame time:  {early * 1e3:.3f} ms")
+    print(f"late frame time:   {late * 1e3:.3f} ms")
+    print(f"per object:        {per_object * 1e6:.1f} us")
+    print(f"GL objects before: {objects_before}")
+    print(f"GL objects after:  {objects_after}")
+
+    engine.terminate()
+
+    flat = late <= early * args.tolerance
+    leaked = objects_after != objects_before
+    if not flat:
+        print("FAIL: frame time grows over the run")
+    if leaked:
+        print("FAIL: OpenGL object count grows over the run")
+    return 1 if (leaked or not flat) else 0
+
+
+def _render(engine, width, height):
+    engine.render_frame(width, height)
+    glFinish()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
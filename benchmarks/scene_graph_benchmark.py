@@ -0,0 +1,109 @@
+"""
+Scene hierarchy transform propagation benchmark.
+
+Builds a hierarchy of transform-only nodes (no OpenGL context is needed)
+and measures Scene.update_transforms() after moving a single leaf, a single
+root and every root. Only the moved subtrees should be recomputed, so the
+first two cases must be far cheaper than the full update.
+
+Example:
+    $ python benchmarks/scene_graph_benchmark.py --nodes 50000 --roots 50
+"""
+
+import argparse
+import sys
+
+import common
+from Scene import Scene
+from objects.SceneNode import SceneNode
+
+
+def build_hierarchy(scene, nodes, roots, branching):
+    """
+    Fill a scene with roots, each the top of a tree of equal size.
+
+    Args:
+        scene (Scene): Scene to fill
+        nodes (int): Total number of nodes
+        roots (int): Number of root nodes
+        branching (int): Children per inner node
+
+    Returns:
+        tuple: List of root nodes and list of every node in creation order
+    """
+    per_root = nodes // roots
+    root_nodes = []
+    all_nodes = []
+    for r in range(roots):
+        tree = [scene.add(f"root{r}", SceneNode(f"root{r}"))]
+        for i in range(1, per_root):
+            parent = tree[(i - 1) // branching]
+            node = scene.add(f"node{r}_{i}", SceneNode(), parent)
+            node.set_position(1.0, 0.0, 0.0)
+            tree.append(node)
+        root_nodes.append(tree[0])
+        all_nodes.extend(tree)
+    return root_nodes, all_nodes
+
+
+def timed_update(scene, repeats, move):
+    """
+    Average the cost of moving nodes and propagating the change.
+
+    Args:
+        scene (Scene): Scene to update
+        repeats (int): Number of measurements
+        move (callable): Called with the repeat index to move nodes
+
+    Returns:
+        tuple: Average seconds per update and nodes recomputed per update
+    """
+    total = 0.0
+    updated = 0
+    for i in range(repeats):
+        move(i + 1)
+        total += common.time_call(scene.update_transforms)
+        updated = scene.transform_updates
+    return total / repeats, updated
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--nodes", type=int, default=50000)
+    parser.add_argument("--roots", type=int, default=50)
+    parser.add_argument("--branching", type=int, default=4)
+    parser.add_argument("--repeats", type=int, default=20)
+    args = parser.parse_args()
+
+    scene = Scene()
+    roots, nodes = build_hierarchy(scene, args.nodes, args.roots, args.branching)
+    initial = common.time_call(scene.update_transforms)
+    print(f"initial update: {scene.transform_updates} nodes in {initial * 1e3:.1f} ms")
+
+    leaf = nodes[-1]
+    root = roots[0]
+    cases = [
+        ("one leaf", lambda i: leaf.set_position(i, 0.0, 0.0)),
+        ("one root", lambda i: root.set_position(i, 0.0, 0.0)),
+        ("all roots", lambda i: [node.set_position(i, 0.0, 0.0) for node in roots]),
+    ]
+
+    failed = False
+    results = {}
+    for label, move in cases:
+        seconds, updated = timed_update(scene, args.repeats, move)
+        results[label] = seconds
+        print(f"{label:>10}: {updated:6d} nodes in {seconds * 1e3:8.3f} ms")
+    if scene.update_transforms() != 0:
+        print("FAIL: nodes were recomputed without any change")
+        failed = True
+    if results["one root"] * 2 > results["all roots"]:
+        print("FAIL: moving one root is not proportional to its subtree")
+        failed = True
+
+    scene.cleanup()
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
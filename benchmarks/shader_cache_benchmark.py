@@ -0,0 +1,52 @@
+"""
+Shader program cache benchmark.
+
+Creates many cubes and checks that their shared program was compiled and
+linked exactly once.
+
+Example:
+    $ python benchmarks/shader_cache_benchmark.py --cubes 2000
+"""
+
+import argparse
+import sys
+import time
+
+import common
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--cubes", type=int, default=2000)
+    args = parser.parse_args()
+
+    engine = common.create_hidden_engine()
+
+    from ShaderCache import shader_cache
+    from Shaders import vertex_shader_source, fragment_shader_source
+    from objects.Cube import Cube
+
+    before = shader_cache.stats()
+    start = time.perf_counter()
+    cubes = [Cube(vertex_shader_source, fragment_shader_source) for _ in range(args.cubes)]
+    elapsed = time.perf_counter() - start
+    after = shader_cache.stats()
+
+    compiles = after["compiles"] - before["compiles"]
+    print(f"cubes created:   {len(cubes)} in {elapsed * 1e3:.1f} ms")
+    print(f"programs linked: {compiles}")
+    print(f"cache hits:      {after['hits'] - before['hits']}")
+    print(f"link time:       {(after['link_time'] - before['link_time']) * 1e3:.2f} ms")
+
+    cubes.clear()
+    engine.terminate()
+
+    # The scene already uses the cube shader, so the cubes must all be hits.
+    if compiles != 0:
+        print("FAIL: the cube program was linked more than once")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
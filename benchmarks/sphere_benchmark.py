@@ -0,0 +1,89 @@
+"""
+Sphere tessellation micro-benchmark.
+
+Compares the original per-vertex Python loop with the vectorized
+sphere_geometry() across a range of resolutions and checks that both
+produce bit-identical vertex and index arrays.
+
+Example:
+    $ python benchmarks/sphere_benchmark.py
+"""
+
+import math
+import sys
+import time
+
+import common
+import numpy as np
+from objects.TexturedSphere import sphere_geometry
+
+RESOLUTIONS = [(16, 8), (32, 16), (64, 32), (128, 64), (256, 128), (512, 256)]
+
+
+def loop_sphere_geometry(radius, sectors, stacks):
+    """The original nested-loop generator, kept as the reference."""
+    vertices = []
+    indices = []
+
+    for i in range(stacks + 1):
+        V = i / stacks
+        phi = V * math.pi
+
+        for j in range(sectors + 1):
+            U = j / sectors
+            theta = U * 2 * math.pi
+
+            x = math.cos(theta) * math.sin(phi)
+            y = math.cos(phi)
+            z = math.sin(theta) * math.sin(phi)
+
+            vertices.extend([
+                radius * x, radius * y, radius * z,
+                x, y, z,
+                U, V
+            ])
+
+    for i in range(stacks):
+        for j in range(sectors):
+            first = (i * (sectors + 1)) + j
+            second = first + sectors + 1
+
+            indices.extend([first, second, first + 1])
+            indices.extend([second, second + 1, first + 1])
+
+    return np.array(vertices, dtype=np.float32), np.array(indices, dtype=np.uint32)
+
+
+def best_time(function, *args, repeats=3):
+    """Return the best of several timings of a call, in seconds."""
+    return min(common.time_call(function, *args) for _ in range(repeats))
+
+
+def main():
+    identical = True
+    print(f"{'resolution':>12} {'loop ms':>10} {'numpy ms':>10} {'memo us':>9} {'speedup':>8}  identical")
+    for sectors, stacks in RESOLUTIONS:
+        loop_time = best_time(loop_sphere_geometry, 1.0, sectors, stacks)
+        numpy_time = best_time(sphere_geometry.__wrapped__, 1.0, sectors, stacks)
+
+        sphere_geometry(1.0, sectors, stacks)
+        memo_time = best_time(sphere_geometry, 1.0, sectors, stacks)
+
+        expected = loop_sphere_geometry(1.0, sectors, stacks)
+        actual = sphere_geometry.__wrapped__(1.0, sectors, stacks)
+        same = all(a.dtype == b.dtype and a.tobytes() == b.tobytes() for a, b in zip(expected, actual))
+        identical = identical and same
+
+        print(
+            f"{sectors:>5}x{stacks:<6} {loop_time * 1e3:10.2f} {numpy_time * 1e3:10.2f} "
+            f"{memo_time * 1e6:9.2f} {loop_time / numpy_time:7.1f}x  {same}"
+        )
+
+    if not identical:
+        print("FAIL: vectorized output differs from the reference loop")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
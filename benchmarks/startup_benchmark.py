@@ -0,0 +1,73 @@
+"""
+Cold vs warm startup benchmark for the program binary cache.
+
+Starts the engine in fresh processes twice against the same, initially
+empty, shader cache directory: the first run compiles every program and
+stores the binaries, the second loads them from disk.
+
+Example:
+    $ python benchmarks/startup_benchmark.py
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+
+import common
+
+
+def run_once(cache_dir):
+    """
+    Start the engine in a child process and collect its startup report.
+
+    Args:
+        cache_dir (str): Shader binary cache directory
+
+    Returns:
+        dict: Startup time and shader cache statistics
+    """
+    output = subprocess.run(
+        [sys.executable, os.path.abspath(__file__), "--child", cache_dir],
+        check=True, capture_output=True, text=True,
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def child(cache_dir):
+    engine = common.create_hidden_engine(shader_cache_dir=cache_dir)
+
+    from ShaderCache import shader_cache
+
+    report = dict(shader_cache.stats(), startup_time=engine.startup_time)
+    engine.terminate()
+    print(json.dumps(report))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--child", metavar="CACHE_DIR", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        child(args.child)
+        return 0
+
+    with tempfile.TemporaryDirectory() as cache_dir:
+        cold = run_once(cache_dir)
+        warm = run_once(cache_dir)
+
+    for name, report in (("cold", cold), ("warm", warm)):
+        print(
+            f"{name}: startup {report['startup_time'] * 1e3:8.2f} ms, "
+            f"{report['compiles']} compiled ({report['link_time'] * 1e3:.2f} ms), "
+            f"{report['binary_loads']} loaded ({report['load_time'] * 1e3:.2f} ms), "
+            f"{report['binary_rejects']} rejected"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,109 @@
+"""
+Static batching benchmark.
+
+Creates N small triangle fans and strips sharing one shader and compares
+the frame time of drawing them one by one through a scene with drawing
+them as a single StaticBatch, and reports the time of building the batch.
+
+Example:
+    $ python benchmarks/static_batch_benchmark.py --objects 5000
+"""
+
+import argparse
+import sys
+
+import common
+import glm
+import numpy as np
+from OpenGL.GL import *
+
+
+FAN = [
+    0.0, 0.0, 0.0,
+    0.1, 0.0, 0.0,
+    0.07, 0.07, 0.0,
+    0.0, 0.1, 0.0,
+    -0.07, 0.07, 0.0,
+    -0.1, 0.0, 0.0,
+]
+
+STRIP = [
+    -0.1, -0.1, 0.0,
+    -0.1, 0.1, 0.0,
+    0.0, -0.1, 0.0,
+    0.0, 0.1, 0.0,
+    0.1, -0.1, 0.0,
+    0.1, 0.1, 0.0,
+]
+
+
+def average_frame_time(draw, frames):
+    """Average the duration of a draw function over several frames, in seconds."""
+    total = 0.0
+    for _ in range(frames):
+        glClear(GL_COLOR_BUFFER_BIT | GL_DEPTH_BUFFER_BIT)
+        total += common.time_call(_finished, draw)
+    return total / frames
+
+
+def _finished(draw):
+    draw()
+    glFinish()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--objects", type=int, default=5000)
+    parser.add_argument("--frames", type=int, default=50)
+    args = parser.parse_args()
+
+    engine = common.create_hidden_engine()
+
+    from Scene import Scene
+    from Shaders import vertex_shader_source, fragment_shader_source
+    from objects.StaticBatch import StaticBatch
+    from objects.Triangle_fans import Triangle_fans
+    from objects.Triangle_strip import Triangle_strip
+
+    view = glm.lookAt(glm.vec3(0, 0, 10), glm.vec3(0), glm.vec3(0, 1, 0))
+    engine.frame_data.update(engine.projection_matrix, view, glm.vec3(0, 0, 10), [0.0, 0.0, 10.0])
+    view_projection = engine.frame_data.view_projection
+
+    positions = np.random.default_rng(0).uniform((-4, -3, -5), (4, 3, 0), (args.objects, 3))
+    shapes = []
+    for i, (x, y, z) in enumerate(positions.tolist()):
+        shape_class, points = (Triangle_fans, FAN) if i % 2 == 0 else (Triangle_strip, STRIP)
+        shape = shape_class(points, vertex_shader_source, fragment_shader_source)
+        shape.set_position(x, y, z)
+        shapes.append(shape)
+
+    separate = Scene()
+    for i, shape in enumerate(shapes):
+        separate.add(f"shape{i}", shape)
+    separate_time = average_frame_time(lambda: separate.draw(view_projection), args.frames)
+    separate_draws = separate.render_queue.stats["draws"]
+    separate.cleanup()
+
+    batch = StaticBatch(vertex_shader_source, fragment_shader_source)
+    for shape in shapes:
+        batch.add(shape)
+    build_time = common.time_call(batch.build)
+    batched = Scene()
+    batched.add("shapes", batch)
+    batched_time = average_frame_time(lambda: batched.draw(view_projection), args.frames)
+    batched_draws = batched.render_queue.stats["draws"]
+
+    print(f"{args.objects} shapes, batch of {batch.mesh.vertex_count} vertices "
+          f"and {batch.mesh.index_count} indices built in {build_time * 1e3:.2f} ms")
+    print(f"separate: {separate_draws:6d} draw calls {separate_time * 1e3:8.2f} ms/frame")
+    print(f"batched:  {batched_draws:6d} draw calls {batched_time * 1e3:8.2f} ms/frame")
+
+    batched.cleanup()
+    del batch
+    shapes.clear()
+    engine.terminate()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
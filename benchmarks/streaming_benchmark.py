@@ -0,0 +1,87 @@
+"""
+Streaming vertex buffer benchmark.
+
+Animates a line strip of N points that changes every frame and compares
+recreating a LineStripe object per frame, which allocates new static
+buffers each time, with rewriting a DynamicShape through its streaming
+buffer. Reports the frame time and how often the stream waited for the GPU.
+
+Example:
+    $ python benchmarks/streaming_benchmark.py --points 20000
+    $ python benchmarks/streaming_benchmark.py --orphan
+"""
+
+import argparse
+import sys
+
+import common
+import glm
+import numpy as np
+from OpenGL.GL import *
+
+
+def wave(points, frame):
+    """Build the points of a sine wave moving with the frame number."""
+    x = np.linspace(-4.0, 4.0, points, dtype=np.float32)
+    vertices = np.empty((points, 3), dtype=np.float32)
+    vertices[:, 0] = x
+    vertices[:, 1] = np.sin(x * 3.0 + frame * 0.1)
+    vertices[:, 2] = 0.0
+    return vertices
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--points", type=int, default=20000)
+    parser.add_argument("--frames", type=int, default=200)
+    parser.add_argument("--orphan", action="store_true",
+                        help="use buffer orphaning even if persistent mapping is available")
+    args = parser.parse_args()
+
+    engine = common.create_hidden_engine()
+
+    from Shaders import vertex_shader_source, fragment_shader_source
+    from StreamingBuffer import StreamingBuffer
+    from objects.DynamicShape import DynamicShape
+    from objects.Line_stripe import LineStripe
+
+    view = glm.lookAt(glm.vec3(0, 0, 10), glm.vec3(0), glm.vec3(0, 1, 0))
+    engine.frame_data.update(engine.projection_matrix, view, glm.vec3(0, 0, 10), [0.0, 0.0, 10.0])
+    frames = [wave(args.points, frame) for frame in range(args.frames)]
+
+    def recreate():
+        for vertices in frames:
+            glClear(GL_COLOR_BUFFER_BIT)
+            line = LineStripe(vertices, vertex_shader_source, fragment_shader_source)
+            line.draw()
+            del line
+        glFinish()
+
+    stream = StreamingBuffer(args.points * 12, persistent=False if args.orphan else None)
+    shape = DynamicShape(vertex_shader_source, fragment_shader_source, stream=stream)
+
+    def streamed():
+        for vertices in frames:
+            glClear(GL_COLOR_BUFFER_BIT)
+            stream.begin_frame()
+            shape.set_vertices(vertices)
+            shape.draw()
+            stream.end_frame()
+        glFinish()
+
+    recreate_time = common.time_call(recreate) / args.frames
+    streamed_time = common.time_call(streamed) / args.frames
+
+    mode = "persistent mapping" if stream.persistent else "orphaning"
+    print(f"{args.points} points per frame, stream uses {mode}")
+    print(f"recreate objects: {recreate_time * 1e3:8.3f} ms/frame")
+    print(f"streaming buffer: {streamed_time * 1e3:8.3f} ms/frame "
+          f"({stream.stalls} stalls, {stream.orphans} orphans)")
+
+    del shape, stream
+    engine.terminate()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,387 @@
+"""
+Reproducible rendering benchmark suite.
+
+Runs scripted scenes for a fixed number of frames, each in a fresh process
+so that startup time and peak memory are measured per scene, and reports
+for every scene as JSON:
+
+    startup_ms       engine initialization plus building the scene
+    frame_ms         mean, p50, p95, p99 and max frame time, GPU work included
+    draw_calls       draw calls per frame
+    triangles        triangles submitted per frame
+    gl_objects       live buffers, vertex arrays, programs and textures
+    peak_rss_mb      peak resident memory of the process
+
+Object placement and animation are seeded, so two runs render exactly the
+same frames. With --headless the scenes render offscreen through EGL (set
+PYOPENGL_PLATFORM=osmesa to use OSMesa instead), and --software forces
+Mesa's llvmpipe renderer, so the suite runs on machines without a display
+or GPU.
+
+--compare loads the report of an earlier run and flags every metric that
+got worse by more than --threshold; the exit status is 1 if any did.
+
+Example:
+    $ python benchmarks/suite.py --headless --software --output baseline.json
+    $ python benchmarks/suite.py --headless --software --compare baseline.json
+
+Attributes:
+    SCENES (dict): Maps scene names to their builder, default object count
+        and a function writing the scene's assets, which is not timed
+    LOWER_IS_BETTER (tuple): Metrics compared against the baseline
+"""
+
+import os
+import sys
+
+if "--headless" in sys.argv:
+    # PyOpenGL binds its platform on first import, before common is loaded.
+    os.environ.setdefault("PYOPENGL_PLATFORM", "egl")
+
+import argparse
+import json
+import platform
+import resource
+import subprocess
+import tempfile
+import time
+
+import common
+import glm
+import numpy as np
+from OpenGL.GL import *
+
+
+def _place(drawables, seed=0):
+    """Scatter drawables in front of the camera at seeded positions."""
+    rng = np.random.default_rng(seed)
+    for drawable in drawables:
+        x, y, z = rng.uniform((-8, -5, -20), (8, 5, 2)).tolist()
+        drawable.set_position(x, y, z)
+        drawable.set_scale(0.5)
+    return drawables
+
+
+def lit_cubes(count, texture_dir):
+    from Shaders import vertex_shader_source, fragment_shader_source
+    from objects.Cube import Cube
+
+    return _place([Cube(vertex_shader_source, fragment_shader_source) for _ in range(count)])
+
+
+def textured_cubes(count, texture_dir):
+    from Shaders import texture_vertex_shader, texture_fragment_shader
+    from objects.TexturedCube import TexturedCube
+
+    paths = ("textures/wood.png", "textures/earth.jpg")
+    return _place([
+        TexturedCube(texture_vertex_shader, texture_fragment_shader, paths[i % len(paths)])
+        for i in range(count)
+    ])
+
+
+def spheres(sectors, stacks):
+    """Make a builder of textured spheres of one tessellation."""
+
+    def build(count, texture_dir):
+        from Shaders import texture_vertex_shader, texture_fragment_shader
+        from objects.TexturedSphere import TexturedSphere
+
+        return _place([
+            TexturedSphere(texture_vertex_shader, texture_fragment_shader, "textures/earth.jpg",
+                           radius=1.0, sectors=sectors, stacks=stacks)
+            for _ in range(count)
+        ])
+
+    return build
+
+
+def mixed_primitives(count, texture_dir):
+    from Shaders import (vertex_shader_source, fragment_shader_source, lamp_vertex_shader,
+                         lamp_fragment_shader, texture_vertex_shader, texture_fragment_shader)
+    from objects.Cube import Cube
+    from objects.lightCube import LightCube
+    from objects.TexturedCube import TexturedCube
+    from objects.TexturedSphere import TexturedSphere
+    from objects.Line import Line
+    from objects.Line_loop import LineLoop
+    from objects.Triangle import Triangle
+    from objects.Triangle_fans import Triangle_fans
+    from objects.Pixel import Pixel
+
+    square = [(-0.5, -0.5, 0.0), (0.5, -0.5, 0.0), (0.5, 0.5, 0.0), (-0.5, 0.5, 0.0)]
+    fan = [0.0, 0.0, 0.0, 0.5, 0.0, 0.0, 0.0, 0.5, 0.0, -0.5, 0.0, 0.0, 0.0, -0.5, 0.0, 0.5, 0.0, 0.0]
+    triangle = np.array([-0.5, -0.5, 0.0, 0.5, -0.5, 0.0, 0.0, 0.5, 0.0], dtype=np.float32)
+    factories = [
+        lambda: Cube(vertex_shader_source, fragment_shader_source),
+        lambda: LightCube(lamp_vertex_shader, lamp_fragment_shader),
+        lambda: TexturedCube(texture_vertex_shader, texture_fragment_shader, "textures/wood.png"),
+        lambda: TexturedSphere(texture_vertex_shader, texture_fragment_shader, "textures/earth.jpg"),
+        lambda: Line((0.0, 0.0, 0.0), (1.0, 1.0, 0.0), vertex_shader_source, fragment_shader_source),
+        lambda: LineLoop(square, vertex_shader_source, fragment_shader_source),
+        lambda: Triangle(triangle, vertex_shader_source, fragment_shader_source),
+        lambda: Triangle_fans(fan, vertex_shader_source, fragment_shader_source),
+        lambda: Pixel((0.0, 0.0, 0.0), vertex_shader_source, fragment_shader_source),
+    ]
+    return _place([factories[i % len(factories)]() for i in range(count)])
+
+
+def write_textures(count, texture_dir, size=1024):
+    """Write count seeded noise images of size x size pixels."""
+    from PIL import Image
+
+    rng = np.random.default_rng(0)
+    for i in range(count):
+        path = os.path.join(texture_dir, f"texture_{i}.png")
+        Image.fromarray(rng.integers(0, 256, (size, size, 4), dtype=np.uint8)).save(path)
+
+
+def texture_heavy(count, texture_dir):
+    """Cubes with a distinct, mipmapped texture each."""
+    from Shaders import texture_vertex_shader, texture_fragment_shader
+    from objects.TexturedCube import TexturedCube
+
+    return _place([
+        TexturedCube(texture_vertex_shader, texture_fragment_shader,
+                     os.path.join(texture_dir, f"texture_{i}.png"))
+        for i in range(count)
+    ])
+
+
+def startup(count, texture_dir):
+    return []
+
+
+SCENES = {
+    "lit_cubes": (lit_cubes, 1000, None),
+    "textured_cubes": (textured_cubes, 500, None),
+    "spheres_low": (spheres(16, 8), 200, None),
+    "spheres_medium": (spheres(64, 32), 200, None),
+    "spheres_high": (spheres(256, 128), 200, None),
+    "mixed_primitives": (mixed_primitives, 900, None),
+    "texture_heavy": (texture_heavy, 64, write_textures),
+    "startup": (startup, 0, None),
+}
+
+LOWER_IS_BETTER = (
+    "startup_ms",
+    "frame_ms.p50",
+    "frame_ms.p95",
+    "frame_ms.p99",
+    "draw_calls",
+    "triangles",
+    "gl_objects.buffers",
+    "gl_objects.vertex_arrays",
+    "gl_objects.programs",
+    "gl_objects.textures",
+    "peak_rss_mb",
+)
+
+
+def run_scene(name, count, frames, warmup, width, height):
+    """
+    Build one scene and render it for a fixed number of frames.
+
+    Args:
+        name (str): Key of SCENES
+        count (int): Number of objects, None for the scene's default
+        frames (int): Frames measured
+        warmup (int): Frames rendered before measuring
+        width (int): Framebuffer width in pixels
+        height (int): Framebuffer height in pixels
+
+    Returns:
+        dict: Metrics of the scene
+    """
+    build, default_count, prepare = SCENES[name]
+    count = default_count if count is None else count
+
+    engine = common.create_hidden_engine(width, height, frame_pacing="unlimited")
+
+    from Scene import Scene
+    from Profiler import profiler
+
+    with tempfile.TemporaryDirectory() as texture_dir:
+        if prepare is not None:
+            prepare(count, texture_dir)
+        start = time.perf_counter()
+        engine.scene.cleanup()
+        engine.scene = Scene()
+        drawables = build(count, texture_dir)
+        for i, drawable in enumerate(drawables):
+            engine.scene.add(f"object_{i}", drawable)
+        glFinish()
+        startup_ms = (engine.startup_time + time.perf_counter() - start) * 1e3
+
+    camera = glm.vec3(0.0, 0.0, 12.0)
+    view = glm.lookAt(camera, glm.vec3(0.0), glm.vec3(0.0, 1.0, 0.0))
+    engine.frame_data.update(engine.projection_matrix, view, camera, [2.0, 2.0, 2.0])
+    view_projection = engine.projection_matrix * view
+
+    report = {"scene": name, "count": count, "startup_ms": startup_ms}
+    if frames > 0 and build is not startup:
+        frame_times = []
+        for frame in range(warmup + frames):
+            profiler.begin_frame()
+            start = time.perf_counter()
+            angle = frame * 2.0 % 360.0
+            for drawable in drawables:
+                drawable.set_euler(0.0, angle, 0.0)
+            glViewport(0, 0, width, height)
+            glClear(GL_COLOR_BUFFER_BIT | GL_DEPTH_BUFFER_BIT)
+            engine.scene.draw(view_projection, camera)
+            engine.window.swap_buffers()
+            glFinish()
+            frame_times.append(time.perf_counter() - start)
+            profiler.end_frame()
+
+        frame_ms = np.array(frame_times[warmup:]) * 1e3
+        p50, p95, p99 = np.percentile(frame_ms, [50, 95, 99])
+        counters = profiler.stats()["counters"]
+        report.update(
+            frames=frames,
+            frame_ms={"mean": float(frame_ms.mean()), "p50": float(p50), "p95": float(p95),
+                      "p99": float(p99), "max": float(frame_ms.max())},
+            draw_calls=counters["draws"]["mean"] if "draws" in counters else 0.0,
+            triangles=counters["triangles"]["mean"] if "triangles" in counters else 0.0,
+        )
+
+    report["gl_objects"] = common.count_gl_objects()
+    report["renderer"] = glGetString(GL_RENDERER).decode()
+    engine.terminate()
+    # ru_maxrss is in kilobytes on Linux and in bytes on macOS.
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    report["peak_rss_mb"] = rss / (1 << 20) if sys.platform == "darwin" else rss / (1 << 10)
+    return report
+
+
+def run_child(args, name):
+    """
+    Run one scene in a fresh process.
+
+    Args:
+        args (argparse.Namespace): Suite arguments
+        name (str): Key of SCENES
+
+    Returns:
+        dict: Metrics of the scene
+    """
+    command = [
+        sys.executable, os.path.abspath(__file__), "--child", name,
+        "--frames", str(args.frames), "--warmup", str(args.warmup),
+        "--width", str(args.width), "--height", str(args.height),
+    ]
+    if args.count is not None:
+        command += ["--count", str(args.count)]
+    output = subprocess.run(command, check=True, capture_output=True, text=True).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def metric(report, path):
+    """Look up a dotted metric path such as "frame_ms.p95"; None if missing."""
+    value = report
+    for key in path.split("."):
+        if not isinstance(value, dict) or key not in value:
+            return None
+        value = value[key]
+    return value
+
+
+def compare(results, baseline, threshold):
+    """
+    Find the metrics that got worse than in a baseline report.
+
+    Times and memory may vary by the relative threshold; counts of draw
+    calls, triangles and GL objects must not grow at all.
+
+    Args:
+        results (dict): Report of this run
+        baseline (dict): Report of an earlier run
+        threshold (float): Allowed relative increase of times and memory
+
+    Returns:
+        list: (scene, metric, baseline value, new value) of every regression
+    """
+    regressions = []
+    for name, report in results["scenes"].items():
+        base = baseline["scenes"].get(name)
+        if base is None:
+            continue
+        for path in LOWER_IS_BETTER:
+            old, new = metric(base, path), metric(report, path)
+            if old is None or new is None:
+                continue
+            exact = path.startswith(("draw_calls", "triangles", "gl_objects"))
+            limit = old if exact else old * (1.0 + threshold)
+            if new > limit:
+                regressions.append((name, path, old, new))
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scene", action="append", choices=sorted(SCENES),
+                        help="scene to run, may be repeated; all scenes by default")
+    parser.add_argument("--count", type=int, help="objects per scene instead of the scene's default")
+    parser.add_argument("--frames", type=int, default=300)
+    parser.add_argument("--warmup", type=int, default=30)
+    parser.add_argument("--width", type=int, default=640)
+    parser.add_argument("--height", type=int, default=480)
+    parser.add_argument("--headless", action="store_true", help="render offscreen without a display")
+    parser.add_argument("--software", action="store_true", help="force Mesa's llvmpipe renderer")
+    parser.add_argument("--output", help="write the JSON report to this file")
+    parser.add_argument("--compare", metavar="BASELINE", help="flag regressions against a saved report")
+    parser.add_argument("--threshold", type=float, default=0.10,
+                        help="allowed relative increase of times and memory")
+    parser.add_argument("--child", metavar="SCENE", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        print(json.dumps(run_scene(args.child, args.count, args.frames, args.warmup, args.width, args.height)))
+        return 0
+
+    if args.software:
+        os.environ["LIBGL_ALWAYS_SOFTWARE"] = "1"
+        os.environ["GALLIUM_DRIVER"] = "llvmpipe"
+
+    results = {
+        "headless": common.HEADLESS,
+        "platform": platform.platform(),
+        "python": platform.python_version(),
+        "frames": args.frames,
+        "scenes": {},
+    }
+    for name in args.scene or list(SCENES):
+        report = run_child(args, name)
+        results["scenes"][name] = report
+        line = f"{name:>16}: startup {report['startup_ms']:8.1f} ms"
+        if "frame_ms" in report:
+            frame_ms = report["frame_ms"]
+            line += (f", frame p50 {frame_ms['p50']:7.2f} p99 {frame_ms['p99']:7.2f} ms"
+                     f", {report['draw_calls']:6.0f} draws")
+        print(line + f", {report['peak_rss_mb']:7.1f} MB")
+    results["renderer"] = next(iter(results["scenes"].values()))["renderer"]
+
+    report = json.dumps(results, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as file:
+            file.write(report + "\n")
+    else:
+        print(report)
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as file:
+            baseline = json.load(file)
+        if baseline.get("renderer") != results["renderer"]:
+            print(f"warning: baseline was measured on '{baseline.get('renderer')}'")
+        regressions = compare(results, baseline, args.threshold)
+        for name, path, old, new in regressions:
+            print(f"REGRESSION {name} {path}: {old:.3f} -> {new:.3f} ({(new / old - 1) * 100 if old else float('inf'):+.1f}%)")
+        if regressions:
+            return 1
+        print("no regressions")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
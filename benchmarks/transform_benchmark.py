@@ -0,0 +1,137 @@
+"""
+Batched transform benchmark.
+
+Moves N objects and computes their model, normal and MVP matrices once
+with the per-object PyGLM path (TransformableObject) and once with the
+structure-of-arrays TransformStore, after checking that both produce the
+same matrices. No OpenGL context is needed.
+
+The PyGLM path keeps one Python object per transform, so by default it is
+only measured up to --glm-limit objects.
+
+Example:
+    $ python benchmarks/transform_benchmark.py --counts 1000 10000 100000 1000000
+"""
+
+import argparse
+import sys
+
+import common
+import glm
+import numpy as np
+from TransformStore import TransformStore, euler_quats
+from objects.SceneNode import SceneNode
+
+
+def random_transforms(count, seed=0):
+    """
+    Generate random transform components.
+
+    Args:
+        count (int): Number of transforms
+        seed (int): Random seed
+
+    Returns:
+        tuple: (count, 3) positions, Euler angles in degrees and scales
+    """
+    rng = np.random.default_rng(seed)
+    positions = rng.uniform(-50.0, 50.0, (count, 3)).astype(np.float32)
+    angles = rng.uniform(-180.0, 180.0, (count, 3)).astype(np.float32)
+    scales = rng.uniform(0.5, 2.0, (count, 3)).astype(np.float32)
+    return positions, angles, scales
+
+
+def glm_frame(nodes, positions, view_projection, frame):
+    """Move every node and compute its MVP and normal matrix with PyGLM."""
+    for node, position in zip(nodes, positions):
+        node.set_position(position[0] + frame, position[1], position[2])
+        node.mvp(view_projection, frame)
+        node.normal_matrix()
+
+
+def store_frame(store, positions, view_projection, frame):
+    """Move every transform and compute all matrices in one batch."""
+    moved = positions.copy()
+    moved[:, 0] += frame
+    store.update(slice(None), positions=moved)
+    store.compute(view_projection, frame)
+
+
+def check_equal(store, nodes, view_projection):
+    """
+    Compare the matrices of both paths.
+
+    Returns:
+        bool: True if model, normal and MVP matrices match
+    """
+    models, normals, mvps = store.compute(view_projection, "check")
+    for i, node in enumerate(nodes):
+        # np.asarray() indexes glm matrices [row][column]; the store holds
+        # them column by column, so compare against the transposes.
+        expected = (
+            np.asarray(node.trans).T,
+            np.asarray(node.normal_matrix()).T,
+            np.asarray(node.mvp(view_projection, "check")).T,
+        )
+        for actual, wanted in zip((models[i], normals[i], mvps[i]), expected):
+            if not np.allclose(actual, wanted, rtol=1e-4, atol=1e-3):
+                return False
+    return True
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--counts", type=int, nargs="+", default=[1000, 10000, 100000, 1000000])
+    parser.add_argument("--glm-limit", type=int, default=100000,
+                        help="largest N measured with the PyGLM path")
+    parser.add_argument("--frames", type=int, default=5)
+    args = parser.parse_args()
+
+    projection = glm.perspective(glm.radians(60.0), 16 / 10, 0.1, 1000.0)
+    view = glm.lookAt(glm.vec3(0, 0, 100), glm.vec3(0), glm.vec3(0, 1, 0))
+    view_projection = projection * view
+
+    failed = False
+    print(f"{'N':>9} {'PyGLM ms':>10} {'store ms':>10} {'speedup':>8}")
+    for count in args.counts:
+        positions, angles, scales = random_transforms(count)
+
+        store = TransformStore(count)
+        store.add(positions, euler_quats(angles), scales)
+        store_time = min(
+            common.time_call(store_frame, store, positions, view_projection, frame)
+            for frame in range(1, args.frames + 1)
+        )
+
+        glm_time = None
+        if count <= args.glm_limit:
+            nodes = []
+            for position, angle, scale in zip(positions.tolist(), angles.tolist(), scales.tolist()):
+                node = SceneNode()
+                node.set_position(*position)
+                node.set_euler(*angle)
+                node.set_scale(glm.vec3(scale))
+                nodes.append(node)
+            glm_time = min(
+                common.time_call(glm_frame, nodes, positions.tolist(), view_projection, frame)
+                for frame in range(1, args.frames + 1)
+            )
+            sample = min(count, 1000)
+            store.update(slice(None), positions=positions)
+            for node, position in zip(nodes[:sample], positions.tolist()):
+                node.set_position(*position)
+            if not check_equal(store, nodes[:sample], view_projection):
+                print(f"FAIL: matrices differ at N={count}")
+                failed = True
+            nodes.clear()
+
+        if glm_time is None:
+            print(f"{count:>9} {'skipped':>10} {store_time * 1e3:10.2f} {'':>8}")
+        else:
+            print(f"{count:>9} {glm_time * 1e3:10.2f} {store_time * 1e3:10.2f} {glm_time / store_time:7.1f}x")
+
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
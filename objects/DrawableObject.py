@@ -1,6 +1,8 @@
 import numpy as np
 from objects.GameObject import *
 import glm
+from Shader import Shader
+from objects.Mesh import Mesh, mesh_cache
 
 
 """
@@ -8,17 +10,29 @@ A base class for objects that can be rendered in OpenGL.
 
 Provides basic functionality for shader compilation, buffer setup, and drawing.
 
+Geometry is uploaded through the mesh cache: objects whose class or instance
+sets a mesh_key share one set of GPU buffers, other objects get a private mesh.
+
 Attributes:
     vertices (numpy.ndarray): Vertex data for the object
     vertex_shader_source (str): Source code for vertex shader
     fragment_shader_source (str): Source code for fragment shader
     draw_mode (int): OpenGL drawing mode (e.g., GL_TRIANGLES)
+    vertex_layout (tuple): Floats per vertex attribute, position first
+    mesh_key: Geometry identity shared between instances, None if unique
+    mesh (Mesh): GPU buffers of the object's geometry
     VAO (int): Vertex Array Object ID
     VBO (int): Vertex Buffer Object ID
-    shader_program (int): Compiled shader program ID
+    shader (Shader): Shader program with cached uniform locations
+    shader_program (int): Shared shader program ID from the shader cache
+    texture (int): Texture bound to unit 0 while drawing, None if untextured
 """
 
 class DrawableObject:
+    vertex_layout = (3,)
+    mesh_key = None
+    texture = None
+
     def __init__(
         self,
         vertices,
@@ -40,111 +54,86 @@ class DrawableObject:
         self.fragment_shader_source = fragment_shader_source
         self.draw_mode = draw_mode
 
-        self.VAO = glGenVertexArrays(1)
-        self.VBO = glGenBuffers(1)
-        self.shader_program = self._create_shader_program()
-
-        self._setup_buffers()
-
-    def _setup_buffers(self):
-        """
-        Set up vertex buffer objects and attributes.
-
-        Configures vertex attributes for:
-        - Position (layout 0)
-        - Color/Normal (layout 1)
-        """
-        glBindVertexArray(self.VAO)
-
-        glBindBuffer(GL_ARRAY_BUFFER, self.VBO)
-        glBufferData(
-            GL_ARRAY_BUFFER, self.vertices.nbytes, self.vertices, GL_STATIC_DRAW
-        )
-        glVertexAttribPointer(0, 3, GL_FLOAT, GL_FALSE, 6 * np.dtype(np.float32).itemsize, ctypes.c_void_p(0))
-        glEnableVertexAttribArray(0)
-
-        glVertexAttribPointer(1, 3, GL_FLOAT, GL_FALSE, 6 * np.dtype(np.float32).itemsize, ctypes.c_void_p(3 * np.dtype(np.float32).itemsize))
-        glEnableVertexAttribArray(1)
-
-        glBindVertexArray(0)
+        self.mesh = mesh_cache.acquire(self.mesh_key, self._create_mesh)
+        self.VAO = self.mesh.VAO
+        self.VBO = self.mesh.VBO
+        self.shader = Shader(vertex_shader_source, fragment_shader_source)
+        self.shader_program = self.shader.program_id
 
-    def _compile_shader(self, shader_type, source):
+    def _create_mesh(self, key):
         """
-        Compile a shader from source.
+        Upload this object's geometry when no shared mesh exists yet.
 
         Args:
-            shader_type (int): GL_VERTEX_SHADER or GL_FRAGMENT_SHADER
-            source (str): Shader source code
+            key: Geometry identity the mesh is cached under
 
         Returns:
-            int: Compiled shader ID
-
-        Raises:
-            Exception: If shader compilation fails
+            Mesh: Mesh holding the object's vertices and indices
         """
-        shader = glCreateShader(shader_type)
-        glShaderSource(shader, source)
-        glCompileShader(shader)
-
-        if not glGetShaderiv(shader, GL_COMPILE_STATUS):
-            error_log = glGetShaderInfoLog(shader)
-            raise Exception(f"Shader compilation failed : {error_log.decode()}")
-
-        return shader
+        return Mesh(key, self.vertices, getattr(self, "indices", None), self.vertex_layout)
 
-    def _create_shader_program(self):
+    def _set_transform_uniforms(self):
         """
-        Create and link shader program.
+        Upload the world and normal matrices of the object.
 
-        Returns:
-            int: Linked shader program ID
-
-        Raises:
-            Exception: If program linking fails
+        The normal matrix is computed once per object on the CPU instead of
+        once per vertex in the vertex shader.
         """
-        vertex_shader = self._compile_shader(
-            GL_VERTEX_SHADER, self.vertex_shader_source
-        )
-        fragment_shader = self._compile_shader(
-            GL_FRAGMENT_SHADER, self.fragment_shader_source
-        )
-
-        program = glCreateProgram()
-        glAttachShader(program, vertex_shader)
-        glAttachShader(program, fragment_shader)
-        glLinkProgram(program)
+        self.shader.set_mat4("model", self.world_matrix)
+        self.shader.set_mat3("normalMatrix", self.world_normal_matrix())
 
-        if not glGetProgramiv(program, GL_LINK_STATUS):
-            error_log = glGetProgramInfoLog(program)
-            raise Exception(f"Shader program linking failed : {error_log.decode()}")
+    def set_uniforms(self):
+        """
+        Upload the per-object uniforms, with the object's program in use.
 
-        glDeleteShader(vertex_shader)
-        glDeleteShader(fragment_shader)
+        Subclasses add their material uniforms here.
+        """
+        self._set_transform_uniforms()
 
-        return program
+    def triangle_count(self):
+        """
+        Count the triangles one draw of the object rasterizes.
 
-    def draw(self, projection_matrix, view):
+        Returns:
+            int: Number of triangles, 0 for lines and points
+        """
+        mesh = self.mesh
+        if mesh is None:
+            return 0
+        count = mesh.index_count if mesh.EBO is not None else mesh.vertex_count
+        if self.draw_mode == GL_TRIANGLES:
+            return count // 3
+        if self.draw_mode in (GL_TRIANGLE_STRIP, GL_TRIANGLE_FAN):
+            return max(count - 2, 0)
+        return 0
+
+    def draw_call(self):
+        """Issue the draw call, with the object's program and VAO bound."""
+        if self.mesh.EBO is not None:
+            glDrawElements(self.draw_mode, self.mesh.index_count, GL_UNSIGNED_INT, None)
+        else:
+            glDrawArrays(self.draw_mode, 0, self.mesh.vertex_count)
+
+    def draw(self):
         """
         Draw the object.
 
-        Args:
-            projection_matrix (glm.mat4): Camera projection matrix
-            view (glm.mat4): Camera view matrix
+        The view and projection are read from the FrameData uniform block.
         """
-        glUseProgram(self.shader_program)
-        light_pos_location = glGetUniformLocation(self.shader_program, "lightPos")
-        light_pos = [1.0, 1.0, 1.0]
-        glUniform3f(light_pos_location, *light_pos)
-        MVP = projection_matrix * view * self.trans
-        mvp_location = glGetUniformLocation(self.shader_program, "MVP")
-        glUniformMatrix4fv(mvp_location, 1, GL_FALSE, glm.value_ptr(MVP))
+        self.shader.use()
+        if self.texture is not None:
+            glActiveTexture(GL_TEXTURE0)
+            glBindTexture(GL_TEXTURE_2D, self.texture)
+        self.set_uniforms()
         glBindVertexArray(self.VAO)
-        glDrawArrays(self.draw_mode, 0, len(self.vertices) // 3)
+        self.draw_call()
 
         glBindVertexArray(0)
 
     def __del__(self):
-        """Clean up OpenGL resources on deletion."""
-        glDeleteBuffers(1, [self.VBO])
-        glDeleteVertexArrays(1, [self.VAO])
-        glDeleteProgram(self.shader_program)
+        """Release the shared mesh on deletion."""
+        # Not set if creating the shader or the mesh failed in __init__.
+        mesh = getattr(self, "mesh", None)
+        if mesh is None:
+            return
+        mesh_cache.release(mesh)
@@ -0,0 +1,124 @@
+import numpy as np
+from OpenGL.GL import *
+import glm
+import ctypes
+from Shader import Shader
+from StreamingBuffer import StreamingBuffer
+from objects.TransformableObject import *
+from objects.DrawableObject import *
+
+"""
+A class for shapes whose vertices change every frame.
+
+Line strips, point sets and debug shapes that are rebuilt every frame would
+otherwise need a new DrawableObject, with freshly allocated static buffers,
+each time. A DynamicShape keeps one vertex array pointing at a
+StreamingBuffer and draws the vertices written in the current frame with a
+first-vertex offset, so updating it allocates nothing.
+"""
+
+
+class DynamicShape(TransformableObject, DrawableObject):
+    """
+    A shape drawn from vertices streamed to the GPU every frame.
+
+    A shape can share a StreamingBuffer with other dynamic shapes, in which
+    case the owner of the buffer calls its begin_frame() and end_frame().
+    Otherwise the shape gets a buffer of its own and advances it on every
+    set_vertices() and draw.
+
+    Dynamic shapes have no fixed bounds, so they are never frustum culled
+    or picked.
+
+    Attributes:
+        stream (StreamingBuffer): Buffer the vertices are written to
+        draw_mode (int): OpenGL drawing mode (e.g. GL_LINE_STRIP)
+        vertex_layout (tuple): Floats per vertex attribute, position first
+        vertex_count (int): Number of vertices written for the current frame
+        first (int): Index of the first of them in the buffer
+        VAO (int): Vertex Array Object reading from the stream
+    """
+
+    mesh = None
+
+    def __init__(
+        self,
+        vertex_shader_source,
+        fragment_shader_source,
+        draw_mode=GL_LINE_STRIP,
+        vertex_layout=(3,),
+        stream=None,
+        max_vertices=4096,
+    ):
+        """
+        Initialize a dynamic shape.
+
+        Args:
+            vertex_shader_source (str): Source code for vertex shader
+            fragment_shader_source (str): Source code for fragment shader
+            draw_mode (int): OpenGL drawing mode, defaults to GL_LINE_STRIP
+            vertex_layout (tuple): Floats per vertex attribute
+            stream (StreamingBuffer, optional): Shared vertex stream; a
+                private one is created if None
+            max_vertices (int): Vertices per frame of the private stream
+        """
+        TransformableObject.__init__(self)
+        self.vertex_shader_source = vertex_shader_source
+        self.fragment_shader_source = fragment_shader_source
+        self.draw_mode = draw_mode
+        self.vertex_layout = tuple(vertex_layout)
+        self.stride = sum(self.vertex_layout) * np.dtype(np.float32).itemsize
+        self._owns_stream = stream is None
+        self.stream = StreamingBuffer(max_vertices * self.stride) if stream is None else stream
+        self.vertex_count = 0
+        self.first = 0
+        self.shader = Shader(vertex_shader_source, fragment_shader_source)
+        self.shader_program = self.shader.program_id
+
+        self.VAO = glGenVertexArrays(1)
+        self._setup_vertex_array()
+
+    def _setup_vertex_array(self):
+        """Point the vertex attributes at the start of the stream."""
+        glBindVertexArray(self.VAO)
+        glBindBuffer(GL_ARRAY_BUFFER, self.stream.buffer)
+        item_size = np.dtype(np.float32).itemsize
+        offset = 0
+        for location, size in enumerate(self.vertex_layout):
+            glVertexAttribPointer(
+                location, size, GL_FLOAT, GL_FALSE,
+                self.stride, ctypes.c_void_p(offset * item_size)
+            )
+            glEnableVertexAttribArray(location)
+            offset += size
+        glBindVertexArray(0)
+        glBindBuffer(GL_ARRAY_BUFFER, 0)
+
+    def set_vertices(self, vertices):
+        """
+        Replace the vertices drawn this frame.
+
+        The data is aligned to whole vertices in the stream, so the vertex
+        array never has to be re-pointed.
+
+        Args:
+            vertices (numpy.ndarray): float32 vertex data in vertex_layout
+        """
+        vertices = np.ascontiguousarray(vertices, dtype=np.float32)
+        if self._owns_stream:
+            self.stream.begin_frame()
+        offset = self.stream.write(vertices, alignment=self.stride)
+        self.first = offset // self.stride
+        self.vertex_count = vertices.nbytes // self.stride
+
+    def draw_call(self):
+        """Draw this frame's vertices, with the program and VAO bound."""
+        if self.vertex_count == 0:
+            return
+        glDrawArrays(self.draw_mode, self.first, self.vertex_count)
+        if self._owns_stream:
+            self.stream.end_frame()
+
+    def __del__(self):
+        """Clean up OpenGL resources."""
+        glDeleteVertexArrays(1, [self.VAO])
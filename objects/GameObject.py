@@ -41,6 +41,6 @@ class OpenGLObject(ShapeObject, UpdataleObject):
             vertices,
             vertex_shader_source,
             fragment_shader_source,
-            draw_mode=GL_TRIANGLES,
+            draw_mode=draw_mode,
         )
         UpdataleObject.__init__(self)
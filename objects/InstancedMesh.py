@@ -0,0 +1,219 @@
+import numpy as np
+from OpenGL.GL import *
+import glm
+import ctypes
+from Shader import Shader
+from Profiler import profiler
+
+"""
+A class for drawing thousands of copies of a mesh with a single draw call.
+
+The geometry comes from a template object (a Cube, TexturedCube,
+TexturedSphere or any other drawable) whose shared mesh buffers are reused.
+Per-instance model matrices and colors are stored in instance attribute
+buffers and the whole set is drawn with one glDrawElementsInstanced call.
+
+Attributes:
+    INSTANCE_MODEL_LOCATION (int): First attribute location of the model matrix
+    INSTANCE_COLOR_LOCATION (int): Attribute location of the instance color
+    INSTANCE_NORMAL_LOCATION (int): First attribute location of the normal matrix
+    DEFAULT_COLOR (tuple): Instance color used when no colors are given
+"""
+
+INSTANCE_MODEL_LOCATION = 3
+INSTANCE_COLOR_LOCATION = 7
+INSTANCE_NORMAL_LOCATION = 8
+DEFAULT_COLOR = (1.0, 1.0, 1.0)
+
+
+class InstancedMesh:
+    """
+    Many copies of a template object's geometry drawn in one call.
+
+    Attributes:
+        template (DrawableObject): Object providing the mesh and texture
+        mesh (Mesh): Shared geometry of the template
+        shader (Shader): Instanced shader program
+        count (int): Number of instances drawn
+        VAO (int): Vertex Array Object combining mesh and instance attributes
+        model_buffer (int): Buffer of per-instance model matrices
+        color_buffer (int): Buffer of per-instance colors
+        normal_buffer (int): Buffer of per-instance normal matrices
+    """
+
+    def __init__(self, template, vertex_shader_source, fragment_shader_source, matrices=None, colors=None):
+        """
+        Initialize an instanced mesh.
+
+        Args:
+            template (DrawableObject): Object whose geometry (and texture) is instanced
+            vertex_shader_source (str): Source code of an instanced vertex shader
+            fragment_shader_source (str): Source code for fragment shader,
+                compiled with the INSTANCED define
+            matrices (numpy.ndarray, optional): (N, 4, 4) model matrices
+            colors (numpy.ndarray, optional): (N, 3) per-instance RGB colors
+        """
+        self.template = template
+        self.mesh = template.mesh
+        self.shader = Shader(vertex_shader_source, fragment_shader_source, {"INSTANCED": None})
+        self.count = 0
+        self._capacity = {}
+
+        self.VAO = glGenVertexArrays(1)
+        self.model_buffer = glGenBuffers(1)
+        self.color_buffer = glGenBuffers(1)
+        self.normal_buffer = glGenBuffers(1)
+        self._setup_buffers()
+
+        if matrices is not None:
+            self.set_instances(matrices, colors)
+
+    def _setup_buffers(self):
+        """
+        Set up the vertex array object.
+
+        Mesh attributes keep their locations; the model matrix takes four
+        vec4 locations starting at INSTANCE_MODEL_LOCATION, the color uses
+        INSTANCE_COLOR_LOCATION and the normal matrix takes three vec3
+        locations starting at INSTANCE_NORMAL_LOCATION, all advancing once
+        per instance.
+        """
+        glBindVertexArray(self.VAO)
+        self.mesh.bind_attributes()
+        if self.mesh.EBO is not None:
+            glBindBuffer(GL_ELEMENT_ARRAY_BUFFER, self.mesh.EBO)
+
+        item_size = np.dtype(np.float32).itemsize
+        glBindBuffer(GL_ARRAY_BUFFER, self.model_buffer)
+        for column in range(4):
+            location = INSTANCE_MODEL_LOCATION + column
+            glVertexAttribPointer(
+                location, 4, GL_FLOAT, GL_FALSE,
+                16 * item_size, ctypes.c_void_p(4 * column * item_size)
+            )
+            glEnableVertexAttribArray(location)
+            glVertexAttribDivisor(location, 1)
+
+        glBindBuffer(GL_ARRAY_BUFFER, self.color_buffer)
+        glVertexAttribPointer(INSTANCE_COLOR_LOCATION, 3, GL_FLOAT, GL_FALSE, 3 * item_size, ctypes.c_void_p(0))
+        glEnableVertexAttribArray(INSTANCE_COLOR_LOCATION)
+        glVertexAttribDivisor(INSTANCE_COLOR_LOCATION, 1)
+
+        glBindBuffer(GL_ARRAY_BUFFER, self.normal_buffer)
+        for column in range(3):
+            location = INSTANCE_NORMAL_LOCATION + column
+            glVertexAttribPointer(
+                location, 3, GL_FLOAT, GL_FALSE,
+                9 * item_size, ctypes.c_void_p(3 * column * item_size)
+            )
+            glEnableVertexAttribArray(location)
+            glVertexAttribDivisor(location, 1)
+
+        glBindVertexArray(0)
+        glBindBuffer(GL_ARRAY_BUFFER, 0)
+
+    def _upload(self, buffer, data):
+        """
+        Upload instance data, growing the buffer only when it is too small.
+
+        Args:
+            buffer (int): Instance buffer ID
+            data (numpy.ndarray): Contiguous float32 data
+        """
+        glBindBuffer(GL_ARRAY_BUFFER, buffer)
+        if data.nbytes > self._capacity.get(buffer, 0):
+            glBufferData(GL_ARRAY_BUFFER, data.nbytes, data, GL_DYNAMIC_DRAW)
+            self._capacity[buffer] = data.nbytes
+        else:
+            glBufferSubData(GL_ARRAY_BUFFER, 0, data.nbytes, data)
+        glBindBuffer(GL_ARRAY_BUFFER, 0)
+        profiler.count("uploaded_bytes", data.nbytes)
+
+    def set_instances(self, matrices, colors=None, column_major=False, uniform_scale=False, normal_matrices=None):
+        """
+        Replace the instance transforms and colors.
+
+        Normal matrices are computed here once per instance, in one batched
+        operation, unless they are passed in.
+
+        Args:
+            matrices (numpy.ndarray): (N, 4, 4) model matrices, row-major as
+                usual for NumPy (translation in [:, :3, 3])
+            colors (numpy.ndarray, optional): (N, 3) RGB colors, DEFAULT_COLOR if None
+            column_major (bool): Matrices are already stored column by column,
+                as OpenGL expects, and are uploaded without transposing
+            uniform_scale (bool): All instances are only rotated, translated
+                and uniformly scaled, so the upper 3x3 of the model matrix can
+                be used as normal matrix without inverting it
+            normal_matrices (numpy.ndarray, optional): (N, 3, 3) precomputed
+                normal matrices, in the same layout as matrices
+        """
+        matrices = np.asarray(matrices, dtype=np.float32).reshape(-1, 4, 4)
+        gl_matrices = matrices if column_major else matrices.transpose(0, 2, 1)
+        self.count = len(matrices)
+        self._upload(self.model_buffer, np.ascontiguousarray(gl_matrices))
+
+        if normal_matrices is not None:
+            normal_matrices = np.asarray(normal_matrices, dtype=np.float32).reshape(-1, 3, 3)
+            gl_normals = normal_matrices if column_major else normal_matrices.transpose(0, 2, 1)
+        else:
+            # gl_matrices[:, :3, :3] is the transposed upper 3x3; the transpose
+            # of the inverse transpose is the plain inverse.
+            upper = gl_matrices[:, :3, :3].transpose(0, 2, 1)
+            gl_normals = gl_matrices[:, :3, :3] if uniform_scale else np.linalg.inv(upper)
+        self._upload(self.normal_buffer, np.ascontiguousarray(gl_normals, dtype=np.float32))
+
+        if colors is None:
+            colors = np.broadcast_to(np.array(DEFAULT_COLOR, dtype=np.float32), (self.count, 3))
+        self.set_colors(colors)
+
+    def set_transform_store(self, store, colors=None):
+        """
+        Replace the instances with every transform of a TransformStore.
+
+        The store's batched, column-major model and normal matrices are
+        uploaded as they are.
+
+        Args:
+            store (TransformStore): Transforms of the instances
+            colors (numpy.ndarray, optional): (N, 3) RGB colors, DEFAULT_COLOR if None
+        """
+        models, normals, _ = store.compute()
+        self.set_instances(models, colors, column_major=True, normal_matrices=normals)
+
+    def set_colors(self, colors):
+        """
+        Replace the instance colors.
+
+        Args:
+            colors (numpy.ndarray): (N, 3) RGB colors
+        """
+        colors = np.ascontiguousarray(colors, dtype=np.float32).reshape(-1, 3)
+        self._upload(self.color_buffer, colors)
+
+    def draw(self):
+        """
+        Draw all instances with a single draw call.
+
+        Camera and light parameters are read from the FrameData uniform block.
+        """
+        if self.count == 0:
+            return
+
+        self.shader.use()
+        texture = getattr(self.template, "texture", None)
+        if texture is not None:
+            self.template.bitmap_handler.bind_texture(texture, GL_TEXTURE0)
+            self.shader.set_int("texture1", 0)
+
+        glBindVertexArray(self.VAO)
+        if self.mesh.EBO is not None:
+            glDrawElementsInstanced(GL_TRIANGLES, self.mesh.index_count, GL_UNSIGNED_INT, None, self.count)
+        else:
+            glDrawArraysInstanced(GL_TRIANGLES, 0, self.mesh.vertex_count, self.count)
+        glBindVertexArray(0)
+
+    def __del__(self):
+        """Clean up OpenGL resources."""
+        glDeleteBuffers(3, [self.model_buffer, self.color_buffer, self.normal_buffer])
+        glDeleteVertexArrays(1, [self.VAO])
@@ -0,0 +1,317 @@
+import numpy as np
+from OpenGL.GL import *
+import ctypes
+from SpatialIndex import BVH
+
+"""
+GPU geometry shared between drawable objects.
+
+A Mesh owns the VAO, VBO and optional EBO of one set of vertex data. The
+MeshCache hands out meshes by geometry identity (for example "cube" or
+("sphere", radius, sectors, stacks)), so identical geometry is uploaded once
+and every instance only keeps its own transform and material.
+
+Attributes:
+    LIST_MODES (dict): Maps drawing modes to the list mode drawing the same
+        primitives independently (strips, fans and loops to lists)
+    mesh_cache (MeshCache): Cache shared by all drawable objects
+"""
+
+LIST_MODES = {
+    GL_TRIANGLES: GL_TRIANGLES,
+    GL_TRIANGLE_STRIP: GL_TRIANGLES,
+    GL_TRIANGLE_FAN: GL_TRIANGLES,
+    GL_LINES: GL_LINES,
+    GL_LINE_STRIP: GL_LINES,
+    GL_LINE_LOOP: GL_LINES,
+    GL_POINTS: GL_POINTS,
+}
+
+
+def primitive_list(mode, order):
+    """
+    Split the vertices of a draw call into independent primitives.
+
+    Strips keep the winding OpenGL gives them, so every second triangle of
+    a triangle strip has its first two corners swapped.
+
+    Args:
+        mode (int): OpenGL drawing mode
+        order (numpy.ndarray): Vertex numbers in draw order
+
+    Returns:
+        numpy.ndarray: (P, k) vertex numbers of each primitive, to be drawn
+        with LIST_MODES[mode]; None for unsupported modes
+    """
+    count = len(order)
+    if mode == GL_TRIANGLES:
+        return order[:count // 3 * 3].reshape(-1, 3)
+    if mode == GL_TRIANGLE_STRIP:
+        first = np.arange(max(count - 2, 0))
+        corners = order[first[:, None] + np.arange(3)]
+        corners[1::2, :2] = corners[1::2, 1::-1]
+        return corners
+    if mode == GL_TRIANGLE_FAN:
+        first = np.arange(max(count - 2, 0))
+        return np.stack([np.full_like(first, order[0] if count else 0),
+                         order[first + 1], order[first + 2]], axis=1)
+    if mode == GL_LINES:
+        return order[:count // 2 * 2].reshape(-1, 2)
+    if mode == GL_LINE_STRIP:
+        first = np.arange(max(count - 1, 0))
+        return order[first[:, None] + np.arange(2)]
+    if mode == GL_LINE_LOOP:
+        if count < 2:
+            return order[:0].reshape(0, 2)
+        return np.stack([order, np.roll(order, -1)], axis=1)
+    if mode == GL_POINTS:
+        return order.reshape(-1, 1)
+    return None
+
+
+class Mesh:
+    """
+    Vertex and index buffers with their vertex array object.
+
+    Attributes:
+        key: Geometry identity the mesh is cached under
+        vertices (numpy.ndarray): Interleaved float32 vertex data
+        indices (numpy.ndarray): uint32 index data, None for non-indexed meshes
+        layout (tuple): Number of floats of each vertex attribute, in location order
+        stride (int): Number of floats per vertex
+        vertex_count (int): Number of vertices
+        index_count (int): Number of indices, 0 for non-indexed meshes
+        nbytes (int): GPU memory used by the buffers in bytes
+        center (numpy.ndarray): Center of the bounding sphere and box
+        radius (float): Radius of the bounding sphere
+        extent (numpy.ndarray): Half sizes of the axis-aligned bounding box
+        VAO (int): Vertex Array Object ID
+        VBO (int): Vertex Buffer Object ID
+        EBO (int): Element Buffer Object ID, None for non-indexed meshes
+    """
+
+    def __init__(self, key, vertices, indices=None, layout=(3,)):
+        """
+        Upload geometry to the GPU.
+
+        Args:
+            key: Geometry identity the mesh is cached under
+            vertices (numpy.ndarray): Interleaved float32 vertex data
+            indices (numpy.ndarray, optional): uint32 index data
+            layout (tuple): Number of floats of each vertex attribute
+        """
+        self.key = key
+        self.vertices = np.ascontiguousarray(vertices, dtype=np.float32)
+        self.indices = None if indices is None else np.ascontiguousarray(indices, dtype=np.uint32)
+        self.layout = tuple(layout)
+        self.stride = sum(self.layout)
+        self.vertex_count = len(self.vertices) // self.stride
+        self.index_count = 0 if self.indices is None else len(self.indices)
+        self.nbytes = self.vertices.nbytes + (0 if self.indices is None else self.indices.nbytes)
+        self._compute_bounds()
+        self._triangle_indices = {}
+
+        self.VAO = glGenVertexArrays(1)
+        self.VBO = glGenBuffers(1)
+        self.EBO = None if self.indices is None else glGenBuffers(1)
+
+        self._setup_buffers()
+
+    def _compute_bounds(self):
+        """
+        Compute the bounding box and sphere of the vertex positions.
+
+        Both volumes share the center of the box, so the sphere is not
+        minimal but is found in a single pass.
+        """
+        positions = self.positions().astype(np.float64)
+        if len(positions) == 0:
+            self.center = np.zeros(3)
+            self.extent = np.zeros(3)
+            self.radius = 0.0
+            return
+        low, high = positions.min(axis=0), positions.max(axis=0)
+        self.center = (low + high) / 2
+        self.extent = (high - low) / 2
+        self.radius = float(np.sqrt(((positions - self.center) ** 2).sum(axis=1).max()))
+
+    def _setup_buffers(self):
+        """Upload the buffers and record the vertex attributes in the VAO."""
+        glBindVertexArray(self.VAO)
+
+        glBindBuffer(GL_ARRAY_BUFFER, self.VBO)
+        glBufferData(GL_ARRAY_BUFFER, self.vertices.nbytes, self.vertices, GL_STATIC_DRAW)
+        self.bind_attributes()
+
+        if self.EBO is not None:
+            glBindBuffer(GL_ELEMENT_ARRAY_BUFFER, self.EBO)
+            glBufferData(GL_ELEMENT_ARRAY_BUFFER, self.indices.nbytes, self.indices, GL_STATIC_DRAW)
+
+        glBindVertexArray(0)
+        glBindBuffer(GL_ARRAY_BUFFER, 0)
+
+    def bind_attributes(self):
+        """
+        Point the vertex attributes of the bound VAO at this mesh's VBO.
+
+        Attribute i reads layout[i] floats, starting at location 0.
+        """
+        glBindBuffer(GL_ARRAY_BUFFER, self.VBO)
+        item_size = np.dtype(np.float32).itemsize
+        offset = 0
+        for location, size in enumerate(self.layout):
+            glVertexAttribPointer(
+                location, size, GL_FLOAT, GL_FALSE,
+                self.stride * item_size, ctypes.c_void_p(offset * item_size)
+            )
+            glEnableVertexAttribArray(location)
+            offset += size
+
+    def positions(self):
+        """
+        Get the vertex positions.
+
+        Returns:
+            numpy.ndarray: (vertex_count, 3) view of the vertex positions
+        """
+        return self.vertices.reshape(-1, self.stride)[:, :3]
+
+    def order(self):
+        """
+        Get the vertex numbers in the order the mesh is drawn.
+
+        Returns:
+            numpy.ndarray: int64 indices, or 0 to vertex_count - 1 for
+            non-indexed meshes
+        """
+        if self.indices is None:
+            return np.arange(self.vertex_count)
+        return self.indices.astype(np.int64)
+
+    def triangles(self, mode=GL_TRIANGLES):
+        """
+        Get the triangles the mesh is drawn as.
+
+        Args:
+            mode (int): GL_TRIANGLES, GL_TRIANGLE_STRIP or GL_TRIANGLE_FAN
+
+        Returns:
+            numpy.ndarray: (T, 3, 3) corner positions, None for other modes
+        """
+        entry = self.triangle_index(mode)
+        return None if entry is None else entry[0]
+
+    def triangle_index(self, mode=GL_TRIANGLES):
+        """
+        Get the triangles of the mesh with a BVH over them, built on first use.
+
+        Args:
+            mode (int): GL_TRIANGLES, GL_TRIANGLE_STRIP or GL_TRIANGLE_FAN
+
+        Returns:
+            tuple: (T, 3, 3) corner positions and a BVH over their boxes,
+            None for modes that draw no triangles
+        """
+        if mode in self._triangle_indices:
+            return self._triangle_indices[mode]
+
+        if LIST_MODES.get(mode) != GL_TRIANGLES:
+            self._triangle_indices[mode] = None
+            return None
+        corners = primitive_list(mode, self.order())
+
+        triangles = self.positions().astype(np.float64)[corners]
+        entry = (triangles, BVH(triangles.min(axis=1), triangles.max(axis=1)))
+        self._triangle_indices[mode] = entry
+        return entry
+
+    def delete(self):
+        """Free the GPU buffers."""
+        glDeleteBuffers(1, [self.VBO])
+        if self.EBO is not None:
+            glDeleteBuffers(1, [self.EBO])
+        glDeleteVertexArrays(1, [self.VAO])
+
+
+class MeshCache:
+    """
+    Hands out shared, reference-counted meshes by geometry identity.
+
+    Attributes:
+        meshes (dict): Maps geometry keys to meshes
+        references (dict): Maps geometry keys to their number of users
+    """
+
+    def __init__(self):
+        """Initialize an empty cache."""
+        self.meshes = {}
+        self.references = {}
+        self._private_count = 0
+
+    def acquire(self, key, create):
+        """
+        Get the mesh for a geometry key, creating it on first use.
+
+        Every call must be balanced by a call to release().
+
+        Args:
+            key: Hashable geometry identity, None for geometry that is never shared
+            create (callable): Called with the cache key to build the mesh
+
+        Returns:
+            Mesh: The shared mesh
+        """
+        if key is None:
+            self._private_count += 1
+            key = ("private", self._private_count)
+
+        mesh = self.meshes.get(key)
+        if mesh is None:
+            mesh = create(key)
+            self.meshes[key] = mesh
+            self.references[key] = 0
+        self.references[key] += 1
+        return mesh
+
+    def release(self, mesh):
+        """
+        Drop one reference to a mesh and free it when it is unused.
+
+        Args:
+            mesh (Mesh): Mesh returned by acquire()
+
+        Returns:
+            bool: True if the mesh was freed
+        """
+        key = mesh.key
+        if key not in self.references:
+            return False
+        self.references[key] -= 1
+        if self.references[key] > 0:
+            return False
+
+        del self.references[key]
+        del self.meshes[key]
+        mesh.delete()
+        return True
+
+    def memory_usage(self):
+        """
+        Get the GPU memory used by every cached mesh.
+
+        Returns:
+            dict: Maps geometry keys to buffer sizes in bytes
+        """
+        return {key: mesh.nbytes for key, mesh in self.meshes.items()}
+
+    def total_bytes(self):
+        """
+        Get the GPU memory used by all cached meshes.
+
+        Returns:
+            int: Total buffer size in bytes
+        """
+        return sum(mesh.nbytes for mesh in self.meshes.values())
+
+
+mesh_cache = MeshCache()
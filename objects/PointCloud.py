@@ -0,0 +1,236 @@
+import numpy as np
+from OpenGL.GL import *
+import glm
+import ctypes
+from Shader import Shader
+from Frustum import extract_planes, boxes_visible, world_bounds
+from objects.TransformableObject import *
+from objects.DrawableObject import *
+
+"""
+A class for rendering point clouds of millions of points.
+
+Positions, and optional colors and sizes, are uploaded in fixed-size
+chunks read one at a time from the source arrays, so clouds stored in
+np.memmap files (np.load(path, mmap_mode="r")) never have to fit in RAM.
+Each chunk keeps its bounding box and is drawn with its own GL_POINTS call.
+
+update_view(), which Scene.draw() calls every frame, culls the chunks
+against the camera frustum and decimates distant ones. Points are shuffled inside each chunk while uploading, so
+any prefix of a chunk is a uniform sample of it and decimation only draws
+fewer points of the same buffers.
+
+Attributes:
+    POINT_COLOR_LOCATION (int): Attribute location of the point colors
+    POINT_SIZE_LOCATION (int): Attribute location of the point sizes
+"""
+
+POINT_COLOR_LOCATION = 1
+POINT_SIZE_LOCATION = 2
+
+
+class PointCloud(TransformableObject, DrawableObject):
+    """
+    Points drawn from chunked GPU buffers.
+
+    The cloud is one scene object with a transform. It has no mesh, so the
+    scene never culls it as a whole; its chunks are culled in update_view().
+
+    Attributes:
+        count (int): Number of points
+        chunk_size (int): Points per chunk
+        chunk_starts (numpy.ndarray): First point of every chunk
+        chunk_counts (numpy.ndarray): Number of points of every chunk
+        chunk_min (numpy.ndarray): (C, 3) local lower corners of the chunks
+        chunk_max (numpy.ndarray): (C, 3) local upper corners of the chunks
+        point_size (float): Size in pixels of points without a size array
+        color (tuple): RGB color of points without a color array
+        lod_distance (float): Distance up to which chunks are drawn in full,
+            None to never decimate
+        min_fraction (float): Smallest fraction of a chunk drawn when decimating
+        drawn_points (int): Points drawn by the current view
+        VAO (int): Vertex Array Object
+        position_buffer (int): Buffer of the point positions
+        color_buffer (int): Buffer of the point colors, None without colors
+        size_buffer (int): Buffer of the point sizes, None without sizes
+    """
+
+    mesh = None
+    draw_mode = GL_POINTS
+
+    def __init__(
+        self,
+        positions,
+        vertex_shader_source,
+        fragment_shader_source,
+        colors=None,
+        sizes=None,
+        chunk_size=1 << 20,
+        point_size=2.0,
+        color=(1.0, 1.0, 1.0),
+        lod_distance=None,
+        min_fraction=0.05,
+        shuffle=True,
+    ):
+        """
+        Upload a point cloud.
+
+        Args:
+            positions (numpy.ndarray): (N, 3) positions, may be an np.memmap
+            vertex_shader_source (str): Source code of the point vertex shader
+            fragment_shader_source (str): Source code of the point fragment shader
+            colors (numpy.ndarray, optional): (N, 3) RGB colors, float or uint8
+            sizes (numpy.ndarray, optional): (N,) point sizes in pixels
+            chunk_size (int): Points per chunk and per draw call
+            point_size (float): Size in pixels of points without sizes
+            color (tuple): RGB color of points without colors
+            lod_distance (float, optional): Distance up to which chunks are
+                drawn in full; farther chunks are thinned by the square of
+                the distance ratio
+            min_fraction (float): Smallest fraction of a chunk drawn when decimating
+            shuffle (bool): Shuffle the points inside each chunk; needed for
+                decimation to keep a uniform sample
+        """
+        TransformableObject.__init__(self)
+        self.vertex_shader_source = vertex_shader_source
+        self.fragment_shader_source = fragment_shader_source
+        self.count = len(positions)
+        self.chunk_size = chunk_size
+        self.point_size = point_size
+        self.color = color
+        self.lod_distance = lod_distance
+        self.min_fraction = min_fraction
+
+        defines = {}
+        if colors is not None:
+            defines["POINT_COLORS"] = None
+        if sizes is not None:
+            defines["POINT_SIZES"] = None
+        self.shader = Shader(vertex_shader_source, fragment_shader_source, defines or None)
+        self.shader_program = self.shader.program_id
+
+        self.chunk_starts = np.arange(0, self.count, chunk_size, dtype=np.int64)
+        self.chunk_counts = np.minimum(chunk_size, self.count - self.chunk_starts)
+        self.chunk_min = np.zeros((len(self.chunk_starts), 3))
+        self.chunk_max = np.zeros((len(self.chunk_starts), 3))
+
+        self.VAO = glGenVertexArrays(1)
+        self.position_buffer = glGenBuffers(1)
+        self.color_buffer = None if colors is None else glGenBuffers(1)
+        self.size_buffer = None if sizes is None else glGenBuffers(1)
+        self._upload(positions, colors, sizes, shuffle)
+        self._draw_ranges = list(zip(self.chunk_starts.tolist(), self.chunk_counts.tolist()))
+        self.drawn_points = self.count
+
+    def _upload(self, positions, colors, sizes, shuffle):
+        """
+        Allocate the buffers and fill them chunk by chunk.
+
+        Only one chunk of each source array is read into memory at a time.
+
+        Args:
+            positions (numpy.ndarray): (N, 3) positions
+            colors (numpy.ndarray): (N, 3) colors or None
+            sizes (numpy.ndarray): (N,) sizes or None
+            shuffle (bool): Shuffle the points inside each chunk
+        """
+        if colors is not None:
+            colors = np.asarray(colors)
+        color_type = GL_UNSIGNED_BYTE if colors is not None and colors.dtype == np.uint8 else GL_FLOAT
+        color_dtype = np.uint8 if color_type == GL_UNSIGNED_BYTE else np.float32
+        streams = [(self.position_buffer, positions, np.float32, 3)]
+        if colors is not None:
+            streams.append((self.color_buffer, colors, color_dtype, 3))
+        if sizes is not None:
+            streams.append((self.size_buffer, sizes, np.float32, 1))
+
+        for buffer, _, dtype, width in streams:
+            glBindBuffer(GL_ARRAY_BUFFER, buffer)
+            glBufferData(GL_ARRAY_BUFFER, self.count * width * np.dtype(dtype).itemsize, None, GL_STATIC_DRAW)
+
+        rng = np.random.default_rng(0)
+        for chunk, (start, count) in enumerate(zip(self.chunk_starts.tolist(), self.chunk_counts.tolist())):
+            order = rng.permutation(count) if shuffle else slice(None)
+            for buffer, source, dtype, width in streams:
+                block = np.ascontiguousarray(source[start:start + count], dtype=dtype).reshape(count, width)[order]
+                item_size = width * np.dtype(dtype).itemsize
+                glBindBuffer(GL_ARRAY_BUFFER, buffer)
+                glBufferSubData(GL_ARRAY_BUFFER, start * item_size, block.nbytes, block)
+                if buffer == self.position_buffer:
+                    self.chunk_min[chunk] = block.min(axis=0)
+                    self.chunk_max[chunk] = block.max(axis=0)
+
+        glBindVertexArray(self.VAO)
+        glBindBuffer(GL_ARRAY_BUFFER, self.position_buffer)
+        glVertexAttribPointer(0, 3, GL_FLOAT, GL_FALSE, 0, ctypes.c_void_p(0))
+        glEnableVertexAttribArray(0)
+        if colors is not None:
+            glBindBuffer(GL_ARRAY_BUFFER, self.color_buffer)
+            normalized = GL_TRUE if color_type == GL_UNSIGNED_BYTE else GL_FALSE
+            glVertexAttribPointer(POINT_COLOR_LOCATION, 3, color_type, normalized, 0, ctypes.c_void_p(0))
+            glEnableVertexAttribArray(POINT_COLOR_LOCATION)
+        if sizes is not None:
+            glBindBuffer(GL_ARRAY_BUFFER, self.size_buffer)
+            glVertexAttribPointer(POINT_SIZE_LOCATION, 1, GL_FLOAT, GL_FALSE, 0, ctypes.c_void_p(0))
+            glEnableVertexAttribArray(POINT_SIZE_LOCATION)
+        glBindVertexArray(0)
+        glBindBuffer(GL_ARRAY_BUFFER, 0)
+
+    def update_view(self, view_projection, camera_position):
+        """
+        Choose the chunks and the number of their points to draw for a camera.
+
+        Chunks outside the frustum are skipped. With lod_distance set, a
+        chunk farther away than lod_distance draws a fraction
+        (lod_distance / distance) ** 2 of its points, which keeps the number
+        of points per pixel roughly constant.
+
+        Args:
+            view_projection (glm.mat4): Camera projection * view matrix
+            camera_position (glm.vec3): World-space camera position, None
+                to draw visible chunks in full
+
+        Returns:
+            int: Number of points that will be drawn
+        """
+        model = np.asarray(self.world_matrix, dtype=np.float64)
+        centers = (self.chunk_min + self.chunk_max) / 2
+        extents = (self.chunk_max - self.chunk_min) / 2
+        _, _, centers, extents = world_bounds(model, centers, 0.0, centers, extents)
+
+        visible = np.flatnonzero(boxes_visible(extract_planes(view_projection), centers, extents))
+        counts = self.chunk_counts[visible]
+        if self.lod_distance is not None and camera_position is not None:
+            camera = np.array(tuple(camera_position), dtype=np.float64)
+            distances = np.linalg.norm(centers[visible] - camera, axis=1)
+            distances -= np.linalg.norm(extents[visible], axis=1)
+            fractions = np.clip((self.lod_distance / np.maximum(distances, 1e-6)) ** 2, self.min_fraction, 1.0)
+            counts = np.maximum(np.ceil(counts * fractions).astype(np.int64), 1)
+
+        self._draw_ranges = list(zip(self.chunk_starts[visible].tolist(), counts.tolist()))
+        self.drawn_points = int(counts.sum())
+        return self.drawn_points
+
+    def set_uniforms(self):
+        """Upload the model matrix and the default point color and size."""
+        self.shader.set_mat4("model", self.world_matrix)
+        self.shader.set_vec3("pointColor", self.color)
+        self.shader.set_float("pointSize", self.point_size)
+
+    def draw_call(self):
+        """
+        Draw the selected chunks, one GL_POINTS call each.
+
+        Program point size is enabled only around these draws: other point
+        primitives use shaders that do not write gl_PointSize.
+        """
+        glEnable(GL_PROGRAM_POINT_SIZE)
+        for start, count in self._draw_ranges:
+            glDrawArrays(GL_POINTS, start, count)
+        glDisable(GL_PROGRAM_POINT_SIZE)
+
+    def __del__(self):
+        """Clean up OpenGL resources."""
+        buffers = [buffer for buffer in (self.position_buffer, self.color_buffer, self.size_buffer) if buffer]
+        glDeleteBuffers(len(buffers), buffers)
+        glDeleteVertexArrays(1, [self.VAO])
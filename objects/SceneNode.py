@@ -0,0 +1,30 @@
+from objects.TransformableObject import *
+
+"""
+A transform-only node of the scene hierarchy.
+
+Scene nodes carry no geometry. They group other objects so that moving,
+rotating or scaling the node moves the whole group.
+"""
+
+
+class SceneNode(TransformableObject):
+    """
+    An invisible node whose transform is applied to all of its children.
+
+    Attributes:
+        name (str): Optional name used for debugging
+    """
+
+    def __init__(self, name=None):
+        """
+        Initialize a scene node with an identity transform.
+
+        Args:
+            name (str, optional): Name used for debugging
+        """
+        super().__init__()
+        self.name = name
+
+    def __repr__(self):
+        return f"SceneNode({self.name!r})"
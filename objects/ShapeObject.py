@@ -40,5 +40,5 @@ class ShapeObject(TransformableObject, DrawableObject):
             vertices,
             vertex_shader_source,
             fragment_shader_source,
-            draw_mode=GL_TRIANGLES,
+            draw_mode=draw_mode,
         )
@@ -0,0 +1,185 @@
+import numpy as np
+from OpenGL.GL import *
+import glm
+from Shader import Shader
+from objects.TransformableObject import *
+from objects.DrawableObject import *
+from objects.Mesh import Mesh, LIST_MODES, primitive_list, mesh_cache
+
+"""
+A class for drawing many small static shapes with one draw call.
+
+Shapes such as triangle fans, strips, lines and points own a few vertices
+each, but every one of them costs a VAO bind, uniform uploads and a draw
+call. A StaticBatch takes shapes that share a shader, transforms their
+vertices into the batch's space once and merges them into a single vertex
+and index buffer. Strips, fans and loops are converted to indexed lists,
+so the whole batch is drawn with one glDrawElements call.
+
+The merged geometry is built on first use and rebuilt only when members
+are added or removed, or after invalidate() when a member was moved.
+"""
+
+
+def bake_vertices(data, model, normal_matrix=None):
+    """
+    Transform vertices into the space of a model matrix, in place.
+
+    Args:
+        data (numpy.ndarray): (N, stride) float vertices with the position
+            in columns 0-2 and, if normal_matrix is given, the normal in 3-5
+        model (numpy.ndarray): (4, 4) model matrix indexed [row][column], as
+            np.asarray() of a glm matrix is
+        normal_matrix (numpy.ndarray, optional): (3, 3) normal matrix, in the
+            same layout
+
+    Returns:
+        numpy.ndarray: data
+    """
+    # Row vectors multiply the transposed matrix.
+    data[:, :3] = data[:, :3] @ model[:3, :3].T + model[:3, 3]
+    if normal_matrix is not None:
+        data[:, 3:6] = data[:, 3:6] @ normal_matrix.T
+    return data
+
+
+class StaticBatch(TransformableObject, DrawableObject):
+    """
+    Static shapes sharing a shader, merged into one mesh.
+
+    The batch is a scene object like any other: it is culled and picked as
+    a whole, and its own transform applies on top of the baked member
+    transforms.
+
+    Attributes:
+        members (list): Batched shapes, in draw order
+        draw_mode (int): List mode of the batch (GL_TRIANGLES, GL_LINES or GL_POINTS)
+        vertex_layout (tuple): Floats per vertex attribute shared by all members
+        shader (Shader): Shader program shared by all members
+        rebuilds (int): Number of times the merged geometry was built
+    """
+
+    def __init__(self, vertex_shader_source, fragment_shader_source, draw_mode=GL_TRIANGLES, vertex_layout=(3,)):
+        """
+        Initialize an empty batch.
+
+        Args:
+            vertex_shader_source (str): Source code for vertex shader
+            fragment_shader_source (str): Source code for fragment shader
+            draw_mode (int): GL_TRIANGLES, GL_LINES or GL_POINTS; members
+                drawn as strips, fans or loops of the same primitive are
+                converted to it
+            vertex_layout (tuple): Floats per vertex attribute of the members
+        """
+        TransformableObject.__init__(self)
+        if LIST_MODES.get(draw_mode) != draw_mode:
+            raise Exception(f"Static batches draw GL_TRIANGLES, GL_LINES or GL_POINTS, not {draw_mode}")
+        self.vertex_shader_source = vertex_shader_source
+        self.fragment_shader_source = fragment_shader_source
+        self.draw_mode = draw_mode
+        self.vertex_layout = tuple(vertex_layout)
+        self.shader = Shader(vertex_shader_source, fragment_shader_source)
+        self.shader_program = self.shader.program_id
+        self.members = []
+        self.rebuilds = 0
+        self._mesh = None
+        self._stale = True
+
+    def __len__(self):
+        return len(self.members)
+
+    def add(self, shape):
+        """
+        Add a shape to the batch.
+
+        Args:
+            shape (DrawableObject): Shape drawn with the batch's shader and vertex layout
+
+        Returns:
+            DrawableObject: The added shape
+
+        Raises:
+            Exception: If the shape uses another shader, vertex layout or primitive
+        """
+        if shape.shader.program_id != self.shader.program_id:
+            raise Exception("Batched shapes must share the batch's shader")
+        if tuple(shape.mesh.layout) != self.vertex_layout:
+            raise Exception(f"Batched shapes must use the vertex layout {self.vertex_layout}")
+        if LIST_MODES.get(shape.draw_mode) != self.draw_mode:
+            raise Exception(f"Drawing mode {shape.draw_mode} cannot be batched with {self.draw_mode}")
+        self.members.append(shape)
+        self.invalidate()
+        return shape
+
+    def remove(self, shape):
+        """
+        Remove a shape from the batch.
+
+        Args:
+            shape (DrawableObject): Previously added shape
+        """
+        self.members.remove(shape)
+        self.invalidate()
+
+    def invalidate(self):
+        """Rebuild the merged geometry before the next use, e.g. after moving a member."""
+        self._stale = True
+        if self.graph is not None:
+            self.graph.structure_changed()
+
+    def build(self):
+        """
+        Merge the members into one vertex and index buffer.
+
+        Positions (attribute 0) are transformed by each member's world
+        matrix; a 3-float attribute 1 is taken as the normal and
+        transformed by the member's normal matrix.
+
+        Returns:
+            Mesh: The merged mesh
+        """
+        stride = sum(self.vertex_layout)
+        has_normals = len(self.vertex_layout) > 1 and self.vertex_layout[1] == 3
+        vertices, indices = [], []
+        base = 0
+        for shape in self.members:
+            data = shape.mesh.vertices.reshape(-1, stride).astype(np.float64)
+            normal_matrix = None
+            if has_normals:
+                normal_matrix = np.asarray(shape.world_normal_matrix(), dtype=np.float64)
+            bake_vertices(data, np.asarray(shape.world_matrix, dtype=np.float64), normal_matrix)
+            vertices.append(data)
+            indices.append(primitive_list(shape.draw_mode, shape.mesh.order()).ravel() + base)
+            base += len(data)
+
+        if self._mesh is not None:
+            mesh_cache.release(self._mesh)
+        vertices = np.concatenate(vertices) if vertices else np.zeros((0, stride))
+        indices = np.concatenate(indices) if indices else np.zeros(0, dtype=np.int64)
+        self._mesh = mesh_cache.acquire(None, lambda key: Mesh(
+            key, vertices.astype(np.float32).ravel(), indices.astype(np.uint32), self.vertex_layout
+        ))
+        self._stale = False
+        self.rebuilds += 1
+        return self._mesh
+
+    @property
+    def mesh(self):
+        """Mesh: Merged geometry of the members, rebuilt if membership changed."""
+        if self._stale:
+            self.build()
+        return self._mesh
+
+    @property
+    def VAO(self):
+        """int: Vertex Array Object of the merged geometry."""
+        return self.mesh.VAO
+
+    def draw_call(self):
+        """Draw every member with one call, with the program and VAO bound."""
+        glDrawElements(self.draw_mode, self.mesh.index_count, GL_UNSIGNED_INT, None)
+
+    def __del__(self):
+        """Release the merged mesh on deletion."""
+        if self._mesh is not None:
+            mesh_cache.release(self._mesh)
@@ -18,6 +18,9 @@ Attributes:
 """
 
 class TexturedCube(OpenGLObject):
+    vertex_layout = (3, 3, 2)
+    mesh_key = "textured_cube"
+
     def __init__(self, vertex_shader_source, fragment_shader_source, texture_path):
         """
         Initialize a TexturedCube object.
@@ -27,7 +30,6 @@ class TexturedCube(OpenGLObject):
             fragment_shader_source (str): Source code for fragment shader
             texture_path (str): Path to texture image file
         """
-        self.trans = glm.mat4(1.0)
         self.vertices = np.array([
             -0.5, -0.5, -0.5,  0.0,  0.0, -1.0,  0.0, 0.0,
              0.5, -0.5, -0.5,  0.0,  0.0, -1.0,  1.0, 0.0,
@@ -66,63 +68,17 @@ class TexturedCube(OpenGLObject):
 
         super().__init__(self.vertices, vertex_shader_source, fragment_shader_source)
 
-        self.EBO = glGenBuffers(1)
-        glBindBuffer(GL_ELEMENT_ARRAY_BUFFER, self.EBO)
-        glBufferData(GL_ELEMENT_ARRAY_BUFFER, self.indices.nbytes, self.indices, GL_STATIC_DRAW)
-
         self.bitmap_handler = BitmapHandler()
         self.texture = self.bitmap_handler.load_texture(texture_path)
 
-    def _setup_buffers(self):
-        """
-        Set up vertex buffer objects and attributes.
-        
-        Configures vertex attributes for:
-        - Position (layout 0)
-        - Normal (layout 1)
-        - Texture coordinates (layout 2)
-        """
-        glBindVertexArray(self.VAO)
-        glBindBuffer(GL_ARRAY_BUFFER, self.VBO)
-        glBufferData(GL_ARRAY_BUFFER, self.vertices.nbytes, self.vertices, GL_STATIC_DRAW)
-        glVertexAttribPointer(0, 3, GL_FLOAT, GL_FALSE, 8 * sizeof(GLfloat), ctypes.c_void_p(0))
-        glEnableVertexAttribArray(0)
-        glVertexAttribPointer(1, 3, GL_FLOAT, GL_FALSE, 8 * sizeof(GLfloat), ctypes.c_void_p(3 * sizeof(GLfloat)))
-        glEnableVertexAttribArray(1)
-        glVertexAttribPointer(2, 2, GL_FLOAT, GL_FALSE, 8 * sizeof(GLfloat), ctypes.c_void_p(6 * sizeof(GLfloat)))
-        glEnableVertexAttribArray(2)
-        glBindBuffer(GL_ARRAY_BUFFER, 0)
-        glBindVertexArray(0)
-
-    def draw(self, projection_matrix, view, camera_position, light_pos):
+    def set_uniforms(self):
         """
-        Draw the textured cube with lighting.
+        Upload the texture unit and transform of the textured cube.
 
-        Args:
-            projection_matrix (glm.mat4): Camera projection matrix
-            view (glm.mat4): Camera view matrix
-            camera_position (tuple): XYZ position of camera
-            light_pos (tuple): XYZ position of light source
+        Camera and light parameters are read from the FrameData uniform block.
         """
-        glUseProgram(self.shader_program)
-        self.bitmap_handler.bind_texture(self.texture, GL_TEXTURE0)
-        glUniform1i(glGetUniformLocation(self.shader_program, "texture1"), 0)
-        light_pos = [1.2, 1.0, 2.0]
-        light_color = [1.0, 1.0, 1.0]
-        view_pos = [0.0, 0.0, 3.0]
-        glUniform3f(glGetUniformLocation(self.shader_program, "lightPos"), *light_pos)
-        glUniform3f(glGetUniformLocation(self.shader_program, "lightColor"), *light_color)
-        glUniform3f(glGetUniformLocation(self.shader_program, "viewPos"), *view_pos)
-        MVP = projection_matrix * view * self.trans
-        mvp_location = glGetUniformLocation(self.shader_program, "MVP")
-        model_location = glGetUniformLocation(self.shader_program, "model")
-        glUniformMatrix4fv(mvp_location, 1, GL_FALSE, glm.value_ptr(MVP))
-        glUniformMatrix4fv(model_location, 1, GL_FALSE, glm.value_ptr(self.trans))
-        glBindVertexArray(self.VAO)
-        glBindBuffer(GL_ELEMENT_ARRAY_BUFFER, self.EBO)
-        glDrawElements(GL_TRIANGLES, len(self.indices), GL_UNSIGNED_INT, None)
-        glBindVertexArray(0)
-        glBindBuffer(GL_ELEMENT_ARRAY_BUFFER, 0)
+        self.shader.set_int("texture1", 0)
+        self._set_transform_uniforms()
 
     def __del__(self):
         """
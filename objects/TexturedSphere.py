@@ -3,6 +3,7 @@ from objects.GameObject import *
 import glm
 from objects.BitmapHandler import BitmapHandler
 import ctypes
+import functools
 import math
 
 """
@@ -20,97 +21,86 @@ Attributes:
     texture (int): OpenGL texture ID
     
 Methods:
-    draw(projection_matrix, view, camera_position, light_pos): Renders the textured sphere
+    draw(): Renders the textured sphere
 """
 
+
+@functools.lru_cache(maxsize=16)
+def sphere_geometry(radius, sectors, stacks):
+    """
+    Generate the vertices and indices of a UV sphere.
+
+    Positions, normals and texture coordinates are computed with NumPy
+    broadcasting over the (stacks + 1, sectors + 1) grid of phi/theta angles.
+    The trigonometric functions are evaluated with the math module on the
+    per-row and per-column angles only, so the result is bit-identical to
+    the original per-vertex loop. Results are memoized; the returned arrays
+    are read-only because they are shared between spheres.
+
+    Args:
+        radius (float): Radius of the sphere
+        sectors (int): Number of horizontal divisions
+        stacks (int): Number of vertical divisions
+
+    Returns:
+        tuple: Interleaved float32 vertices (position, normal, UV) and uint32 indices
+    """
+    V = np.arange(stacks + 1) / stacks
+    U = np.arange(sectors + 1) / sectors
+    phi = V * math.pi
+    theta = U * 2 * math.pi
+
+    sin_phi = np.fromiter(map(math.sin, phi), dtype=np.float64, count=len(phi))
+    cos_phi = np.fromiter(map(math.cos, phi), dtype=np.float64, count=len(phi))
+    sin_theta = np.fromiter(map(math.sin, theta), dtype=np.float64, count=len(theta))
+    cos_theta = np.fromiter(map(math.cos, theta), dtype=np.float64, count=len(theta))
+
+    shape = (stacks + 1, sectors + 1)
+    x = cos_theta[np.newaxis, :] * sin_phi[:, np.newaxis]
+    y = np.broadcast_to(cos_phi[:, np.newaxis], shape)
+    z = sin_theta[np.newaxis, :] * sin_phi[:, np.newaxis]
+
+    vertices = np.empty(shape + (8,), dtype=np.float32)
+    vertices[..., 0] = radius * x
+    vertices[..., 1] = radius * y
+    vertices[..., 2] = radius * z
+    vertices[..., 3] = x
+    vertices[..., 4] = y
+    vertices[..., 5] = z
+    vertices[..., 6] = U[np.newaxis, :]
+    vertices[..., 7] = V[:, np.newaxis]
+    vertices = vertices.reshape(-1)
+
+    first = np.arange(stacks)[:, np.newaxis] * (sectors + 1) + np.arange(sectors)[np.newaxis, :]
+    second = first + sectors + 1
+    indices = np.stack(
+        [first, second, first + 1, second, second + 1, first + 1], axis=-1
+    ).astype(np.uint32).reshape(-1)
+
+    vertices.setflags(write=False)
+    indices.setflags(write=False)
+    return vertices, indices
+
+
 class TexturedSphere(OpenGLObject):
+    vertex_layout = (3, 3, 2)
+
     def __init__(self, vertex_shader_source, fragment_shader_source, texture_path, radius=1.0, sectors=32, stacks=16):
         self.radius = radius
         self.sectors = sectors
         self.stacks = stacks
-        self.trans = glm.mat4(1.0)
-
-        vertices = []
-        indices = []
-
-        for i in range(stacks + 1):
-            V = i / stacks
-            phi = V * math.pi
-            
-            for j in range(sectors + 1):
-                U = j / sectors
-                theta = U * 2 * math.pi
-                
-                x = math.cos(theta) * math.sin(phi)
-                y = math.cos(phi)
-                z = math.sin(theta) * math.sin(phi)
-                
-                nx = x
-                ny = y
-                nz = z
-                
-                u = U
-                v = V
-                
-                vertices.extend([
-                    self.radius * x, self.radius * y, self.radius * z,
-                    nx, ny, nz,
-                    u, v
-                ])
-
-        for i in range(stacks):
-            for j in range(sectors):
-                first = (i * (sectors + 1)) + j
-                second = first + sectors + 1
-                
-                indices.extend([first, second, first + 1])
-                indices.extend([second, second + 1, first + 1])
-
-        self.vertices = np.array(vertices, dtype=np.float32)
-        self.indices = np.array(indices, dtype=np.uint32)
+        self.mesh_key = ("sphere", radius, sectors, stacks)
 
-        super().__init__(self.vertices, vertex_shader_source, fragment_shader_source)
+        self.vertices, self.indices = sphere_geometry(radius, sectors, stacks)
 
-        self.EBO = glGenBuffers(1)
-        glBindBuffer(GL_ELEMENT_ARRAY_BUFFER, self.EBO)
-        glBufferData(GL_ELEMENT_ARRAY_BUFFER, self.indices.nbytes, self.indices, GL_STATIC_DRAW)
+        super().__init__(self.vertices, vertex_shader_source, fragment_shader_source)
 
         self.bitmap_handler = BitmapHandler()
         self.texture = self.bitmap_handler.load_texture(texture_path)
 
-    def _setup_buffers(self):
-        glBindVertexArray(self.VAO)
-        glBindBuffer(GL_ARRAY_BUFFER, self.VBO)
-        glBufferData(GL_ARRAY_BUFFER, self.vertices.nbytes, self.vertices, GL_STATIC_DRAW)
-        glVertexAttribPointer(0, 3, GL_FLOAT, GL_FALSE, 8 * sizeof(GLfloat), ctypes.c_void_p(0))
-        glEnableVertexAttribArray(0)
-        glVertexAttribPointer(1, 3, GL_FLOAT, GL_FALSE, 8 * sizeof(GLfloat), ctypes.c_void_p(3 * sizeof(GLfloat)))
-        glEnableVertexAttribArray(1)
-        glVertexAttribPointer(2, 2, GL_FLOAT, GL_FALSE, 8 * sizeof(GLfloat), ctypes.c_void_p(6 * sizeof(GLfloat)))
-        glEnableVertexAttribArray(2)
-        glBindBuffer(GL_ARRAY_BUFFER, 0)
-        glBindVertexArray(0)
-
-    def draw(self, projection_matrix, view, camera_position, light_pos):
-        glUseProgram(self.shader_program)
-        self.bitmap_handler.bind_texture(self.texture, GL_TEXTURE0)
-        glUniform1i(glGetUniformLocation(self.shader_program, "texture1"), 0)
-        light_pos = [1.2, 1.0, 2.0]
-        light_color = [1.0, 1.0, 1.0]
-        view_pos = [0.0, 0.0, 3.0]
-        glUniform3f(glGetUniformLocation(self.shader_program, "lightPos"), *light_pos)
-        glUniform3f(glGetUniformLocation(self.shader_program, "lightColor"), *light_color)
-        glUniform3f(glGetUniformLocation(self.shader_program, "viewPos"), *view_pos)
-        MVP = projection_matrix * view * self.trans
-        mvp_location = glGetUniformLocation(self.shader_program, "MVP")
-        model_location = glGetUniformLocation(self.shader_program, "model")
-        glUniformMatrix4fv(mvp_location, 1, GL_FALSE, glm.value_ptr(MVP))
-        glUniformMatrix4fv(model_location, 1, GL_FALSE, glm.value_ptr(self.trans))
-        glBindVertexArray(self.VAO)
-        glBindBuffer(GL_ELEMENT_ARRAY_BUFFER, self.EBO)
-        glDrawElements(GL_TRIANGLES, len(self.indices), GL_UNSIGNED_INT, None)
-        glBindVertexArray(0)
-        glBindBuffer(GL_ELEMENT_ARRAY_BUFFER, 0)
+    def set_uniforms(self):
+        self.shader.set_int("texture1", 0)
+        self._set_transform_uniforms()
 
     def __del__(self):
         super().__del__()
@@ -7,20 +7,311 @@ class TransformableObject:
     """
     A base class for objects that can be transformed in 3D space.
 
-    Provides methods for scaling, rotation and translation transformations.
+    The transform is stored as position, rotation (quaternion) and scale
+    components. The model matrix, the normal matrix and the MVP matrix are
+    derived from them lazily: every component change increments version, and
+    a cached matrix is only rebuilt when the version it was built from is
+    out of date. Objects that do not move cost no matrix math per frame.
+
+    Objects can be arranged in a hierarchy, where the transform of a child is
+    relative to its parent. When the object belongs to a Scene, the scene
+    is told about every change and recomputes world matrices only for the
+    subtrees that changed (see Scene.update_transforms()).
 
     Attributes:
-        trans (glm.mat4): Transformation matrix storing the object's transformations
+        position (glm.vec3): Translation of the object
+        rotation (glm.quat): Orientation of the object
+        scaling (glm.vec3): Scale factors along the object's axes
+        version (int): Incremented every time a component changes
+        trans (glm.mat4): Model matrix, translate * rotate * scale (read-only)
+        uniform_scale (bool): True if all scale factors are equal
+        parent (TransformableObject): Parent node, None for a root
+        children (list): Child nodes
+        depth (int): Number of ancestors
+        graph (Scene): Scene maintaining the world matrices, None if detached
+        world_version (int): Incremented every time the scene recomputes the world matrix
+        world_matrix (glm.mat4): Model matrix relative to the world (read-only)
 
     Methods:
+        reset_transform(): Resets the transformation to identity
+        set_parent(parent): Moves the object under another node
+        set_position(x, y, z): Replaces the translation
+        set_rotation(rotation): Replaces the orientation
+        set_euler(angle_x, angle_y, angle_z): Replaces the orientation with Euler angles
+        set_scale(scale): Replaces the scale factors
+        normal_matrix(): Returns the matrix that transforms normals
+        world_normal_matrix(): Returns the normal matrix relative to the world
+        mvp(view_projection, view_version): Returns the model-view-projection matrix
         scale(scale): Scales the object uniformly
         rotate(angle_x, angle_y, angle_z): Rotates the object around each axis
-        translate(x, y): Translates the object in XY plane
+        translate(x, y, z): Translates the object, in the XY plane by default
     """
 
     def __init__(self):
-        """Initialize transformation matrix to identity."""
-        self.trans = glm.mat4(1.0)
+        """Initialize the transformation to identity."""
+        self.version = 0
+        self._matrix_cache = {}
+        self.parent = None
+        self.children = []
+        self.depth = 0
+        self.graph = None
+        self.world_version = 0
+        self._world = glm.mat4(1.0)
+        self._world_uniform_scale = True
+        self._world_pass = 0
+        self.reset_transform()
+
+    def reset_transform(self):
+        """Reset the transformation to identity."""
+        self.position = glm.vec3(0.0)
+        self.rotation = glm.quat()
+        self.scaling = glm.vec3(1.0)
+        self._euler = (0.0, 0.0, 0.0)
+        self._transform_changed()
+
+    def _transform_changed(self):
+        """Invalidate the cached matrices and tell the owning scene."""
+        self.version += 1
+        if self.graph is not None:
+            self.graph.dirty.add(self)
+
+    def _cached(self, name, key, build):
+        """
+        Get a derived matrix, rebuilding it only when its key changed.
+
+        Args:
+            name (str): Name of the derived matrix
+            key: Value identifying the inputs the matrix was built from
+            build (callable): Builds the matrix
+
+        Returns:
+            glm.mat3 or glm.mat4: The derived matrix
+        """
+        entry = self._matrix_cache.get(name)
+        if entry is None or entry[0] != key:
+            entry = (key, build())
+            self._matrix_cache[name] = entry
+        return entry[1]
+
+    @property
+    def trans(self):
+        """glm.mat4: Model matrix, rebuilt only after a component changed."""
+        return self._cached("model", self.version, self._build_model_matrix)
+
+    @property
+    def uniform_scale(self):
+        """bool: True if the object is scaled equally along all axes."""
+        s = self.scaling
+        return s.x == s.y == s.z
+
+    def _build_model_matrix(self):
+        """
+        Compose translate * rotate * scale.
+
+        Returns:
+            glm.mat4: Model matrix
+        """
+        model = glm.mat4_cast(self.rotation)
+        model[0] = model[0] * self.scaling.x
+        model[1] = model[1] * self.scaling.y
+        model[2] = model[2] * self.scaling.z
+        model[3] = glm.vec4(self.position, 1.0)
+        return model
+
+    def _build_normal_matrix(self):
+        """
+        Build the inverse transpose of the model's upper 3x3.
+
+        For rotate * scale that is rotate * inverse(scale). With a uniform
+        scale it is the rotation itself up to a scale factor, which shaders
+        remove by normalizing, so the division is skipped.
+
+        Returns:
+            glm.mat3: Normal matrix
+        """
+        normal = glm.mat3_cast(self.rotation)
+        if not self.uniform_scale:
+            normal[0] = normal[0] / self.scaling.x
+            normal[1] = normal[1] / self.scaling.y
+            normal[2] = normal[2] / self.scaling.z
+        return normal
+
+    def normal_matrix(self):
+        """
+        Get the matrix that transforms normals by the local transform.
+
+        Returns:
+            glm.mat3: Normal matrix, rebuilt only after a component changed
+        """
+        return self._cached("normal", self.version, self._build_normal_matrix)
+
+    def _world_key(self):
+        """
+        Get a value that changes whenever the world matrix changes.
+
+        Returns:
+            tuple: Cache key, None for detached children whose world matrix
+            is composed on every access
+        """
+        if self.parent is None:
+            return ("local", self.version)
+        if self.graph is not None:
+            return ("world", self.world_version)
+        return None
+
+    @property
+    def world_matrix(self):
+        """glm.mat4: Model matrix relative to the world."""
+        if self.parent is None:
+            return self.trans
+        if self.graph is not None:
+            return self._world
+        return self.parent.world_matrix * self.trans
+
+    def _world_uniform(self):
+        """
+        Check whether the object and all its ancestors scale uniformly.
+
+        Returns:
+            bool: True if the world matrix has a uniform scale
+        """
+        if self.graph is not None:
+            return self._world_uniform_scale
+        node = self
+        while node is not None:
+            if not node.uniform_scale:
+                return False
+            node = node.parent
+        return True
+
+    def world_normal_matrix(self):
+        """
+        Get the matrix that transforms normals into world space.
+
+        Returns:
+            glm.mat3: Normal matrix of the world matrix
+        """
+        if self.parent is None:
+            return self.normal_matrix()
+
+        def build():
+            world = glm.mat3(self.world_matrix)
+            if self._world_uniform():
+                return world
+            return glm.transpose(glm.inverse(world))
+
+        key = self._world_key()
+        if key is None:
+            return build()
+        return self._cached("world_normal", key, build)
+
+    def mvp(self, view_projection, view_version):
+        """
+        Get the model-view-projection matrix.
+
+        Args:
+            view_projection (glm.mat4): Camera projection * view matrix
+            view_version: Value that changes whenever view_projection changes
+
+        Returns:
+            glm.mat4: view_projection * world matrix, rebuilt only when the
+            object or the camera changed
+        """
+        key = self._world_key()
+        if key is None:
+            return view_projection * self.world_matrix
+        return self._cached(
+            "mvp", (key, view_version), lambda: view_projection * self.world_matrix
+        )
+
+    def set_parent(self, parent):
+        """
+        Move the object under another node, keeping its local transform.
+
+        Args:
+            parent (TransformableObject): New parent, None to make the object a root
+
+        Raises:
+            Exception: If parent is the object itself or one of its descendants
+        """
+        node = parent
+        while node is not None:
+            if node is self:
+                raise Exception("An object cannot be its own ancestor")
+            node = node.parent
+
+        if self.parent is not None:
+            self.parent.children.remove(self)
+        self.parent = parent
+        if parent is not None:
+            parent.children.append(self)
+
+        base = 0 if parent is None else parent.depth + 1
+        stack = [(self, base)]
+        while stack:
+            node, depth = stack.pop()
+            node.depth = depth
+            stack.extend((child, depth + 1) for child in node.children)
+
+        self._transform_changed()
+        if self.graph is not None:
+            self.graph.structure_changed()
+
+    def set_position(self, x, y, z=0.0):
+        """
+        Replace the translation of the object.
+
+        Args:
+            x (float): Position along X axis
+            y (float): Position along Y axis
+            z (float, optional): Position along Z axis. Defaults to 0.
+        """
+        position = glm.vec3(x, y, z)
+        if position != self.position:
+            self.position = position
+            self._transform_changed()
+
+    def set_rotation(self, rotation):
+        """
+        Replace the orientation of the object.
+
+        Args:
+            rotation (glm.quat): New orientation
+        """
+        rotation = glm.quat(rotation)
+        if rotation != self.rotation:
+            self.rotation = rotation
+            self._euler = None
+            self._transform_changed()
+
+    def set_euler(self, angle_x, angle_y, angle_z):
+        """
+        Replace the orientation with rotations around X, then Y, then Z.
+
+        Calls repeating the previous angles return without any math.
+
+        Args:
+            angle_x (float): Rotation angle around X axis in degrees
+            angle_y (float): Rotation angle around Y axis in degrees
+            angle_z (float): Rotation angle around Z axis in degrees
+        """
+        angles = (angle_x, angle_y, angle_z)
+        if angles == self._euler:
+            return
+        self.set_rotation(euler_quat(angle_x, angle_y, angle_z))
+        self._euler = angles
+
+    def set_scale(self, scale):
+        """
+        Replace the scale factors of the object.
+
+        Args:
+            scale (float or glm.vec3): Uniform factor, or one factor per axis
+        """
+        scaling = glm.vec3(scale)
+        if scaling != self.scaling:
+            self.scaling = scaling
+            self._transform_changed()
 
     def scale(self, scale):
         """
@@ -29,34 +320,54 @@ class TransformableObject:
         Args:
             scale (float): Scale factor to apply in all dimensions
         """
-        scale_matrix = glm.scale(glm.mat4(1.0), glm.vec3(scale, scale, scale))
-        self.trans *= scale_matrix
+        self.set_scale(self.scaling * scale)
 
     def rotate(self, angle_x, angle_y, angle_z):
         """
         Rotate the object around all axes.
 
+        The rotation is applied in the object's local frame, after its
+        current rotation. Under a non-uniform scale the rotation is applied
+        before the scale, which keeps the transform a translate * rotate *
+        scale composition.
+
         Args:
             angle_x (float): Rotation angle around X axis in degrees
             angle_y (float): Rotation angle around Y axis in degrees
             angle_z (float): Rotation angle around Z axis in degrees
         """
-        self.trans = glm.rotate(
-            self.trans, glm.radians(angle_x), glm.vec3(1.0, 0.0, 0.0)
-        )
-        self.trans = glm.rotate(
-            self.trans, glm.radians(angle_y), glm.vec3(0.0, 1.0, 0.0)
-        )
-        self.trans = glm.rotate(
-            self.trans, glm.radians(angle_z), glm.vec3(0.0, 0.0, 1.0)
-        )
+        self.set_rotation(self.rotation * euler_quat(angle_x, angle_y, angle_z))
 
-    def translate(self, x, y):
+    def translate(self, x, y, z=0.0):
         """
-        Translate the object in XY plane.
+        Translate the object, in the XY plane unless z is given.
+
+        The offset is given in the object's local frame, as with composing a
+        translation matrix onto the model matrix.
 
         Args:
             x (float): Translation along X axis
             y (float): Translation along Y axis
+            z (float, optional): Translation along Z axis. Defaults to 0.
         """
-        self.trans = glm.translate(self.trans, glm.vec3(x, y, 0))
+        offset = self.rotation * (self.scaling * glm.vec3(x, y, z))
+        self.set_position(*(self.position + offset))
+
+
+def euler_quat(angle_x, angle_y, angle_z):
+    """
+    Build the rotation around X, then Y, then Z as a quaternion.
+
+    Args:
+        angle_x (float): Rotation angle around X axis in degrees
+        angle_y (float): Rotation angle around Y axis in degrees
+        angle_z (float): Rotation angle around Z axis in degrees
+
+    Returns:
+        glm.quat: Rotation matching rotate(X) * rotate(Y) * rotate(Z)
+    """
+    return (
+        glm.angleAxis(glm.radians(float(angle_x)), glm.vec3(1.0, 0.0, 0.0))
+        * glm.angleAxis(glm.radians(float(angle_y)), glm.vec3(0.0, 1.0, 0.0))
+        * glm.angleAxis(glm.radians(float(angle_z)), glm.vec3(0.0, 0.0, 1.0))
+    )
@@ -9,4 +9,9 @@ from .Cube import *
 from .CameraObject import *
 from .lightCube import *
 from .TexturedCube import *
-from .TexturedSphere import * 
\ No newline at end of file
+from .TexturedSphere import *
+from .InstancedMesh import *
+from .SceneNode import *
+from .StaticBatch import *
+from .DynamicShape import *
+from .PointCloud import *
@@ -0,0 +1,10 @@
+// Per-frame camera and lighting data, updated once per frame by the engine.
+layout (std140) uniform FrameData
+{
+    mat4 projection;
+    mat4 view;
+    mat4 viewProjection;
+    vec4 cameraPosition;
+    vec4 lightPosition;
+    vec4 lightColor;
+};
@@ -0,0 +1,18 @@
+#version 330 core
+#include "frameData.glsl"
+layout (location = 0) in vec3 aPos;
+layout (location = 1) in vec3 aNormal;
+layout (location = 3) in mat4 instanceModel;
+layout (location = 7) in vec3 instanceColor;
+layout (location = 8) in mat3 instanceNormalMatrix;
+out vec3 FragPos;
+out vec3 Normal;
+out vec3 InstanceColor;
+void main()
+{
+    vec4 worldPos = instanceModel * vec4(aPos, 1.0);
+    FragPos = vec3(worldPos);
+    Normal = instanceNormalMatrix * aNormal;
+    InstanceColor = instanceColor;
+    gl_Position = viewProjection * worldPos;
+}
@@ -1,7 +1,8 @@
 #version 330 core
+#include "frameData.glsl"
 out vec4 FragColor;
 
 void main()
 {
-    FragColor = vec4(1.0); // Белый цвет
-}
\ No newline at end of file
+    FragColor = vec4(lightColor.rgb, 1.0); // Цвет источника света
+}
@@ -1,9 +1,10 @@
 #version 330 core
+#include "frameData.glsl"
 layout (location = 0) in vec3 aPos;
 
-uniform mat4 MVP;
+uniform mat4 model;
 
 void main()
 {
-    gl_Position = MVP * vec4(aPos, 1.0);
-} 
\ No newline at end of file
+    gl_Position = viewProjection * model * vec4(aPos, 1.0);
+}
@@ -0,0 +1,27 @@
+#version 330 core
+#include "frameData.glsl"
+layout (location = 0) in vec3 aPos;
+#ifdef POINT_COLORS
+layout (location = 1) in vec3 aColor;
+#endif
+#ifdef POINT_SIZES
+layout (location = 2) in float aSize;
+#endif
+out vec3 PointColor;
+uniform mat4 model;
+uniform vec3 pointColor;
+uniform float pointSize;
+void main()
+{
+    gl_Position = viewProjection * model * vec4(aPos, 1.0);
+#ifdef POINT_COLORS
+    PointColor = aColor;
+#else
+    PointColor = pointColor;
+#endif
+#ifdef POINT_SIZES
+    gl_PointSize = aSize;
+#else
+    gl_PointSize = pointSize;
+#endif
+}
@@ -1,14 +1,15 @@
 #version 330 core
+#include "frameData.glsl"
 out vec4 FragColor;
 
 in vec3 FragPos;
 in vec3 Normal;
 in vec2 TexCoord;
+#ifdef INSTANCED
+in vec3 InstanceColor;
+#endif
 
 uniform sampler2D texture1;
-uniform vec3 lightPos;
-uniform vec3 lightColor;
-uniform vec3 viewPos;
 
 void main()
 {
@@ -17,23 +18,26 @@ void main()
     
     // Ambient
     float ambientStrength = 0.1;
-    vec3 ambient = ambientStrength * lightColor;
+    vec3 ambient = ambientStrength * lightColor.rgb;
     
     // Diffuse
     vec3 norm = normalize(Normal);
-    vec3 lightDir = normalize(lightPos - FragPos);
+    vec3 lightDir = normalize(lightPosition.xyz - FragPos);
     float diff = max(dot(norm, lightDir), 0.0);
-    vec3 diffuse = diff * lightColor;
+    vec3 diffuse = diff * lightColor.rgb;
     
     // Specular
     float specularStrength = 0.5;
-    vec3 viewDir = normalize(viewPos - FragPos);
+    vec3 viewDir = normalize(cameraPosition.xyz - FragPos);
     vec3 reflectDir = reflect(-lightDir, norm);
     float spec = pow(max(dot(viewDir, reflectDir), 0.0), 32);
-    vec3 specular = specularStrength * spec * lightColor;
+    vec3 specular = specularStrength * spec * lightColor.rgb;
     
     // Комбинируем все компоненты освещения
     vec3 result = (ambient + diffuse + specular);
+#ifdef INSTANCED
+    result *= InstanceColor;
+#endif
     
     // Применяем освещение к текстуре
     FragColor = vec4(result, 1.0) * texColor;
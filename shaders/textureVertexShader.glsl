@@ -1,4 +1,5 @@
 #version 330 core
+#include "frameData.glsl"
 layout (location = 0) in vec3 aPos;
 layout (location = 1) in vec3 aNormal;
 layout (location = 2) in vec2 aTexCoord;
@@ -7,13 +8,14 @@ out vec3 FragPos;
 out vec3 Normal;
 out vec2 TexCoord;
 
-uniform mat4 MVP;
 uniform mat4 model;
+uniform mat3 normalMatrix;
 
 void main()
 {
-    FragPos = vec3(model * vec4(aPos, 1.0));
-    Normal = mat3(transpose(inverse(model))) * aNormal;  // Правильное преобразование нормалей
+    vec4 worldPos = model * vec4(aPos, 1.0);
+    FragPos = vec3(worldPos);
+    Normal = normalMatrix * aNormal;  // Матрица нормалей считается на CPU
     TexCoord = aTexCoord;
-    gl_Position = MVP * vec4(aPos, 1.0);
-} 
\ No newline at end of file
+    gl_Position = viewProjection * worldPos;
+}
@@ -0,0 +1,15 @@
+"""
+Shared setup for the unit tests.
+
+The tests cover the CPU side of the engine and need no OpenGL context.
+The repository root is put on sys.path, since the engine modules are
+imported as top-level modules.
+"""
+
+import os
+import sys
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+if REPO_ROOT not in sys.path:
+    sys.path.insert(0, REPO_ROOT)
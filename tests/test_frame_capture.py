@@ -0,0 +1,36 @@
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from FrameCapture import FrameCapture, NpyWriter, BLOCK
+
+
+def test_npy_file_is_cut_to_the_frames_written(tmp_path):
+    path = str(tmp_path / "frames.npy")
+    capture = FrameCapture(NpyWriter(path, 4, 2, 10), policy=BLOCK)
+    for value in range(3):
+        capture.submit(np.full((2, 4, 4), value, dtype=np.uint8))
+
+    stats = capture.close()
+
+    frames = np.load(path)
+    assert stats["written"] == 3
+    assert frames.shape == (3, 2, 4, 4)
+    assert frames[:, 0, 0, 0].tolist() == [0, 1, 2]
+
+
+def test_npy_header_that_does_not_fit_raises(tmp_path, monkeypatch):
+    path = str(tmp_path / "frames.npy")
+    writer = NpyWriter(path, 4, 2, 10)
+    writer.write(0, np.zeros((2, 4, 4), dtype=np.uint8))
+    write_header = np.lib.format.write_array_header_1_0
+
+    def write_longer_header(file, header):
+        write_header(file, header)
+        file.write(b" " * 64)
+
+    monkeypatch.setattr(np.lib.format, "write_array_header_1_0", write_longer_header)
+
+    with pytest.raises(Exception, match="holds all 10"):
+        writer.close()
+    assert np.load(path).shape == (10, 2, 4, 4)
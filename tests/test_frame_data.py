@@ -0,0 +1,35 @@
+import pytest
+
+np = pytest.importorskip("numpy")
+glm = pytest.importorskip("glm")
+pytest.importorskip("OpenGL.GL")
+
+from FrameData import FRAME_DATA_SIZE, pack_frame_data
+
+
+def test_matrices_are_packed_column_major():
+    projection = glm.perspective(glm.radians(60.0), 16 / 10, 0.1, 100.0)
+    view = glm.lookAt(glm.vec3(1, 2, 3), glm.vec3(0), glm.vec3(0, 1, 0))
+    view_projection = projection * view
+    data = np.zeros(FRAME_DATA_SIZE // 4, dtype=np.float32)
+
+    pack_frame_data(data, projection, view, view_projection, glm.vec3(1, 2, 3), [4, 5, 6], [0.5, 0.5, 0.5])
+
+    assert data[0:16].tobytes() == projection.to_bytes()
+    assert data[16:32].tobytes() == view.to_bytes()
+    assert data[32:48].tobytes() == view_projection.to_bytes()
+    # std140 places the translation of a mat4 in its fourth column.
+    translation = glm.translate(glm.vec3(1, 2, 3))
+    pack_frame_data(data, translation, view, view_projection, glm.vec3(0), [0, 0, 0], [1, 1, 1])
+    assert data[12:15].tolist() == [1.0, 2.0, 3.0]
+
+
+def test_vectors_are_padded_to_vec4():
+    data = np.zeros(FRAME_DATA_SIZE // 4, dtype=np.float32)
+    identity = glm.mat4(1.0)
+
+    pack_frame_data(data, identity, identity, identity, glm.vec3(1, 2, 3), [4, 5, 6], [0.5, 0.25, 0.125])
+
+    assert data[48:52].tolist() == [1.0, 2.0, 3.0, 1.0]
+    assert data[52:56].tolist() == [4.0, 5.0, 6.0, 1.0]
+    assert data[56:60].tolist() == [0.5, 0.25, 0.125, 1.0]
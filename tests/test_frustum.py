@@ -0,0 +1,70 @@
+import pytest
+
+np = pytest.importorskip("numpy")
+glm = pytest.importorskip("glm")
+
+from Frustum import extract_planes, spheres_visible, boxes_visible, world_bounds, view_depths
+
+
+def camera_planes():
+    projection = glm.perspective(glm.radians(60.0), 16 / 10, 0.1, 100.0)
+    view = glm.lookAt(glm.vec3(0, 0, 3), glm.vec3(0), glm.vec3(0, 1, 0))
+    return extract_planes(projection * view)
+
+
+def test_known_points_are_kept_and_culled():
+    planes = camera_planes()
+    centers = np.array([
+        [0.0, 0.0, 0.0],     # looked at
+        [0.0, 0.0, -50.0],   # far ahead, inside the far plane
+        [0.0, 0.0, 10.0],    # behind the camera
+        [0.0, 0.0, -200.0],  # beyond the far plane
+        [100.0, 0.0, 0.0],   # far to the right
+        [0.0, -100.0, 0.0],  # far below
+    ])
+    radii = np.zeros(len(centers))
+
+    expected = [True, True, False, False, False, False]
+    assert spheres_visible(planes, centers, radii).tolist() == expected
+    assert boxes_visible(planes, centers, np.zeros_like(centers)).tolist() == expected
+
+
+def test_planes_point_into_the_frustum():
+    planes = camera_planes()
+    near, far = planes[4], planes[5]
+    assert np.allclose(near[:3], [0.0, 0.0, -1.0])
+    assert np.allclose(far[:3], [0.0, 0.0, 1.0])
+    assert near[3] == pytest.approx(3.0 - 0.1, rel=1e-5)
+    assert far[3] == pytest.approx(100.0 - 3.0, rel=1e-5)
+
+
+def test_world_bounds_apply_the_translation():
+    model = np.asarray(glm.translate(glm.vec3(5, 0, 0)) * glm.scale(glm.vec3(2, 1, 1)), dtype=np.float64)
+
+    center, radius, box_center, box_extent = world_bounds(
+        model, np.array([1.0, 0.0, 0.0]), 1.0, np.array([0.0, 1.0, 0.0]), np.array([1.0, 1.0, 1.0])
+    )
+
+    assert center.tolist() == [7.0, 0.0, 0.0]
+    assert radius == 2.0
+    assert box_center.tolist() == [5.0, 1.0, 0.0]
+    assert box_extent.tolist() == [2.0, 1.0, 1.0]
+
+
+def test_world_bounds_rotate_boxes():
+    model = np.asarray(glm.translate(glm.vec3(0, 0, -4)) * glm.rotate(glm.radians(90.0), glm.vec3(0, 0, 1)))
+
+    _, _, box_center, box_extent = world_bounds(
+        model, np.zeros(3), 0.0, np.array([1.0, 0.0, 0.0]), np.array([3.0, 1.0, 0.5])
+    )
+
+    assert np.allclose(box_center, [0.0, 1.0, -4.0], atol=1e-6)
+    assert np.allclose(box_extent, [1.0, 3.0, 0.5], atol=1e-6)
+
+
+def test_view_depths_grow_away_from_the_camera():
+    projection = glm.perspective(glm.radians(60.0), 16 / 10, 0.1, 100.0)
+    view = glm.lookAt(glm.vec3(0, 0, 3), glm.vec3(0), glm.vec3(0, 1, 0))
+    centers = np.array([[0.0, 0.0, -20.0], [1.0, 1.0, 0.0], [0.0, 0.0, 2.0]])
+
+    assert np.allclose(view_depths(projection * view, centers), [23.0, 3.0, 1.0], rtol=1e-5)
@@ -0,0 +1,64 @@
+from types import SimpleNamespace
+
+import pytest
+
+np = pytest.importorskip("numpy")
+glm = pytest.importorskip("glm")
+pytest.importorskip("OpenGL.GL")
+
+from Frustum import view_depths
+from RenderQueue import RenderQueue
+
+
+def drawable(program=1, texture=None, vao=1):
+    return SimpleNamespace(shader=SimpleNamespace(program_id=program), texture=texture, VAO=vao)
+
+
+def test_near_objects_sort_before_far_ones():
+    projection = glm.perspective(glm.radians(60.0), 16 / 10, 0.1, 100.0)
+    view = glm.lookAt(glm.vec3(0, 0, 3), glm.vec3(0), glm.vec3(0, 1, 0))
+    far, near = drawable(), drawable()
+    queue = RenderQueue()
+
+    depths = view_depths(projection * view, np.array([[0.0, 0.0, -20.0], [0.0, 0.0, 0.0]]))
+    queue.submit(far, depths[0])
+    queue.submit(near, depths[1])
+
+    assert np.argsort(queue.sort_keys(), kind="stable").tolist() == [1, 0]
+
+
+def test_state_sorts_before_depth():
+    queue = RenderQueue()
+    queue.submit(drawable(program=7), 1.0)
+    queue.submit(drawable(program=3), 5.0)
+    queue.submit(drawable(program=7), 0.5)
+
+    assert np.argsort(queue.sort_keys(), kind="stable").tolist() == [2, 0, 1]
+
+
+def test_ranks_start_over_every_frame(monkeypatch):
+    import RenderQueue as module
+
+    for name in ("glUseProgram", "glBindVertexArray"):
+        monkeypatch.setattr(module, name, lambda *args: None)
+    queue = RenderQueue()
+    for program in range(100, 110):
+        packet = drawable(program=program, vao=program)
+        packet.set_uniforms = packet.draw_call = lambda: None
+        packet.triangle_count = lambda: 0
+        queue.submit(packet)
+    queue.flush()
+
+    queue.submit(drawable(program=200, vao=200))
+    assert queue.sort_keys()[0] >> np.uint64(48) == 1
+
+
+def test_too_many_programs_raise(monkeypatch):
+    import RenderQueue as module
+
+    monkeypatch.setitem(module.FIELD_BITS, "program", 2)
+    queue = RenderQueue()
+    for program in range(3):
+        queue.submit(drawable(program=program))
+    with pytest.raises(Exception, match="programs"):
+        queue.submit(drawable(program=3))
@@ -0,0 +1,20 @@
+import pytest
+
+pytest.importorskip("numpy")
+pytest.importorskip("OpenGL.GL")
+
+from ShaderCache import apply_defines
+
+
+def test_defines_follow_version_on_first_line():
+    source = apply_defines("#version 330 core\nvoid main() {}\n", {"A": None, "B": 2})
+    assert source == "#version 330 core\n#define A\n#define B 2\nvoid main() {}\n"
+
+
+def test_defines_follow_version_after_comments_and_blank_lines():
+    source = apply_defines("\n// point shader\n\n#version 330 core\nvoid main() {}\n", {"A": None})
+    assert source == "\n// point shader\n\n#version 330 core\n#define A\nvoid main() {}\n"
+
+
+def test_defines_without_version_go_first():
+    assert apply_defines("void main() {}\n", {"A": 1}) == "#define A 1\nvoid main() {}\n"
@@ -0,0 +1,28 @@
+import pytest
+
+np = pytest.importorskip("numpy")
+glm = pytest.importorskip("glm")
+pytest.importorskip("OpenGL.GL")
+
+from objects.StaticBatch import bake_vertices
+
+
+def test_positions_are_translated():
+    data = np.array([[0.5, 0.0, 0.0]])
+    model = np.asarray(glm.translate(glm.vec3(-2, -2, 0)), dtype=np.float64)
+
+    bake_vertices(data, model)
+
+    assert data.tolist() == [[-1.5, -2.0, 0.0]]
+
+
+def test_positions_and_normals_are_rotated():
+    data = np.array([[1.0, 0.0, 0.0, 1.0, 0.0, 0.0]])
+    rotation = glm.rotate(glm.radians(90.0), glm.vec3(0, 0, 1))
+    model = glm.translate(glm.vec3(0, 0, 5)) * rotation * glm.scale(glm.vec3(2, 1, 1))
+    normal_matrix = glm.transpose(glm.inverse(glm.mat3(model)))
+
+    bake_vertices(data, np.asarray(model, dtype=np.float64), np.asarray(normal_matrix, dtype=np.float64))
+
+    assert np.allclose(data[0, :3], [0.0, 2.0, 5.0], atol=1e-6)
+    assert np.allclose(data[0, 3:6], [0.0, 0.5, 0.0], atol=1e-6)
@@ -0,0 +1,27 @@
+import math
+
+import pytest
+
+np = pytest.importorskip("numpy")
+glm = pytest.importorskip("glm")
+
+from TransformStore import TransformStore
+
+
+def test_matrices_match_glm():
+    angle = math.radians(30.0)
+    quat = (math.cos(angle / 2), 0.0, 0.0, math.sin(angle / 2))
+    store = TransformStore(4)
+    store.add(np.array([[1.0, 2.0, 3.0]]), np.array([quat]), np.array([[2.0, 1.0, 0.5]]))
+
+    model = glm.translate(glm.vec3(1, 2, 3)) * glm.mat4_cast(glm.quat(*quat)) * glm.scale(glm.vec3(2, 1, 0.5))
+    view_projection = glm.perspective(glm.radians(60.0), 16 / 10, 0.1, 100.0) * glm.lookAt(
+        glm.vec3(0, 0, 10), glm.vec3(0), glm.vec3(0, 1, 0)
+    )
+    models, normals, mvps = store.compute(view_projection)
+
+    # The store holds matrices column by column, as glm's to_bytes() does.
+    assert np.allclose(models[0], np.frombuffer(model.to_bytes(), dtype=np.float32).reshape(4, 4))
+    assert np.allclose(models[0], np.asarray(model).T)
+    assert np.allclose(normals[0], np.asarray(glm.transpose(glm.inverse(glm.mat3(model)))).T, atol=1e-6)
+    assert np.allclose(mvps[0], np.asarray(view_projection * model).T, atol=1e-5)